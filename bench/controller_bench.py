@@ -0,0 +1,163 @@
+"""
+Microbenchmarks for the controller's hot paths, at different roster sizes.
+
+Per event (what every hit costs):
+    parse_packet -> parse_packet_bytes -> validateEvent -> applyEvent -> recordLog
+    -> netBroadcastEquipment (muted, so just what the scoring path pays before the send)
+    plus handleIncomingUDPBatch for a 64-event burst (per event)
+
+Per tick (what the Action screen pays every 250 ms):
+    processPendingEvents (nothing waiting) -> updateTimer -> getActionDelta (idle and after a hit)
+    -> getActionSnapshot
+
+Run it from the repo root:
+    python3 bench/controller_bench.py
+    python3 bench/controller_bench.py --sizes 2,30,300 --json results.json
+
+Nothing here needs Tk, Postgres, or the network:
+- psycopg2 may be missing (database.py handles that) and the database is never called
+- the arena is made with muteBroadcasts=True (like replay.py and bench/udp_load.py),
+  so nothing is queued or sent
+- the match history is an in-memory SQLite database
+
+Each stage reports ops/sec (best of 3) and the bytes still allocated per op afterwards
+(tracemalloc), like bench/parser_bench.py. Save a --json file before a change and compare after.
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+# Let "import controller" work when this is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import controller  # noqa: E402
+from net import udp  # noqa: E402  (just the parsers, the arena never broadcasts)
+
+
+DEFAULT_SIZES = [2, 30, 100, 300]
+BATCH_SIZE = 64  # same as udp.batchRingSize
+
+
+def setUpArena(playerCount):
+    """A fresh arena with playerCount players split over the two teams, in the PLAYING phase."""
+    arena = controller.GameController("bench", historyFile=":memory:", muteBroadcasts=True)
+    arena.maxPlayersPerTeam = max(15, playerCount)
+    arena.recordMatches = False
+    arena.useClockThread = False  # updateTimer is measured on its own, no deadline should fire mid-run
+
+    red = []
+    green = []
+    for i in range(playerCount):
+        team = "RED" if i % 2 == 0 else "GREEN"
+        equipmentID = 1000 + i
+        arena.addPlayerToTeam(team, i + 1, f"Player{i}", equipmentID, broadcast=False)
+        (red if team == "RED" else green).append(equipmentID)
+
+    arena.startGame()
+    arena.changePhase("PLAYING")
+    arena.setTimeRemaining(arena.playSeconds)
+    return arena, red, green
+
+
+def measure(func, rounds=None):
+    """Returns (ops/sec, bytes still allocated per op)."""
+    timer = timeit.Timer(func)
+    if rounds is None:
+        rounds, _ = timer.autorange()  # enough rounds for about 0.2 seconds
+
+    best = min(timer.repeat(number=rounds, repeat=3))
+
+    allocationRounds = min(rounds, 2000)
+    tracemalloc.start()
+    for _ in range(allocationRounds):
+        func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return rounds / best, current / allocationRounds
+
+
+def benchRosterSize(playerCount):
+    arena, red, green = setUpArena(playerCount)
+    tagText = f"{red[0]}:{green[0]}"
+    tagBytes = tagText.encode()
+    tagEvent = udp.parse_packet_bytes(tagBytes)
+
+    burst = [
+        udp.parse_packet_bytes(f"{red[i % len(red)]}:{green[(i * 7) % len(green)]}".encode())
+        for i in range(BATCH_SIZE)
+    ]
+
+    results = {}
+
+    # --- per event -------------------------------------------------------
+    results["parse_packet"] = measure(lambda: udp.parse_packet(tagText))
+    results["parse_packet_bytes"] = measure(lambda: udp.parse_packet_bytes(tagBytes))
+    results["validateEvent"] = measure(lambda: arena.validateEvent(tagEvent))
+    results["applyEvent"] = measure(lambda: arena.applyEvent(tagEvent))
+    results["recordLog"] = measure(lambda: arena.recordLog("Great! A hit was scored."))
+    results["netBroadcastEquipment"] = measure(lambda: arena.netBroadcastEquipment(green[0]))
+
+    opsPerSec, bytesPerOp = measure(lambda: arena.handleIncomingUDPBatch(burst))
+    results[f"handleIncomingUDPBatch/{BATCH_SIZE} (per event)"] = (opsPerSec * BATCH_SIZE, bytesPerOp / BATCH_SIZE)
+
+    # --- per tick --------------------------------------------------------
+    results["processPendingEvents (idle)"] = measure(arena.processPendingEvents)
+    results["updateTimer"] = measure(arena.updateTimer)
+
+    version = arena.state.version
+    results["getActionDelta (idle)"] = measure(lambda: arena.getActionDelta(version))
+
+    def deltaAfterOneHit():
+        since = arena.state.version
+        arena.applyEvent(tagEvent)
+        arena.getActionDelta(since)
+
+    results["applyEvent + getActionDelta"] = measure(deltaAfterOneHit)
+    results["getActionSnapshot"] = measure(arena.getActionSnapshot)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Controller hot-path microbenchmarks (no Tk, no Postgres).")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma separated roster sizes (players in the whole match)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    allResults = {}
+    for playerCount in sizes:
+        results = benchRosterSize(playerCount)
+        allResults[playerCount] = results
+
+        print(f"\n{playerCount} players")
+        print(f"{'stage':<40} {'ops/sec':>14} {'bytes/op':>10}")
+        print("-" * 66)
+        for stage, (opsPerSec, bytesPerOp) in results.items():
+            print(f"{stage:<40} {opsPerSec:>14,.0f} {bytesPerOp:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as jsonFile:
+            json.dump(
+                {
+                    str(playerCount): {
+                        stage: {"ops_per_sec": opsPerSec, "bytes_per_op": bytesPerOp}
+                        for stage, (opsPerSec, bytesPerOp) in results.items()
+                    }
+                    for playerCount, results in allResults.items()
+                },
+                jsonFile,
+                indent=2,
+            )
+        print(f"\nSaved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Microbenchmark: the old parse_packet (decode -> strip -> split -> dict)
+vs the bytes-level parse_packet_bytes (PacketEvent) and parse_packet_batch.
+
+Run it from the repo root:
+    python3 bench/parser_bench.py
+
+Before timing anything it checks that both parsers give the same answer for PARITY_INPUTS
+(and exits with an error if they don't), so a faster parser can't quietly drop real hits.
+
+Nothing here needs Tk, Postgres, or the network. It only imports net/udp.py.
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+# Let "from net import udp" work when this is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from net import udp  # noqa: E402
+
+
+# The three kinds of traffic the listener sees
+INPUTS = {
+    "valid tag": b"11:33",
+    "base code": b"33:53",
+    "garbage": b"hello",
+}
+
+# Odd datagrams the old decode + strip path accepted or rejected, the new parser has to agree
+PARITY_INPUTS = [
+    b"11:33", b"33:53", b" 11 : 43 \n", b"hello", b"9999", b"11:", b"::", b"", b"11:33:44",
+    b"\xff11:33",          # stray byte that isn't UTF-8
+    b"11:33\x1c",          # separator that str.strip() counts as whitespace
+    b"11:\xa033",          # lone Latin-1 no-break space
+    b"11:\xc2\xa033",      # UTF-8 no-break space
+    "\u0661\u0661:\u0663\u0663".encode("utf-8"),  # Arabic-Indic digits, int() reads those
+    b"11\x00:33", b"+11:-33", b"1_1:33", b"abc:def",
+]
+
+ROUNDS = 200000
+BATCH_SIZE = 64  # same as udp.batchRingSize
+
+
+def oldPath(data):
+    """What the listener used to do for every datagram."""
+    return udp.parse_packet(data.decode("utf-8", errors="ignore").strip())
+
+
+def checkParity():
+    """Returns the inputs where oldPath and parse_packet_bytes disagree (should be none)."""
+    mismatches = []
+    for data in PARITY_INPUTS:
+        old = oldPath(data)
+        new = udp.parse_packet_bytes(data)
+        old = None if old is None else (old["type"], old["transmitter"], old["hit"])
+        new = None if new is None else tuple(new)
+        if old != new:
+            mismatches.append((data, old, new))
+    return mismatches
+
+
+def timePerCall(func, arg, rounds):
+    seconds = min(timeit.repeat(lambda: func(arg), number=rounds, repeat=3))
+    return seconds / rounds * 1e9  # nanoseconds per call
+
+
+def bytesPerCall(func, arg, rounds=2000):
+    """Bytes allocated per call while the results are kept alive (like a batch would)."""
+    tracemalloc.start()
+    kept = [func(arg) for _ in range(rounds)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current / rounds
+
+
+def main():
+    mismatches = checkParity()
+    for data, old, new in mismatches:
+        print(f"Parsers disagree on {data!r}: parse_packet {old}, parse_packet_bytes {new}")
+    if mismatches:
+        sys.exit(1)
+    print(f"Parity: both parsers agree on all {len(PARITY_INPUTS)} odd inputs.\n")
+
+    print(f"{'input':<12} {'parser':<22} {'ns/call':>10} {'bytes/call':>11}")
+    print("-" * 58)
+
+    for name, data in INPUTS.items():
+        for label, func in (("parse_packet (dict)", oldPath), ("parse_packet_bytes", udp.parse_packet_bytes)):
+            ns = timePerCall(func, data, ROUNDS)
+            allocated = bytesPerCall(func, data)
+            print(f"{name:<12} {label:<22} {ns:>10.1f} {allocated:>11.1f}")
+
+        batch = [data] * BATCH_SIZE
+        ns = timePerCall(udp.parse_packet_batch, batch, ROUNDS // BATCH_SIZE) / BATCH_SIZE
+        print(f"{name:<12} {'parse_packet_batch':<22} {ns:>10.1f} {'':>11}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Load test for the UDP listener + controller, all on localhost.
+
+A generator process blasts datagrams at the receive port at a target rate, with a
+configurable mix of:
+    tag        opponent tag, like "1000:5000"
+    base       a player scoring on the other team's base, like "1000:43"
+    same_team  teammate tag, like "1000:1001"
+    self       self-tag, like "1000:1000" (should be ignored)
+    garbage    junk like "hello", "9999", "11:" (should be ignored)
+
+Meanwhile this process runs the real listener (net/udp.py) and a game loop that calls
+arena.processPendingEvents() every tick, like the Action screen does.
+
+It reports:
+- packets/sec sent and received
+- drop rate (sent but never received, plus the kernel's own drop counter when Linux has one)
+- latency percentiles from right after each datagram's recvfrom_into to when the tick
+  that handled it finished (processPendingEvents -> handleIncomingUDPBatch returned)
+
+Run it from the repo root (it uses a port of its own by default, so a running app is fine):
+    python3 bench/udp_load.py
+    python3 bench/udp_load.py --rate 50000 --seconds 10 --tick-ms 250
+    python3 bench/udp_load.py --mix tag=50,base=5,same_team=20,self=5,garbage=20
+
+Broadcasts are muted unless --broadcast is passed, and nothing is written to the database
+or the match history. Tk is never imported.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+# Let "import controller" work when this is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import controller  # noqa: E402
+from net import udp  # noqa: E402
+
+
+DEFAULT_MIX = {"tag": 60, "base": 10, "same_team": 15, "self": 5, "garbage": 10}
+GARBAGE = [b"hello", b"9999", b"11:", b"::", b"abc:def", b""]
+PAYLOAD_POOL_SIZE = 4096
+
+
+def redEquipment(playersPerTeam):
+    return [1000 + i for i in range(playersPerTeam)]
+
+
+def greenEquipment(playersPerTeam):
+    return [5000 + i for i in range(playersPerTeam)]
+
+
+def makePayloads(mix, playersPerTeam, seed):
+    """Builds a pool of datagrams that follows the mix (the generator cycles through it)."""
+    rng = random.Random(seed)
+    red = redEquipment(playersPerTeam)
+    green = greenEquipment(playersPerTeam)
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+
+    payloads = []
+    for kind in rng.choices(kinds, weights=weights, k=PAYLOAD_POOL_SIZE):
+        team, other = (red, green) if rng.random() < 0.5 else (green, red)
+        tagger = rng.choice(team)
+
+        if kind == "tag":
+            payloads.append(f"{tagger}:{rng.choice(other)}".encode())
+        elif kind == "base":
+            payloads.append(f"{tagger}:{43 if team is red else 53}".encode())
+        elif kind == "same_team":
+            teammates = [eq for eq in team if eq != tagger] or team
+            payloads.append(f"{tagger}:{rng.choice(teammates)}".encode())
+        elif kind == "self":
+            payloads.append(f"{tagger}:{tagger}".encode())
+        else:
+            payloads.append(rng.choice(GARBAGE))
+
+    return payloads
+
+
+def generateTraffic(port, rate, seconds, payloads, sentCounter):
+    """
+    Runs in its own process so it doesn't fight the listener for the GIL.
+    Every millisecond or so it sends however many datagrams it is behind by.
+    """
+    txSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    target = ("127.0.0.1", port)
+    poolSize = len(payloads)
+
+    sent = 0
+    began = time.perf_counter()
+    while True:
+        elapsed = time.perf_counter() - began
+        if elapsed >= seconds:
+            break
+
+        due = int(rate * elapsed)
+        while sent < due:
+            try:
+                txSocket.sendto(payloads[sent % poolSize], target)
+            except OSError:
+                pass  # the local socket buffer was full, that counts as a drop
+            sent += 1
+
+        time.sleep(0.001)
+
+    sentCounter.value = sent
+
+
+def percentile(sortedValues, fraction):
+    if not sortedValues:
+        return 0.0
+    index = min(len(sortedValues) - 1, int(fraction * len(sortedValues)))
+    return sortedValues[index]
+
+
+def setUpArena(playersPerTeam, broadcast):
+    """An arena of its own: full rosters, PLAYING phase, and nothing going out to the DB or history."""
+    arena = controller.GameController("load", historyFile=":memory:", muteBroadcasts=not broadcast)
+    arena.maxPlayersPerTeam = max(arena.maxPlayersPerTeam, playersPerTeam)
+    arena.recordMatches = False
+
+    for i, eq in enumerate(redEquipment(playersPerTeam)):
+        arena.addPlayerToTeam("RED", 1000 + i, f"Red{i}", eq, broadcast=False)
+    for i, eq in enumerate(greenEquipment(playersPerTeam)):
+        arena.addPlayerToTeam("GREEN", 2000 + i, f"Green{i}", eq, broadcast=False)
+
+    arena.changePhase("PLAYING")
+    return arena
+
+
+def runLoad(rate, seconds, mix, playersPerTeam, port, tickMs, broadcast, seed=7501):
+    udp.printEachPacket = False
+    udp.receivePort = port
+    arena = setUpArena(playersPerTeam, broadcast)
+
+    # One recvfrom_into time per queued event, in the same order as arena.pendingEvents
+    receivedAt = deque()
+    batchTimes = []
+
+    def onReceiveTimes(eventTimes):
+        batchTimes.append(eventTimes)  # the listener calls onBatch with these events next
+
+    def onBatch(events):
+        eventTimes = batchTimes.pop()
+        # The times go in first, so the game loop never drains an event without its time
+        receivedAt.extend(eventTimes)
+        droppedBefore = arena.pendingStats["dropped"]
+        arena.queueIncomingUDPBatch(events)
+        if arena.pendingStats["dropped"] != droppedBefore:
+            for _ in eventTimes:
+                receivedAt.pop()  # never queued, nothing will drain these
+
+    udp.receiveTimesHook = onReceiveTimes
+    udp.netBeginUDP_Listener(newBatch=onBatch)
+    time.sleep(0.2)  # let the socket bind
+
+    receivedBefore = udp.receiveStats["received"]
+    ignoredBefore = udp.receiveStats["ignored"]
+    kernelDropsBefore = udp.kernelDropCount(port)
+
+    sentCounter = multiprocessing.Value("q", 0)
+    generator = multiprocessing.Process(
+        target=generateTraffic,
+        args=(port, rate, seconds, makePayloads(mix, playersPerTeam, seed), sentCounter),
+        daemon=True,
+    )
+
+    latencies = []
+    applied = 0
+    stop = threading.Event()
+
+    # processPendingEvents hands every drained event to handleIncomingUDPBatch in one call,
+    # so the wrapper knows how many events this tick handled and when it was done with them
+    handleBatch = arena.handleIncomingUDPBatch
+
+    def timedBatch(batch):
+        result = handleBatch(batch)
+        doneAt = time.perf_counter()
+        for _ in range(len(batch)):
+            latencies.append(doneAt - receivedAt.popleft())
+        return result
+
+    arena.handleIncomingUDPBatch = timedBatch
+
+    def gameLoop():
+        nonlocal applied
+        while True:
+            finalPass = stop.is_set()
+            applied += arena.processPendingEvents()
+            if finalPass:
+                return
+            time.sleep(tickMs / 1000.0)
+
+    loopThread = threading.Thread(target=gameLoop, daemon=True)
+
+    began = time.perf_counter()
+    loopThread.start()
+    generator.start()
+    generator.join()
+    time.sleep(0.5)  # let the last datagrams and the last tick land
+    stop.set()
+    loopThread.join()
+    elapsed = time.perf_counter() - began
+    udp.receiveTimesHook = None
+
+    sent = sentCounter.value
+    received = udp.receiveStats["received"] - receivedBefore
+    kernelDropsAfter = udp.kernelDropCount(port)
+    latencies.sort()
+
+    return {
+        "sent": sent,
+        "received": received,
+        "ignored": udp.receiveStats["ignored"] - ignoredBefore,
+        "applied": applied,
+        "queue_dropped": arena.pendingStats["dropped"],
+        "seconds": elapsed,
+        "sent_pps": sent / seconds,
+        "received_pps": received / seconds,
+        "drop_rate": (sent - received) / sent if sent else 0.0,
+        "kernel_drops": (
+            kernelDropsAfter - kernelDropsBefore
+            if kernelDropsBefore is not None and kernelDropsAfter is not None else None
+        ),
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p90": percentile(latencies, 0.90) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": (latencies[-1] * 1000) if latencies else 0.0,
+        },
+        "red_total_score": arena.getRedTotalScore(),
+        "green_total_score": arena.getGreenTotalScore(),
+    }
+
+
+def parseMix(text):
+    """"tag=60,base=10" -> {"tag": 60, "base": 10}"""
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown traffic kind '{kind}'. Use: {', '.join(DEFAULT_MIX)}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Localhost UDP load test for the listener and controller.")
+    parser.add_argument("--rate", type=int, default=20000, help="datagrams per second to send")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--mix", type=parseMix, default=DEFAULT_MIX,
+                        help="weights, e.g. tag=60,base=10,same_team=15,self=5,garbage=10")
+    parser.add_argument("--players", type=int, default=controller.MAX_PLAYERS_PER_TEAM, help="players per team")
+    parser.add_argument("--port", type=int, default=17501, help="receive port (use 7501 to test the real one)")
+    parser.add_argument("--tick-ms", type=float, default=250.0,
+                        help="how often the game loop drains the queue (the Action screen uses 250)")
+    parser.add_argument("--broadcast", action="store_true", help="really send the score broadcasts")
+    args = parser.parse_args()
+
+    report = runLoad(args.rate, args.seconds, args.mix, args.players, args.port, args.tick_ms, args.broadcast)
+
+    print(f"Sent      {report['sent']:>10,}  ({report['sent_pps']:,.0f} pps)")
+    print(f"Received  {report['received']:>10,}  ({report['received_pps']:,.0f} pps)")
+    print(f"Dropped   {report['sent'] - report['received']:>10,}  ({report['drop_rate']:.2%})"
+          + (f", kernel counter +{report['kernel_drops']}" if report["kernel_drops"] is not None else ""))
+    print(f"Ignored   {report['ignored']:>10,}  (garbage)")
+    print(f"Applied   {report['applied']:>10,}  (queue dropped {report['queue_dropped']:,})")
+    latency = report["latency_ms"]
+    print(f"Latency   p50 {latency['p50']:.2f} ms   p90 {latency['p90']:.2f} ms   "
+          f"p99 {latency['p99']:.2f} ms   max {latency['max']:.2f} ms")
+    print(f"Scores    Red {report['red_total_score']}  Green {report['green_total_score']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,56 @@
 # - Emma your UI Code should call these controller functions.
 # - Also, your UI code shouldn't directly talk to Will's database or Caleb's UDP network code.
 # - This is because the controller keeps everything consistent and prevents confusion.
+#
+# Arenas:
+# - Everything that belongs to one arena (roster, timer, event queue, listener ports,
+#   broadcast target, match history, recording) lives in a GameController object.
+# - The module-level functions (startGame(), addPlayerToTeam(), ...) are the same as always,
+#   they just go to defaultController. The UI doesn't have to know arenas exist.
+# - More arenas in the same process: createArena("arena2", receivePort=7511, broadcastPort=7510)
 
 from model import Game_State, PlayerData
 from net import udp  # Caleb added
-from db import database  # Will's database functions - REAL DB CONNECTION!
+from db import codename_cache  # read-through cache in front of Will's db/database.py - REAL DB CONNECTION!
+from db import history  # match history (local SQLite file, not the players table)
+from db import leaderboard
+import replay  # match recording (see replay.py)
+import game_clock  # phase deadlines on their own thread (see game_clock.py)
+import csv
+import io
+import math
+import os
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-# This is the app's only shared game state.
-# Everyone will read & write through this object.
-state = Game_State()
+# Arena settings. Every arena follows these module values, so controller.playSeconds = 60
+# (even after import) changes the default arena and every other one. An arena can also set
+# its own, e.g. arena.playSeconds = 60, and then only that arena changes (see ArenaSetting).
 warningSeconds = 30
 playSeconds = 360
+MAX_PLAYERS_PER_TEAM = 15
+maxPendingEvents = 10000
+
+# With this on, each arena's phase deadlines fire on a clock thread (game_clock.py), so 202/221
+# go out on time even if the UI is busy. Off, updateTimer() moves the phases itself when it sees
+# a deadline has passed (bench/controller_bench.py turns it off).
+useClockThread = True
+
+appFolder = os.path.dirname(os.path.abspath(__file__))
+
+# Old event log lines spill out of the in-memory ring into this append-only file
+eventLogArchivePath = os.path.join(appFolder, "logs", "event_log_archive.txt")
 
-lastTickOfTimer = None
+# Every applied hit and every match's final scores are kept here across matches.
+# Hits are written in batches, never one at a time (see db/history.py).
+historyPath = os.path.join(appFolder, "data", "match_history.sqlite3")
+
+# Match recording for replay.py. With recordMatches on, every match from startGame()
+# to the end of the clock is recorded into replayFolder (an arena setting like the ones above).
+recordMatches = False
+replayFolder = os.path.join(appFolder, "logs", "replays")
 
 
 # ------------------------------
@@ -25,14 +62,14 @@ lastTickOfTimer = None
 =========================================================
 PHOTON GAME CONTROLLER - LOGIC & STATE
 =========================================================
-This file acts as the central brain. The UI (app.py) calls this, 
+This file acts as the central brain. The UI (app.py) calls this,
 and this calls the Database (database.py) and Network (udp.py).
 
 SCORING & GAMEPLAY RULES:
 1. Opponent Tag    : Tagger gains 10 points. Team gains 10 points.
-2. Same-Team Tag   : Tagger loses 10 points. Tagged loses 10 points. 
+2. Same-Team Tag   : Tagger loses 10 points. Tagged loses 10 points.
                      Team total drops by 20 points.
-3. Base Score      : Player gains 100 points and receives a [BASE] icon. 
+3. Base Score      : Player gains 100 points and receives a [BASE] icon.
                      Team gains 100 points.
    - Code 43 = Red Base (Green player scores)
    - Code 53 = Green Base (Red player scores)
@@ -43,32 +80,6 @@ INVALID EVENT HANDLING:
 - Hits received before the "PLAYING" phase are ignored.
 """
 
-def grabState():
-    """
-    The UI will call this to read the current state of the game.
-    For Example: reveal the roster, show timer, and text from the log.
-    """
-    return state
-
-def getRedTotalScore():
-    return sum(player.score for player in state.redTeam)
-
-
-def getGreenTotalScore():
-    return sum(player.score for player in state.greenTeam)
-
-
-def getActionSnapshot():
-    return {
-        "phase": state.phase,
-        "time_remaining": state.time_remaining,
-        "red_total_score": getRedTotalScore(),
-        "green_total_score": getGreenTotalScore(),
-        "event_log": list(state.eventLog),
-        "red_roster": getSortedRedRoster(),
-        "green_roster": getSortedGreenRoster(),
-    }
-
 def sortRosterKey(player):
     """
     Score is sorted from highest to lowest.
@@ -77,413 +88,1318 @@ def sortRosterKey(player):
     return (-player.score, player.codename.lower())
 
 
-def getSortedRedRoster():
-    """
-    The red roster sorted by score from highest to lowest and returned
-    If there's a tie, the codenames are sorted alphabetically
-    """
-    return sorted(state.redTeam, key=sortRosterKey)
-
-
-def getSortedGreenRoster():
+def isBaseCode(hitID):
     """
-    The green roster sorted by score from highest to lowest and returned
-    If there's a tie, the codenames are sorted alphabetically
+    if the hit ID is one of the project base codes then this should return true
     """
-    return sorted(state.greenTeam, key=sortRosterKey)
+    return hitID in (43, 53)
 
-def changePhase(phase):
-    """
-    This function changes what part of the app we are in.
-    Using this, the UI can pick which screen will be shown.
-    """
-    state.phase = phase
 
-def recordLog(message):
-    """
-    Use this to add messages to the event log.
-    These messages will displayed to the action screen later.
-    """
-    state.eventLog.append(str(message))
-
-def resetTheActionState():
+def playersAreOnSameTeam(playerOne, playerTwo):
     """
-    For new matches, reset the gameplay state.
-
-    This won't remove players from the rosters.
-    It only resets things that live in the live action screen / match state.
+    If both players are on the same team this will return true.
     """
-    global lastTickOfTimer
-
-    for player in state.redTeam + state.greenTeam:
-        player.score = 0
-        player.has_baseIcon = False
-
-    state.eventLog.clear()
-    state.time_remaining = 0
-    state.timer_running = False
-    lastTickOfTimer = None
+    if playerOne is None or playerTwo is None:
+        return False
+    return playerOne.team == playerTwo.team
 
 
-def startGame():
+class ClockEvent:
     """
-    Starts a new match.
+    A phase deadline the clock thread (or updateTimer, without one) put in an arena's pendingEvents.
+    It waits in line with the hits, so a hit that came in before the deadline still counts
+    and one that came in after it doesn't.
     """
-    global lastTickOfTimer
-
-    resetTheActionState()
-
-    state.phase = "WARNING"
-    state.time_remaining = warningSeconds
-    state.timer_running = True
-    lastTickOfTimer = time.monotonic()
+    __slots__ = ("phase", "deadline", "matchNumber")
 
-    recordLog("A 30-second warning countdown has begun. GET READY.")
-    recordLog("After 13 seconds, the countdown intro will begin.")
+    def __init__(self, phase, deadline, matchNumber):
+        self.phase = phase
+        self.deadline = deadline
+        self.matchNumber = matchNumber
 
 
-def moveOneSecond():
+class ArenaSetting:
     """
-    This will advance the game clock by one second only.
-    Phase transitions are handled here when the timer reaches zero.
+    A GameController setting that reads the module-level value of the same name every time,
+    until an arena assigns its own (del arena.<name> goes back to following the module).
     """
-    if state.time_remaining > 0:
-        state.time_remaining -= 1
 
-    if state.time_remaining > 0:
-        return
+    def __init__(self, moduleName):
+        self.moduleName = moduleName
 
-    if state.phase == "WARNING":
-        state.phase = "PLAYING"
-        state.time_remaining = playSeconds
-        recordLog("The warning countdown is over. The live game has begun.")
-        netBroadcastEquipment(202)
+    def __set_name__(self, owner, name):
+        self.name = name
 
-    elif state.phase == "PLAYING":
-        state.phase = "ENDED"
-        state.time_remaining = 0
-        state.timer_running = False
-        recordLog("Uh Oh! The Game clock has expired. Game ended.")
+    def __get__(self, arena, owner=None):
+        if arena is None:
+            return self
+        try:
+            return arena.__dict__[self.name]
+        except KeyError:
+            return globals()[self.moduleName]
 
-        for _ in range(3):
-            netBroadcastEquipment(221)
+    def __set__(self, arena, value):
+        arena.__dict__[self.name] = value
 
+    def __delete__(self, arena):
+        arena.__dict__.pop(self.name, None)
 
-def updateTimer():
-    """
-    This function will make sure that the controller clock is in sync with time.
-    The user interface should call this on a short repeating sequence
-    """
-    global lastTickOfTimer
 
-    if not state.timer_running:
-        return state.time_remaining
+# Arenas saving to the main history file share one leaderboard, so "top players this week"
+# counts every arena's matches. An arena with a history file of its own gets its own leaderboard.
+sharedLeaderboard = None
 
-    if lastTickOfTimer is None:
-        lastTickOfTimer = time.monotonic()
-        return state.time_remaining
 
-    now = time.monotonic()
-    secondsElapsed = int(now - lastTickOfTimer)
+def leaderboardFor(matchHistory):
+    global sharedLeaderboard
 
-    if secondsElapsed <= 0:
-        return state.time_remaining
-
-    for _ in range(secondsElapsed):
-        if not state.timer_running:
-            break
-        moveOneSecond()
-
-    lastTickOfTimer += secondsElapsed
-    return state.time_remaining
+    if matchHistory.path != historyPath:
+        return leaderboard.Leaderboard(matchHistory)
 
+    if sharedLeaderboard is None:
+        sharedLeaderboard = leaderboard.Leaderboard(matchHistory)
+    else:
+        sharedLeaderboard.attach(matchHistory)
+    return sharedLeaderboard
 
-def formatTimeRemaining():
-    """
-    This is not used at the moment but will be for the Action screen later.
-    """
-    minutes, seconds = divmod(max(state.time_remaining, 0), 60)
-    return f"{minutes}:{seconds:02d}"
 
-def findPlayerByEquipmentID(equipmentID):
+class GameController:
     """
-    A player in can be found in either roster using their equipment/transmitter ID.
-    The PlayerData object is returned or None if not found.
+    One arena: its own Game_State, timer, event queue, listener ports, broadcast target,
+    match history and recording.
+
+    - receivePort / broadcastPort / networkIP all left as None means the arena uses the normal
+      udp.py functions (ports 7501 / 7500 and the IP from "Set Broadcast IP"). That's the default arena.
+    - Any other arena gets its own AsyncUDPEngine (net/async_udp.py). All of those engines share
+      ONE event loop thread, and each one hands its packets straight to its own arena's queue,
+      so there is no lookup per packet.
+    - historyFile=":memory:" keeps the match history in memory only (replays and benchmarks).
+    - muteBroadcasts=True never sends anything to the equipment (replays).
     """
-    for player in state.redTeam + state.greenTeam:
-        if player.equipmentID == equipmentID:
-            return player
-    return None
 
-MAX_PLAYERS_PER_TEAM = 15
+    # Follow the module values above unless this arena sets its own
+    warningSeconds = ArenaSetting("warningSeconds")
+    playSeconds = ArenaSetting("playSeconds")
+    maxPlayersPerTeam = ArenaSetting("MAX_PLAYERS_PER_TEAM")
+    maxPendingEvents = ArenaSetting("maxPendingEvents")
+    useClockThread = ArenaSetting("useClockThread")
+    recordMatches = ArenaSetting("recordMatches")
+
+    def __init__(self, name="main", receivePort=None, broadcastPort=None, networkIP=None,
+                 archivePath=None, historyFile=None, muteBroadcasts=False):
+        self.name = name
+
+        # This is the arena's only shared game state.
+        # Everyone will read & write through this object.
+        self.state = Game_State()
+        self.state.eventLog.archivePath = archivePath
+
+        # The clock: the current phase ends at phaseDeadline (a time.monotonic() value).
+        # matchNumber goes up on every reset, so deadlines from an old match are ignored.
+        # queuedClockPhase is the phase whose deadline already fired but hasn't been applied yet.
+        self.clock = None
+        self.phaseDeadline = None
+        self.matchNumber = 0
+        self.queuedClockPhase = None
+        self.clockStats = {"applied": 0, "lastApplyLateMs": 0.0, "maxApplyLateMs": 0.0}
+
+        # Events from the UDP thread wait here until the UI tick applies them (single writer).
+        # deque.extend/popleft are safe to call from two threads on their own. queueLock is
+        # only there so that what gets recorded for replay.py is in the same order as this line
+        # (packets from the listener and phase deadlines from the clock thread), and so that
+        # a deadline is never checked against one match and scheduled into the next.
+        self.pendingEvents = deque()
+        self.queueLock = threading.Lock()
+        self._rawWaiting = []  # raw datagrams waiting to be recorded with their batch (listener thread only)
+        self.pendingStats = {"queued": 0, "dropped": 0, "applied": 0, "largestDrain": 0}
+
+        self.matchHistory = history.MatchHistory(historyPath if historyFile is None else historyFile)
+        self.leaderboard = leaderboardFor(self.matchHistory)  # running totals, updated at each match end
+
+        self.recorder = None
+
+        # replay.py turns this on so a replay never sends anything to the real equipment
+        self.muteBroadcasts = muteBroadcasts
+
+        self.usesSharedNetwork = receivePort is None and broadcastPort is None and networkIP is None
+        self.receivePort = receivePort
+        self.broadcastPort = broadcastPort
+        self.networkIP = networkIP
+        self.engine = None
+        self.listener_is_running = False
+
+    def __repr__(self):
+        return f"GameController({self.name!r}, phase={self.state.phase!r})"
+
+    def grabState(self):
+        """
+        The UI will call this to read the current state of the game.
+        For Example: reveal the roster, show timer, and text from the log.
+        """
+        return self.state
+
+    def getRedTotalScore(self):
+        return self.state.redTotalScore
+
+    def getGreenTotalScore(self):
+        return self.state.greenTotalScore
+
+    def addPointsToPlayer(self, player, points):
+        """
+        Every score change goes through here.
+        It changes the player's score and their team's running total together,
+        that way the totals never have to be re-added from the rosters.
+        """
+        player.score += points
+        player.version = self.bumpVersion()
+
+        if player.team == "RED":
+            self.state.redTotalScore += points
+        else:
+            self.state.greenTotalScore += points
+
+    def bumpVersion(self):
+        """
+        Moves the state version forward by one and returns it.
+        Anything that changes what the Action screen shows should call this.
+        """
+        self.state.version += 1
+        return self.state.version
+
+    def markFullRefresh(self):
+        """
+        Used when the rosters or the log get rebuilt (clear, reset, new player).
+        Anyone holding an older version gets a full snapshot from getActionDelta().
+        """
+        self.state.resetVersion = self.bumpVersion()
+
+    def getActionSnapshot(self):
+        state = self.state
+        return {
+            "version": state.version,
+            "phase": state.phase,
+            "time_remaining": state.time_remaining,
+            "red_total_score": state.redTotalScore,
+            "green_total_score": state.greenTotalScore,
+            "event_log": list(state.eventLog),
+            "red_roster": self.getSortedRedRoster(),
+            "green_roster": self.getSortedGreenRoster(),
+        }
+
+    def getActionDelta(self, sinceVersion):
+        """
+        Returns only what changed after sinceVersion.
+        The UI keeps the "version" from the last delta and passes it back in next time.
+
+        - If nothing moved, "changed" is False and the UI can skip drawing.
+        - If sinceVersion is None or older than the last clear/reset, "full" is True
+          and everything is included (the UI should clear its log first).
+        - red_roster / green_roster are only sorted and sent if a player on that team changed,
+          otherwise they are None.
+        - new_log holds only the log lines added after sinceVersion.
+        """
+        state = self.state
+        full = sinceVersion is None or sinceVersion < state.resetVersion
+
+        delta = {
+            "version": state.version,
+            "changed": full or sinceVersion != state.version,
+            "full": full,
+            "phase": state.phase,
+            "time_remaining": state.time_remaining,
+            "phase_changed": full,
+            "timer_changed": full,
+            "red_total_score": state.redTotalScore,
+            "green_total_score": state.greenTotalScore,
+            "changed_players": [],
+            "red_roster": None,
+            "green_roster": None,
+            "new_log": [],
+        }
+
+        if full:
+            delta["changed_players"] = list(state.playersByPlayerID.values())
+            delta["red_roster"] = self.getSortedRedRoster()
+            delta["green_roster"] = self.getSortedGreenRoster()
+            delta["new_log"] = list(state.eventLog)
+            return delta
+
+        if not delta["changed"]:
+            return delta
+
+        delta["phase_changed"] = state.phaseVersion > sinceVersion
+        delta["timer_changed"] = state.timerVersion > sinceVersion
+
+        redChanged = False
+        greenChanged = False
+        for player in state.playersByPlayerID.values():
+            if player.version > sinceVersion:
+                delta["changed_players"].append(player)
+                if player.team == "RED":
+                    redChanged = True
+                else:
+                    greenChanged = True
+
+        if redChanged:
+            delta["red_roster"] = self.getSortedRedRoster()
+        if greenChanged:
+            delta["green_roster"] = self.getSortedGreenRoster()
+
+        # Each log line's sequence number is the version it was added at
+        delta["new_log"] = state.eventLog.since(sinceVersion)
+
+        return delta
+
+    def getSortedRedRoster(self):
+        """
+        The red roster sorted by score from highest to lowest and returned
+        If there's a tie, the codenames are sorted alphabetically
+        """
+        return sorted(self.state.redTeam, key=sortRosterKey)
+
+    def getSortedGreenRoster(self):
+        """
+        The green roster sorted by score from highest to lowest and returned
+        If there's a tie, the codenames are sorted alphabetically
+        """
+        return sorted(self.state.greenTeam, key=sortRosterKey)
+
+    def changePhase(self, phase, record=True):
+        """
+        This function changes what part of the app we are in.
+        Using this, the UI can pick which screen will be shown.
+        record is False for phase deadlines, queueDeadline() already recorded those.
+        """
+        if self.state.phase == phase:
+            return
+        self.state.phase = phase
+        self.state.phaseVersion = self.bumpVersion()
+
+        if record and self.recorder is not None:
+            self.recorder.phase(phase)
+
+    def setTimeRemaining(self, seconds):
+        """
+        Sets the clock and marks the timer as changed for getActionDelta().
+        """
+        if self.state.time_remaining == seconds:
+            return
+        self.state.time_remaining = seconds
+        self.state.timerVersion = self.bumpVersion()
+
+    def recordLog(self, message):
+        """
+        Use this to add messages to the event log.
+        These messages will displayed to the action screen later.
+        """
+        self.state.eventLog.append(str(message), seq=self.bumpVersion())
+
+    def resetTheActionState(self):
+        """
+        For new matches, reset the gameplay state.
+
+        This won't remove players from the rosters.
+        It only resets things that live in the live action screen / match state.
+        """
+        state = self.state
+        for player in state.playersByPlayerID.values():
+            player.score = 0
+            player.has_baseIcon = False
+
+        state.redTotalScore = 0
+        state.greenTotalScore = 0
+        state.eventLog.clear()
+        self.setTimeRemaining(0)
+        state.timer_running = False
+        with self.queueLock:
+            self.pendingEvents.clear()  # hits from before the reset should never count in the new match
+            self.matchNumber += 1
+            self.queuedClockPhase = None
+            self.phaseDeadline = None
+            if self.clock is not None:
+                self.clock.cancel()
+        self.markFullRefresh()
+
+    def startGame(self):
+        """
+        Starts a new match.
+        """
+        if self.recordMatches:
+            self.startRecording()
+
+        self.resetTheActionState()
+        self.matchHistory.beginMatch()
+        if self.recorder is not None:
+            self.recorder.start()
+
+        self.changePhase("WARNING")
+        self.setTimeRemaining(self.warningSeconds)
+        self.state.timer_running = True
+        self.scheduleDeadline(time.monotonic() + self.warningSeconds)
+
+        self.recordLog("A 30-second warning countdown has begun. GET READY.")
+        self.recordLog("After 13 seconds, the countdown intro will begin.")
+
+    def scheduleDeadline(self, deadline):
+        """
+        Sets when the current phase ends, and hands it to the clock thread (if it's on).
+        """
+        with self.queueLock:
+            if self.queuedClockPhase == self.state.phase:
+                return  # this phase's deadline already fired, the change is waiting in line
+
+            self.phaseDeadline = deadline
+            if not self.useClockThread:
+                return
+
+            if self.clock is None:
+                self.clock = game_clock.GameClock(self.onClockDeadline, name=self.name)
+            self.clock.schedule(self.state.phase, deadline, self.matchNumber)
+
+    def onClockDeadline(self, phase, deadline, matchNumber):
+        """
+        Runs on the CLOCK thread the moment a phase deadline is due.
+        The match number is checked and the next deadline scheduled under queueLock,
+        so an F12 or a new START can't slip in between and get its deadline overwritten.
+        """
+        with self.queueLock:
+            if matchNumber != self.matchNumber:
+                return  # the match was cleared or restarted in the meantime
+
+            self.queueDeadline(phase, deadline)
+            if phase == "WARNING":
+                self.clock.schedule("PLAYING", deadline + self.playSeconds, matchNumber)
+
+    def queueDeadline(self, phase, deadline):
+        """
+        The part of a phase deadline that can't wait for the game thread. Call it with queueLock held.
+        - 202 / 221 go out right now
+        - the new phase is recorded and a ClockEvent goes in line, both under queueLock, so the
+          recording has the phase change in the same spot as the packets around it
+        The game thread makes the actual change when it gets to the ClockEvent (applyClockEvent).
+        """
+        if phase == "WARNING":
+            nextPhase = "PLAYING"
+            self.netBroadcastEquipment(202)
+        elif phase == "PLAYING":
+            nextPhase = "ENDED"
+            for _ in range(3):
+                self.netBroadcastEquipment(221)
+        else:
+            return
+
+        if self.recorder is not None:
+            self.recorder.phase(nextPhase)
+
+        # Not queueIncomingUDPBatch(), a full queue must never drop the end of a phase
+        self.queuedClockPhase = phase
+        self.pendingEvents.append(ClockEvent(phase, deadline, self.matchNumber))
+
+    def applyClockEvent(self, event):
+        """The game thread's half of a phase deadline (the broadcasts already went out)."""
+        if event.matchNumber != self.matchNumber or self.state.phase != event.phase:
+            return False
 
-def findPlayerByPlayerID(playerID):
-    """
-    Finds a player by their player ID in both rosters.
-    if nothing is found than the PlayerData object or None is returned
-    """
-    for player in state.redTeam + state.greenTeam:
-        if player.playerID == playerID:
-            return player
-    return None
+        lateMs = (time.monotonic() - event.deadline) * 1000.0
+        self.clockStats["applied"] += 1
+        self.clockStats["lastApplyLateMs"] = lateMs
+        if lateMs > self.clockStats["maxApplyLateMs"]:
+            self.clockStats["maxApplyLateMs"] = lateMs
 
+        self.queuedClockPhase = None
+        self.finishPhase(event.deadline)
+        return True
 
-def equipmentIDAlreadyExists(equipmentID):
-    """
-    if this equipment/transmitter ID is already being used it returns true
-    by any player in the present match rosters.
-    """
-    return findPlayerByEquipmentID(equipmentID) is not None
+    def finishPhase(self, deadline):
+        """
+        Phase transitions are handled here when a phase's deadline is reached.
+        Only applyClockEvent() calls this, queueDeadline() already sent 202 / 221
+        and recorded the new phase.
+        """
+        state = self.state
+
+        if state.phase == "WARNING":
+            self.changePhase("PLAYING", record=False)
+            # The next deadline counts from this one, not from now, so lateness never adds up
+            self.phaseDeadline = deadline + self.playSeconds
+            self.setTimeRemaining(min(self.playSeconds, max(0, math.ceil(self.phaseDeadline - time.monotonic()))))
+            self.recordLog("The warning countdown is over. The live game has begun.")
+
+        elif state.phase == "PLAYING":
+            self.changePhase("ENDED", record=False)
+            self.setTimeRemaining(0)
+            state.timer_running = False
+            self.phaseDeadline = None
+            self.recordLog("Uh Oh! The Game clock has expired. Game ended.")
+
+            self.matchHistory.finishMatch(
+                list(state.playersByPlayerID.values()), state.redTotalScore, state.greenTotalScore
+            )
+            if self.recordMatches:
+                self.stopRecording()
+
+    def moveOneSecond(self):
+        """
+        This will advance the game clock by one second only (the deadline moves 1 second closer).
+        With the clock thread on, a phase change this causes arrives with the next processPendingEvents().
+        """
+        if self.phaseDeadline is None:
+            return
+        self.scheduleDeadline(self.phaseDeadline - 1)
+        self.updateTimer()
+
+    def updateTimer(self):
+        """
+        This function will make sure that the controller clock is in sync with time.
+        The user interface should call this on a short repeating sequence.
+
+        It only updates the seconds shown. The phase changes and the 202/221 broadcasts
+        happen on the clock thread at the exact deadline, whenever this gets called.
+        With useClockThread off, this queues the deadline itself and applies the queue.
+        """
+        state = self.state
+        if not state.timer_running or self.phaseDeadline is None:
+            return state.time_remaining
+
+        remaining = self.phaseDeadline - time.monotonic()
+
+        if remaining <= 0 and not self.useClockThread:
+            # No clock thread, so this tick does its job: queue the deadline, then apply
+            # everything in line (the hits that came before it first, like always)
+            while state.timer_running and self.phaseDeadline is not None and self.phaseDeadline <= time.monotonic():
+                with self.queueLock:
+                    self.queueDeadline(state.phase, self.phaseDeadline)
+                self.processPendingEvents()
+                if self.queuedClockPhase is not None:
+                    break  # it was not applied, don't spin on it
+            return state.time_remaining
+
+        self.setTimeRemaining(max(0, math.ceil(remaining)))
+        return state.time_remaining
 
+    def getTimeRemainingPrecise(self):
+        """Seconds left in the current phase, with the fraction (for sub-second displays)."""
+        if not self.state.timer_running or self.phaseDeadline is None:
+            return float(self.state.time_remaining)
+        return max(0.0, self.phaseDeadline - time.monotonic())
+
+    def getClockStats(self):
+        """
+        How late the phase deadlines were, in ms:
+        - fired / lastLateMs / maxLateMs / avgLateMs: the clock thread (when 202/221 went out)
+        - applied / lastApplyLateMs / maxApplyLateMs: when the game thread showed the new phase
+        """
+        stats = self.clock.getStats() if self.clock is not None else {
+            "fired": 0, "lastLateMs": 0.0, "maxLateMs": 0.0, "totalLateMs": 0.0, "avgLateMs": 0.0
+        }
+        stats.update(self.clockStats)
+        return stats
+
+    def formatTimeRemaining(self):
+        """
+        This is not used at the moment but will be for the Action screen later.
+        """
+        minutes, seconds = divmod(max(self.state.time_remaining, 0), 60)
+        return f"{minutes}:{seconds:02d}"
+
+    def findPlayerByEquipmentID(self, equipmentID):
+        """
+        A player in can be found in either roster using their equipment/transmitter ID.
+        The PlayerData object is returned or None if not found.
+        This is a dictionary lookup, so it costs the same no matter how big the rosters are.
+        """
+        return self.state.playersByEquipmentID.get(equipmentID)
+
+    def findPlayerByPlayerID(self, playerID):
+        """
+        Finds a player by their player ID in both rosters.
+        if nothing is found than the PlayerData object or None is returned
+        """
+        return self.state.playersByPlayerID.get(playerID)
+
+    def equipmentIDAlreadyExists(self, equipmentID):
+        """
+        if this equipment/transmitter ID is already being used it returns true
+        by any player in the present match rosters.
+        """
+        return self.findPlayerByEquipmentID(equipmentID) is not None
+
+    def applyNormalHitScore(self, tagger, tagged):
+        """
+        The normal pvp scoring rules are applied.
+
+        If an opponent is hit:
+            tagger +10
+            broadcast tagged player's equipment ID
+
+        If someone is hit on the same-team:
+            tagger -10
+            tagged -10
+            broadcast tagged player's equipment ID
+            broadcast tagger's own equipment ID too
+        """
+        if playersAreOnSameTeam(tagger, tagged):
+            self.addPointsToPlayer(tagger, -10)
+            self.addPointsToPlayer(tagged, -10)
+            self.matchHistory.recordHit("SAME_TEAM", tagger, tagged)
+
+            self.recordLog(
+                f"Uh Oh! There was a same team hit! Player {tagger.codename} hit teammate {tagged.codename}. "
+                f"Sadly, both players now lose 10 points."
+            )
+
+            # rebroadcast who got hit
+            self.netBroadcastEquipment(tagged.equipmentID)
+
+            # for same-team hit, also rebroadcast tagger's own equipment ID
+            self.netBroadcastEquipment(tagger.equipmentID)
+
+        else:
+            self.addPointsToPlayer(tagger, 10)
+            self.matchHistory.recordHit("TAG", tagger, tagged)
+
+            self.recordLog(
+                f"Great! A hit was scored. Player {tagger.codename} tagged {tagged.codename}. "
+                f"{tagger.codename} gains 10 points."
+            )
+
+            #  rebroadcast who got hit
+            self.netBroadcastEquipment(tagged.equipmentID)
+
+    def applyBaseHitScore(self, tagger, baseCode):
+        """
+        Base scoring is based on the hit code as expected.
+
+        53 = red base scored
+             only a green player should be able to score and get the base icon
+
+        43 = green base scored
+             only a red player should be able to score and get the base icon
+        """
+        if baseCode == 53:
+            if tagger.team != "GREEN":
+                return False
+
+            self.addPointsToPlayer(tagger, 100)
+            tagger.has_baseIcon = True
+            self.matchHistory.recordHit("BASE", tagger, baseCode=53)
+            self.recordLog(f"{tagger.codename} scored on the red base (+100)")
+            self.netBroadcastEquipment(53)
+            return True
+
+        elif baseCode == 43:
+            if tagger.team != "RED":
+                return False
+
+            self.addPointsToPlayer(tagger, 100)
+            tagger.has_baseIcon = True
+            self.matchHistory.recordHit("BASE", tagger, baseCode=43)
+            self.recordLog(f"{tagger.codename} scored on the green base (+100)")
+            self.netBroadcastEquipment(43)
+            return True
 
-def playersAreOnSameTeam(playerOne, playerTwo):
-    """
-    If both players are on the same team this will return true.
-    """
-    if playerOne is None or playerTwo is None:
         return False
-    return playerOne.team == playerTwo.team
-
-def applyNormalHitScore(tagger, tagged):
-    """
-    The normal pvp scoring rules are applied.
-
-    If an opponent is hit:
-        tagger +10
-        broadcast tagged player's equipment ID
 
-    If someone is hit on the same-team:
-        tagger -10
-        tagged -10
-        broadcast tagged player's equipment ID
-        broadcast tagger's own equipment ID too
-    """
-    if playersAreOnSameTeam(tagger, tagged):
-        tagger.score -= 10
-        tagged.score -= 10
+    def applyEvent(self, event):
+        """
 
-        recordLog(
-            f"Uh Oh! There was a same team hit! Player {tagger.codename} hit teammate {tagged.codename}. "
-            f"Sadly, both players now lose 10 points."
-        )
+        When applying incoming events, the game logic function is used.
 
-        # rebroadcast who got hit
-        netBroadcastEquipment(tagged.equipmentID)
-
-        # for same-team hit, also rebroadcast tagger's own equipment ID
-        netBroadcastEquipment(tagger.equipmentID)
-
-    else:
-        tagger.score += 10
-
-        recordLog(
-            f"Great! A hit was scored. Player {tagger.codename} tagged {tagged.codename}. "
-            f"{tagger.codename} gains 10 points."
-        )
+        """
+        if self.state.phase != "PLAYING":
+            return False
 
-        #  rebroadcast who got hit
-        netBroadcastEquipment(tagged.equipmentID)
+        eventType = str(event.get("type", "")).upper()
 
-def applyBaseHitScore(tagger, baseCode):
-    """
-    Base scoring is based on the hit code as expected.
+        transmitterID = event.get("transmitter")
+        hitID = event.get("hit")
 
-    53 = red base scored
-         only a green player should be able to score and get the base icon
+        if transmitterID is None or hitID is None:
+            return False
 
-    43 = green base scored
-         only a red player should be able to score and get the base icon
-    """
-    if baseCode == 53:
-        if tagger.team != "GREEN":
+        tagger = self.findPlayerByEquipmentID(transmitterID)
+        if tagger is None:
             return False
 
-        tagger.score += 100
-        tagger.has_baseIcon = True
-        recordLog(f"{tagger.codename} scored on the red base (+100)")
-        netBroadcastEquipment(53)
-        return True
+        if eventType == "BASE":
+            if hitID not in (43, 53):
+                return False
 
-    elif baseCode == 43:
-        if tagger.team != "RED":
-            return False
+            return self.applyBaseHitScore(tagger, hitID)
 
-        tagger.score += 100
-        tagger.has_baseIcon = True
-        recordLog(f"{tagger.codename} scored on the green base (+100)")
-        netBroadcastEquipment(43)
-        return True
+        if eventType == "TAG":
+            tagged = self.findPlayerByEquipmentID(hitID)
 
-    return False
-    
-def applyEvent(event):
-    """
+            if tagged is None:
+                return False
 
-    When applying incoming events, the game logic function is used.
+            if tagger.equipmentID == tagged.equipmentID:
+                return False
+
+            self.applyNormalHitScore(tagger, tagged)
+            return True
 
-    """
-    if state.phase != "PLAYING":
         return False
 
-    eventType = str(event.get("type", "")).upper()
+    def validateEvent(self, event):
+        """
+        Before applyEvent() changes any scores, a parsed event is validated
+        if valid this function returns true. if false, it returns false.
+        """
+        if event is None:
+            return False
 
-    transmitterID = event.get("transmitter")
-    hitID = event.get("hit")
+        if self.state.phase != "PLAYING":
+            return False
 
-    if transmitterID is None or hitID is None:
-        return False
+        eventType = str(event.get("type", "")).upper()
+        transmitterID = event.get("transmitter")
+        hitID = event.get("hit")
 
-    tagger = findPlayerByEquipmentID(transmitterID)
-    if tagger is None:
-        return False
+        if eventType not in ("TAG", "BASE"):
+            return False
 
-    if eventType == "BASE":
-        if hitID not in (43, 53):
+        if transmitterID is None or hitID is None:
             return False
 
-        return applyBaseHitScore(tagger, hitID)
+        tagger = self.findPlayerByEquipmentID(transmitterID)
+        if tagger is None:
+            return False
 
-    if eventType == "TAG":
-        tagged = findPlayerByEquipmentID(hitID)
+        if eventType == "BASE":
+            if not isBaseCode(hitID):
+                return False
+            return True
 
+        tagged = self.findPlayerByEquipmentID(hitID)
         if tagged is None:
             return False
 
-        if tagger.equipmentID == tagged.equipmentID:
+        if transmitterID == hitID:
             return False
 
-        applyNormalHitScore(tagger, tagged)
         return True
 
-    return False
-
+    def handleIncomingUDPMessage(self, parsedEvent): # Now receives the dictionary directly
+        """
+        Receives the parsed event dictionary straight from udp.py
+        """
+        if not self.validateEvent(parsedEvent):
+            return False
 
-def isBaseCode(hitID):
-    """
-    if the hit ID is one of the project base codes then this should return true
-    """
-    return hitID in (43, 53)
+        return self.applyEvent(parsedEvent)
+
+    def handleIncomingUDPBatch(self, parsedEvents):
+        """
+        Receives every event the listener drained from the socket in one wakeup.
+        The events are applied in the order they arrived.
+        Returns how many of them actually changed the game.
+        """
+        applied = 0
+        for parsedEvent in parsedEvents:
+            if parsedEvent.__class__ is ClockEvent:
+                self.applyClockEvent(parsedEvent)
+            elif self.handleIncomingUDPMessage(parsedEvent):
+                applied += 1
+        return applied
+
+    def queueIncomingUDPBatch(self, parsedEvents):
+        """
+        This is what the UDP listener thread calls.
+        It does NOT touch the game state, it only puts the events in line for processPendingEvents().
+        If the line is already way too long (nobody is draining it), the new events are dropped and counted.
+        """
+        rawWaiting = self._rawWaiting
+        if rawWaiting:
+            self._rawWaiting = []
+
+        with self.queueLock:
+            if len(self.pendingEvents) >= self.maxPendingEvents:
+                self.pendingStats["dropped"] += len(parsedEvents)
+                return  # not recorded either, so a replay drops them too
+
+            # Recorded here rather than when they arrived, so they land in the recording
+            # at the same spot as in this line (see onClockDeadline)
+            recorder = self.recorder
+            if recorder is not None:
+                for data in rawWaiting:
+                    recorder.packet(data)
+
+            self.pendingEvents.extend(parsedEvents)
+            self.pendingStats["queued"] += len(parsedEvents)
+
+    def bufferRawPacket(self, data):
+        """
+        The listener's raw packet hook while recording (listener thread).
+        The datagram is kept until its batch is queued, queueIncomingUDPBatch() records it then.
+        Garbage-only wakeups never get queued, so their datagrams wait for the next batch,
+        unless a garbage flood piles up maxPendingEvents of them, then they're recorded right away.
+        """
+        self._rawWaiting.append(data)
+        if len(self._rawWaiting) >= self.maxPendingEvents:
+            rawWaiting = self._rawWaiting
+            self._rawWaiting = []
+            with self.queueLock:
+                recorder = self.recorder
+                if recorder is not None:
+                    for raw in rawWaiting:
+                        recorder.packet(raw)
+
+    def processPendingEvents(self):
+        """
+        Applies every event that is waiting in line, in one batch.
+        Only the UI thread (or whatever owns the game loop) should call this, once per tick,
+        that way only one thread ever changes the scores and the log.
+        Returns how many events changed the game.
+        """
+        pendingEvents = self.pendingEvents
+        batch = []
+        try:
+            while True:
+                batch.append(pendingEvents.popleft())
+        except IndexError:
+            pass  # the line is empty
+
+        if not batch:
+            return 0
+
+        if len(batch) > self.pendingStats["largestDrain"]:
+            self.pendingStats["largestDrain"] = len(batch)
+
+        applied = self.handleIncomingUDPBatch(batch)
+        self.pendingStats["applied"] += applied
+        return applied
+
+    def clearItAll(self):
+        """
+        This will clear everything and reset the game back to the beginning phase.
+        The button/key to do this needs to be (F12).
+        A match that was still running is saved to the history without final scores.
+        """
+        self.matchHistory.abandonMatch()
+        if self.recorder is not None:
+            self.recorder.clear()
+
+        state = self.state
+        state.redTeam.clear()
+        state.greenTeam.clear()
+        state.playersByEquipmentID.clear()
+        state.playersByPlayerID.clear()
+
+        self.resetTheActionState()
+        self.changePhase("Beginning")
+
+        self.recordLog("All players have been cleared and the game has been reset.")
+
+    def addPlayerToTeam(self, team, playerID, codename, equipmentID, broadcast=True):
+        """
+        When the user enters a player to a roster this is called.
+        This will store the player in the correct roster (red/green).
+        Later, this will also trigger the UDP broadcast of equipmentID.
+        (importRoster passes broadcast=False and sends all the IDs together at the end.)
+        """
+
+        capitalTeamname = str(team).upper().strip()  # Converts the team names to Uppercase so inputs can be compared easily
+
+         # Make sure IDs are integers
+        try:
+            playerID = int(playerID)
+            equipmentID = int(equipmentID)
+        except (TypeError, ValueError):
+            raise ValueError("Player ID and Equipment ID mhave to be integers.")
+
+        # Validate the team name
+        if capitalTeamname not in ("RED", "GREEN"):
+             # If the UI passes an incorrect team name, an error is stopped and a message shown
+            raise ValueError("Uh Oh! Your team must be 'RED' or 'GREEN'.")
+
+        # Put player into the correct team roster list
+        if capitalTeamname == "RED":
+            roster = self.state.redTeam
+        else:
+            roster = self.state.greenTeam
+
+        # There's Only 15 players per team in the controller too
+        if len(roster) >= self.maxPlayersPerTeam:
+            raise ValueError(f"{capitalTeamname} team is already full. There can only be {self.maxPlayersPerTeam} players.")
+
+        # Stop duplicate player IDs from occuring in the same game session
+        if self.findPlayerByPlayerID(playerID) is not None:
+            raise ValueError(f"Sorry! The Player ID {playerID} is already in this game session.")
+
+        # Stop duplicate equipment IDs across both teams
+        if self.equipmentIDAlreadyExists(equipmentID):
+            raise ValueError(f"Sorry! The Equipment ID {equipmentID} is already being used by another player in this game session.")
+
+        # With the new inputted info, a new PlayerData object is created.
+        player = PlayerData(
+            playerID=playerID,
+            codename=str(codename).strip(),
+            equipmentID=equipmentID,
+            team=capitalTeamname
+        )
 
+        roster.append(player)
+        self.state.playersByEquipmentID[equipmentID] = player
+        self.state.playersByPlayerID[playerID] = player
+        self.markFullRefresh()
+
+        if self.recorder is not None:
+            self.recorder.roster(capitalTeamname, playerID, player.codename, equipmentID)
+
+        # After a player is added, then equipmentID is broadcast
+        if broadcast:
+            self.netBroadcastEquipment(equipmentID)
+
+        return player
+
+    def checkRosterEntries(self, entries, errors):
+        """
+        Applies the same rules addPlayerToTeam() does (team name, team size, no repeated
+        player or equipment IDs) to a whole import before anything is saved.
+        Returns the entries that pass, and adds a message to errors for each one that doesn't.
+        """
+        state = self.state
+        teamSizes = {"RED": len(state.redTeam), "GREEN": len(state.greenTeam)}
+        seenPlayerIDs = set(state.playersByPlayerID)
+        seenEquipmentIDs = set(state.playersByEquipmentID)
+        accepted = []
+
+        for playerID, codename, equipmentID, team in entries:
+            team = str(team).upper().strip()
+
+            if team not in teamSizes:
+                errors.append(f"Player {playerID}: team must be 'RED' or 'GREEN'.")
+            elif teamSizes[team] >= self.maxPlayersPerTeam:
+                errors.append(f"Player {playerID}: {team} team is already full ({self.maxPlayersPerTeam} players).")
+            elif playerID in seenPlayerIDs:
+                errors.append(f"Sorry! The Player ID {playerID} is already in this game session.")
+            elif equipmentID in seenEquipmentIDs:
+                errors.append(f"Sorry! The Equipment ID {equipmentID} is already being used by another player in this game session.")
+            else:
+                teamSizes[team] += 1
+                seenPlayerIDs.add(playerID)
+                seenEquipmentIDs.add(equipmentID)
+                accepted.append((playerID, codename, equipmentID, team))
+
+        return accepted
+
+    def importRoster(self, entries):
+        """
+        Adds a whole roster in one go.
+
+        entries is a list of (playerID, codename, equipmentID, team).
+        - Players already in the database keep their stored codename (the given one is ignored).
+        - Players not in the database need a codename and are inserted in one batch.
+        - Everyone is then added with addPlayerToTeam(), and all the equipment IDs are
+          broadcast together at the end.
+
+        The UI does this in two halves instead (see importRosterAsync), so the database
+        part runs on a worker thread and the rosters are only touched on the Tk thread.
+
+        Returns:
+            dict: {"added": [(team, playerID, codename, equipmentID), ...],
+                   "errors": ["why a row was skipped", ...]}
+        """
+        return self.finishRosterImport(self.prepareRosterImport(entries))
+
+    def prepareRosterImport(self, entries):
+        """
+        The database half of importRoster(): checks the rows, looks everybody up and
+        inserts the new players. Only reads the rosters, so it is safe on a worker thread.
+
+        Returns (entries, known, report) for finishRosterImport().
+        known maps playerID -> codename, it is None if the database failed.
+        """
+        report = {"added": [], "errors": []}
+
+        # 0. Check the roster rules first, so nobody is saved to the database and then left out
+        entries = self.checkRosterEntries(entries, report["errors"])
+        if not entries:
+            return entries, None, report
+
+        # 1. One lookup for everybody
+        status, known = codename_cache.dbGetCodenames([entry[0] for entry in entries])
+        if status != "success":
+            report["errors"].append("Database error! Check PostgreSQL connection. Nothing was imported.")
+            return entries, None, report
+
+        # 2. One batch insert for the new players
+        newPlayers = {}
+        for playerID, codename, equipmentID, team in entries:
+            if playerID in known or playerID in newPlayers:
+                continue
+            if not str(codename).strip():
+                report["errors"].append(f"Player {playerID} is not in the database, so they need a codename.")
+                continue
+            newPlayers[playerID] = str(codename).strip()
+
+        if newPlayers:
+            status, insertedIDs = codename_cache.dbInsertPlayers(list(newPlayers.items()))
+            if status != "success":
+                report["errors"].append("Database error! New players could not be saved. Nothing was imported.")
+                return entries, None, report
+
+            for playerID in insertedIDs:
+                known[playerID] = newPlayers[playerID]
+
+            # Anyone left over was inserted by someone else in the meantime, use their stored codename
+            leftOver = [playerID for playerID in newPlayers if playerID not in known]
+            if leftOver:
+                status, stored = codename_cache.dbGetCodenames(leftOver)
+                if status == "success":
+                    known.update(stored)
+
+        return entries, known, report
+
+    def finishRosterImport(self, prepared):
+        """
+        The roster half of importRoster(), run on the thread that owns the rosters.
+        prepared is what prepareRosterImport() returned. Returns the report.
+        """
+        entries, known, report = prepared
+        if known is None:
+            return report
+
+        # 3. Add everybody to the rosters without broadcasting yet
+        #    (addPlayerToTeam checks the rules again, the rosters may have changed meanwhile)
+        equipmentIDs = []
+        for playerID, codename, equipmentID, team in entries:
+            if playerID not in known:
+                continue  # already reported above
+            try:
+                self.addPlayerToTeam(team, playerID, known[playerID], equipmentID, broadcast=False)
+            except ValueError as e:
+                report["errors"].append(str(e))
+                continue
+            report["added"].append((team, playerID, known[playerID], equipmentID))
+            equipmentIDs.append(equipmentID)
+
+        # 4. One batch of broadcasts
+        self.netBroadcastEquipmentBatch(equipmentIDs)
+
+        if report["added"]:
+            self.recordLog(f"{len(report['added'])} players were imported from a roster.")
+        return report
+
+    def getTopPlayersThisWeek(self, limit=5):
+        """
+        The week's best players across every finished match, for the entry screen.
+        Each one is a dict with codename, total_score, matches, base_hits and tag_ratio.
+        This reads precomputed totals (see db/leaderboard.py), so it is cheap to call.
+        """
+        return self.leaderboard.topPlayersThisWeek(limit)
+
+    # -------------------------------------------------
+    # Network (Caleb's code - these are working!)
+    # -------------------------------------------------
+
+    def arenaEngine(self):
+        """
+        The AsyncUDPEngine for an arena with ports of its own, started the first time it's needed.
+        Returns None if the receive port could not be opened.
+        """
+        if self.engine is None:
+            from net import async_udp
+
+            engine = async_udp.AsyncUDPEngine(
+                receivePort=self.receivePort,
+                broadcastPort=self.broadcastPort,
+                networkIP=self.networkIP,
+                newBatch=self.queueIncomingUDPBatch,  # packets go straight to this arena's queue
+                queueSize=None,
+            )
+            try:
+                self.engine = async_udp.startEngine(engine)
+            except OSError as e:
+                print(f"Warning: Arena {self.name} could not bind to port {engine.receivePort}. Error: {e}")
+                return None
+        return self.engine
+
+    def netSetIp(self, ip):
+        """
+        Network Stub:
+        Later on, Caleb is gonna store the IP and use it for UDP sockets.
+        But for right now let's just log it.
+        """
+        if self.usesSharedNetwork:
+            udp.netSetIp(ip)
+        else:
+            self.networkIP = str(ip).strip()
+            if self.engine is not None:
+                self.engine.setIp(self.networkIP)
+        self.recordLog("The broadcast IP is set to " + str(ip))
+        print("The broadcast IP is set to " + str(ip))
+
+    def netBroadcastEquipment(self, equipmentID):
+        """
+        Network Stub:
+        Here, Caleb will send the equipmentID out on UDP broadcast port 7500.
+        For right now, let's just log what would be broadcast.
+        """
+        if self.muteBroadcasts:
+            return
+        if self.usesSharedNetwork:
+            udp.netBroadcastEquipment(equipmentID)
+            return
+
+        engine = self.arenaEngine()
+        if engine is not None:
+            engine.loop.call_soon_threadsafe(engine.broadcastNowait, equipmentID)
+
+    def netBroadcastEquipmentBatch(self, equipmentIDs):
+        """
+        Sends several equipment IDs together (used after a bulk roster import).
+        """
+        if self.muteBroadcasts:
+            return
+        if self.usesSharedNetwork:
+            udp.netBroadcastEquipmentBatch(equipmentIDs)
+            return
+
+        for equipmentID in equipmentIDs:
+            self.netBroadcastEquipment(equipmentID)
+
+    def netBeginUDP_Listener(self):
+        """
+        Network Stub:
+        Caleb will listen for hits after opening the UDP receive port 7501.
+        For right now, let's log the fact that we start listening here.
+        """
+        if self.listener_is_running == True:
+            # If it's already running, do nothing!
+            return
+
+        if self.usesSharedNetwork:
+            udp.netBeginUDP_Listener(newBatch=self.queueIncomingUDPBatch)
+            port = udp.receivePort
+        else:
+            engine = self.arenaEngine()
+            if engine is None:
+                return
+            port = engine.receivePort
+
+        self.recordLog(f"UDP Listener started on port {port}")
+
+        self.listener_is_running = True
+
+    # -------------------------------------------------
+    # Match recording (see replay.py)
+    # -------------------------------------------------
+
+    def startRecording(self, path=None):
+        """
+        Starts recording raw packets, phase changes and roster adds for replay.py.
+        The players already on the rosters are written first, so the recording stands on its own.
+        Returns the recording's path.
+        """
+        self.stopRecording()
+
+        if path is None:
+            os.makedirs(replayFolder, exist_ok=True)
+            prefix = "match" if self.name == "main" else f"match-{self.name}"
+            path = os.path.join(replayFolder, time.strftime(f"{prefix}-%Y%m%d-%H%M%S.phrec"))
+
+        recorder = replay.MatchRecorder(path)
+        recorder.phase(self.state.phase)
+        for player in self.state.redTeam + self.state.greenTeam:
+            recorder.roster(player.team, player.playerID, player.codename, player.equipmentID)
+        self.recorder = recorder
+        self._rawWaiting = []  # anything left from an earlier recording is not part of this one
+
+        if self.usesSharedNetwork:
+            udp.rawPacketHook = self.bufferRawPacket
+        elif self.arenaEngine() is not None:
+            self.engine.rawPacketHook = self.bufferRawPacket
+        return path
+
+    def stopRecording(self):
+        """Stops the recording in progress (if any) and returns its path."""
+        if self.recorder is None:
+            return None
+
+        if self.usesSharedNetwork:
+            udp.rawPacketHook = None
+        elif self.engine is not None:
+            self.engine.rawPacketHook = None
+
+        with self.queueLock:
+            finished = self.recorder
+            self.recorder = None
+        finished.close()
+        return finished.path
 
-def validateEvent(event):
-    """
-    Before applyEvent() changes any scores, a parsed event is validated
-    if valid this function returns true. if false, it returns false.
-    """
-    if event is None:
-        return False
 
-    if state.phase != "PLAYING":
-        return False
+# -------------------------------------------------
+# Arenas
+# -------------------------------------------------
+# The registry is two dictionaries, so finding an arena is one lookup.
+# Packets never go through it: each arena's engine hands them to that arena directly.
 
-    eventType = str(event.get("type", "")).upper()
-    transmitterID = event.get("transmitter")
-    hitID = event.get("hit")
+defaultController = GameController("main", archivePath=eventLogArchivePath)
+arenas = {"main": defaultController}
+arenasByPort = {udp.receivePort: defaultController}
 
-    if eventType not in ("TAG", "BASE"):
-        return False
 
-    if transmitterID is None or hitID is None:
-        return False
+def createArena(name, receivePort, broadcastPort, networkIP=None, **options):
+    """
+    Adds another arena to this process, with its own listener port and broadcast target.
+    options are passed on to GameController (historyFile, muteBroadcasts, ...).
+    Raises ValueError if the name or the receive port is already taken.
+    """
+    if name in arenas:
+        raise ValueError(f"There is already an arena called {name}.")
+    if receivePort in arenasByPort:
+        raise ValueError(f"Port {receivePort} is already used by arena {arenasByPort[receivePort].name}.")
+
+    options.setdefault("archivePath", os.path.join(appFolder, "logs", f"event_log_archive_{name}.txt"))
+    arena = GameController(
+        name,
+        receivePort=receivePort,
+        broadcastPort=broadcastPort,
+        networkIP=udp.networkIP if networkIP is None else networkIP,
+        **options,
+    )
+    arenas[name] = arena
+    arenasByPort[receivePort] = arena
+    return arena
 
-    tagger = findPlayerByEquipmentID(transmitterID)
-    if tagger is None:
-        return False
 
-    if eventType == "BASE":
-        if not isBaseCode(hitID):
-            return False
-        return True
+def getArena(name):
+    """The arena with this name, or None."""
+    return arenas.get(name)
 
-    tagged = findPlayerByEquipmentID(hitID)
-    if tagged is None:
-        return False
 
-    if transmitterID == hitID:
-        return False
+def getArenaByPort(receivePort):
+    """The arena listening on this port, or None."""
+    return arenasByPort.get(receivePort)
 
-    return True
 
-def handleIncomingUDPMessage(parsedEvent): # Now receives the dictionary directly
+def processAllArenas():
     """
-    Receives the parsed event dictionary straight from udp.py
+    One game loop tick for every arena: apply the waiting events and move the clock.
+    Returns how many events were applied in total.
     """
-    if not validateEvent(parsedEvent):
-        return False
+    applied = 0
+    for arena in arenas.values():
+        applied += arena.processPendingEvents()
+        arena.updateTimer()
+    return applied
+
+
+# The module-level functions everyone already calls, all going to the default arena.
+# They are the default arena's bound methods, so there is no extra call in between.
+state = defaultController.state
+pendingEvents = defaultController.pendingEvents
+pendingStats = defaultController.pendingStats
+matchHistory = defaultController.matchHistory
+leaderboardTotals = defaultController.leaderboard
+
+grabState = defaultController.grabState
+getRedTotalScore = defaultController.getRedTotalScore
+getGreenTotalScore = defaultController.getGreenTotalScore
+addPointsToPlayer = defaultController.addPointsToPlayer
+bumpVersion = defaultController.bumpVersion
+markFullRefresh = defaultController.markFullRefresh
+getActionSnapshot = defaultController.getActionSnapshot
+getActionDelta = defaultController.getActionDelta
+getSortedRedRoster = defaultController.getSortedRedRoster
+getSortedGreenRoster = defaultController.getSortedGreenRoster
+changePhase = defaultController.changePhase
+setTimeRemaining = defaultController.setTimeRemaining
+recordLog = defaultController.recordLog
+resetTheActionState = defaultController.resetTheActionState
+startGame = defaultController.startGame
+moveOneSecond = defaultController.moveOneSecond
+updateTimer = defaultController.updateTimer
+getTimeRemainingPrecise = defaultController.getTimeRemainingPrecise
+getClockStats = defaultController.getClockStats
+formatTimeRemaining = defaultController.formatTimeRemaining
+findPlayerByEquipmentID = defaultController.findPlayerByEquipmentID
+findPlayerByPlayerID = defaultController.findPlayerByPlayerID
+equipmentIDAlreadyExists = defaultController.equipmentIDAlreadyExists
+applyNormalHitScore = defaultController.applyNormalHitScore
+applyBaseHitScore = defaultController.applyBaseHitScore
+applyEvent = defaultController.applyEvent
+validateEvent = defaultController.validateEvent
+handleIncomingUDPMessage = defaultController.handleIncomingUDPMessage
+handleIncomingUDPBatch = defaultController.handleIncomingUDPBatch
+queueIncomingUDPBatch = defaultController.queueIncomingUDPBatch
+processPendingEvents = defaultController.processPendingEvents
+clearItAll = defaultController.clearItAll
+addPlayerToTeam = defaultController.addPlayerToTeam
+checkRosterEntries = defaultController.checkRosterEntries
+importRoster = defaultController.importRoster
+prepareRosterImport = defaultController.prepareRosterImport
+finishRosterImport = defaultController.finishRosterImport
+getTopPlayersThisWeek = defaultController.getTopPlayersThisWeek
+netSetIp = defaultController.netSetIp
+netBroadcastEquipment = defaultController.netBroadcastEquipment
+netBroadcastEquipmentBatch = defaultController.netBroadcastEquipmentBatch
+netBeginUDP_Listener = defaultController.netBeginUDP_Listener
+startRecording = defaultController.startRecording
+stopRecording = defaultController.stopRecording
+
 
-    return applyEvent(parsedEvent)
+# -------------------------------------------------
+# Bulk roster import
+# -------------------------------------------------
+# A whole match can be loaded at once from a CSV file or pasted text:
+#
+#     playerID, codename, equipmentID, team
+#     1, Spiderman, 11, RED
+#     3, , 33, GREEN          <- codename can be blank if the player is already in the DB
+#
+# All codenames are looked up with ONE query, the new players are inserted with ONE
+# batch insert, and the equipment IDs go out as one batch of broadcasts at the end
+# (see GameController.importRoster).
 
-def clearItAll():
+def parseRosterText(text):
     """
-    This will clear everything and reset the game back to the beginning phase.
-    The button/key to do this needs to be (F12).
+    Turns CSV / pasted roster text into a list of (playerID, codename, equipmentID, team).
+    Blank lines, lines starting with # and a "playerID,..." header line are skipped
+    (the header can come after blank or comment lines).
+    Raises ValueError (with the line number) if a line is not in the right shape.
     """
-    state.redTeam.clear()
-    state.greenTeam.clear()
+    entries = []
+    headerChecked = False
 
-    resetTheActionState()
-    state.phase = "Beginning"
+    for lineNumber, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        fields = [field.strip() for field in row]
+        if not any(fields) or fields[0].startswith("#"):
+            continue
+        if not headerChecked:
+            headerChecked = True
+            if fields[0].lower().replace(" ", "") in ("playerid", "id"):
+                continue  # header line (the first one that isn't blank or a comment)
 
-    recordLog("All players have been cleared and the game has been reset.")
+        if len(fields) != 4:
+            raise ValueError(f"Line {lineNumber}: expected playerID, codename, equipmentID, team.")
 
+        playerID, codename, equipmentID, team = fields
+        try:
+            playerID = int(playerID)
+            equipmentID = int(equipmentID)
+        except ValueError:
+            raise ValueError(f"Line {lineNumber}: Player ID and Equipment ID have to be integers.")
 
-def addPlayerToTeam(team, playerID, codename, equipmentID):
-    """
-    When the user enters a player to a roster this is called.
-    This will store the player in the correct roster (red/green).
-    Later, this will also trigger the UDP broadcast of equipmentID.
-    """
+        entries.append((playerID, codename, equipmentID, team.upper()))
 
-    capitalTeamname = str(team).upper().strip()  # Converts the team names to Uppercase so inputs can be compared easily
+    return entries
 
-     # Make sure IDs are integers
-    try:
-        playerID = int(playerID)
-        equipmentID = int(equipmentID)
-    except (TypeError, ValueError):
-        raise ValueError("Player ID and Equipment ID mhave to be integers.")
-
-    # Validate the team name 
-    if capitalTeamname not in ("RED", "GREEN"):
-         # If the UI passes an incorrect team name, an error is stopped and a message shown
-        raise ValueError("Uh Oh! Your team must be 'RED' or 'GREEN'.")
-
-    # Put player into the correct team roster list
-    if capitalTeamname == "RED":
-        roster = state.redTeam
-    else:
-        roster = state.greenTeam
-
-    # There's Only 15 players per team in the controller too
-    if len(roster) >= MAX_PLAYERS_PER_TEAM:
-        raise ValueError(f"{capitalTeamname} team is already full. There can only be {MAX_PLAYERS_PER_TEAM} players.")
-
-    # Stop duplicate player IDs from occuring in the same game session
-    if findPlayerByPlayerID(playerID) is not None:
-        raise ValueError(f"Sorry! The Player ID {playerID} is already in this game session.")
-
-    # Stop duplicate equipment IDs across both teams
-    if equipmentIDAlreadyExists(equipmentID):
-        raise ValueError(f"Sorry! The Equipment ID {equipmentID} is already being used by another player in this game session.")
-
-    # With the new inputted info, a new PlayerData object is created.
-    player = PlayerData(
-        playerID=playerID,
-        codename=str(codename).strip(),
-        equipmentID=equipmentID,
-        team=capitalTeamname
-    )
 
-    roster.append(player)
-
-    # After a player is added, then equipmentID is broadcast
-    netBroadcastEquipment(equipmentID)
+def loadRosterFile(path):
+    """Reads a roster CSV file and returns parseRosterText() of it."""
+    with open(path, newline="", encoding="utf-8") as rosterFile:
+        return parseRosterText(rosterFile.read())
 
 
 # -------------------------------------------------
 # REAL Database Functions (Not Stubs anymore!!!)
 # -------------------------------------------------
-# These now call Will's real database.py functions.
+# These go through db/codename_cache.py, which calls Will's real database.py functions
+# on a cache miss (and for every insert).
+# The players table is shared by every arena, so these are not per arena.
 #
 # Player lookup/insert flow:
 #   1. Call dbGetCodename(playerID)
@@ -492,6 +1408,7 @@ def addPlayerToTeam(team, playerID, codename, equipmentID):
 #   4. If "db_error"  → surface the error to the UI
 #
 # There is no update path. Existing players are always used as-is.
+# Known players are answered from the cache and skip Postgres.
 
 def dbGetCodename(playerID):
     """
@@ -503,7 +1420,7 @@ def dbGetCodename(playerID):
             - ("not_found", None)       if player is not in the DB
             - ("db_error",  None)       if a database error occurred
     """
-    status, codename = database.dbGetCodename(playerID)
+    status, codename = codename_cache.dbGetCodename(playerID)
     return status, codename
 
 
@@ -520,52 +1437,59 @@ def dbInsertPlayer(playerID, codename):
             - "duplicate" if the player ID already exists
             - "db_error"  if a database error occurred
     """
-    status = database.dbInsertPlayer(playerID, codename)
+    status = codename_cache.dbInsertPlayer(playerID, codename)
     return status
 
 
-# -------------------------------------------------
-# Network Stubs (Caleb's code - these are working!)
-# -------------------------------------------------
-
-def netSetIp(ip):
+def peekCachedCodename(playerID):
     """
-    Network Stub:
-    Later on, Caleb is gonna store the IP and use it for UDP sockets.
-    But for right now let's just log it.
+    Returns the codename if it is already in the codename cache, otherwise None.
+    This never touches the database, so it is safe to call on every keystroke.
     """
-    udp.netSetIp(ip)
-    recordLog("The broadcast IP is set to " + str(ip))
-    print("The broadcast IP is set to " + str(ip))
+    return codename_cache.codenameCache.get(playerID)
 
 
-def netBroadcastEquipment(equipmentID):
+# Database calls the UI should not wait on run here, so a slow or stopped
+# PostgreSQL never freezes the Tk window.
+dbWorkers = ThreadPoolExecutor(max_workers=2, thread_name_prefix="photon-db")
+
+
+def dbGetCodenameAsync(playerID):
     """
-    Network Stub:
-    Here, Caleb will send the equipmentID out on UDP broadcast port 7500.
-    For right now, let's just log what would be broadcast.
+    Same as dbGetCodename(), but runs on a worker thread.
+    Returns a concurrent.futures.Future, its result() is the usual (status, codename) tuple.
+    The UI should poll future.done() with after() instead of blocking on result().
     """
-    udp.netBroadcastEquipment(equipmentID)
+    return dbWorkers.submit(dbGetCodename, playerID)
 
 
-listener_is_running = False
-
-def netBeginUDP_Listener():
+def dbInsertPlayerAsync(playerID, codename):
     """
-    Network Stub:
-    Caleb will listen for hits after opening the UDP receive port 7501.
-    For right now, let's log the fact that we start listening here.
+    Same as dbInsertPlayer(), but runs on a worker thread.
+    Returns a Future whose result() is the usual status string.
     """
-    global listener_is_running
+    return dbWorkers.submit(dbInsertPlayer, playerID, codename)
+
 
-    if listener_is_running == True:
-        # If it's already running, do nothing!
-        return
+def importRosterAsync(entries):
+    """
+    The database half of importRoster() on a worker thread.
+    Returns a Future, pass its result() to finishRosterImport() on the Tk thread
+    to add the players and get the usual report.
+    """
+    return dbWorkers.submit(prepareRosterImport, entries)
 
-    udp.netBeginUDP_Listener(handleIncomingUDPMessage)
-    recordLog("UDP Listener started on port 7501")
 
-    listener_is_running = True
+def warmCodenameCache(inBackground=True):
+    """
+    Loads every known player's codename with one bulk SELECT, so roster entry
+    for regulars needs no database round trip.
+    The app calls this during the splash screen, on a background thread by default.
+    """
+    if inBackground:
+        threading.Thread(target=codename_cache.warmCodenameCache, daemon=True).start()
+        return None
+    return codename_cache.warmCodenameCache()
 
 
 # -----------------------------
@@ -591,7 +1515,9 @@ if __name__ == "__main__":
 
     try:
         while True:
-            time.sleep(1)
+            time.sleep(0.25)
+            processPendingEvents()
+            updateTimer()
     except KeyboardInterrupt:
         print("\nTest finished.")
         print("Final Event Log:", state.eventLog)
@@ -0,0 +1,178 @@
+"""
+Read-through codename cache that sits in front of database.dbGetCodename().
+
+Why this works:
+- The project rules say a player's codename is never UPDATEd once it is in the table.
+- So once we have seen a codename, it stays correct. The TTL is only there so a row
+  that was fixed by hand in psql eventually gets picked up again.
+
+How the controller uses it:
+    status, codename = codename_cache.dbGetCodename(playerID)   # same contract as database.py
+    status = codename_cache.dbInsertPlayer(playerID, codename)   # same contract as database.py
+    codename_cache.warmCodenameCache()                           # one bulk SELECT at startup
+
+Only "found" answers are cached. A "not_found" always goes back to the database,
+because someone could add that player from another terminal.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from db import database
+
+
+class CodenameCache:
+    """
+    LRU + TTL cache of playerID -> codename.
+
+    - maxEntries: once full, the least recently used player is evicted
+    - ttlSeconds: entries older than this are treated as missing
+    It has a lock because lookups can come from worker threads.
+    """
+
+    def __init__(self, maxEntries=2048, ttlSeconds=6 * 60 * 60):
+        self.maxEntries = maxEntries
+        self.ttlSeconds = ttlSeconds
+        self._entries = OrderedDict()  # playerID -> (codename, storedAt)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, playerID):
+        """Returns the cached codename, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(playerID)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            codename, storedAt = entry
+            if time.monotonic() - storedAt > self.ttlSeconds:
+                del self._entries[playerID]
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(playerID)
+            self.stats["hits"] += 1
+            return codename
+
+    def put(self, playerID, codename):
+        with self._lock:
+            self._entries[playerID] = (codename, time.monotonic())
+            self._entries.move_to_end(playerID)
+
+            while len(self._entries) > self.maxEntries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, playerID):
+        with self._lock:
+            self._entries.pop(playerID, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# The one cache the app uses
+codenameCache = CodenameCache()
+
+
+def dbGetCodename(playerID):
+    """
+    Same contract as database.dbGetCodename(), but known players come from memory.
+
+    Returns:
+        tuple: ("found", codename) / ("not_found", None) / ("db_error", None)
+    """
+    codename = codenameCache.get(playerID)
+    if codename is not None:
+        return ("found", codename)
+
+    status, codename = database.dbGetCodename(playerID)
+    if status == "found":
+        codenameCache.put(playerID, codename)
+    return (status, codename)
+
+
+def dbInsertPlayer(playerID, codename):
+    """
+    Same contract as database.dbInsertPlayer().
+    A successful insert goes straight into the cache, so the next lookup is free.
+    """
+    status = database.dbInsertPlayer(playerID, codename)
+    if status == "success":
+        codenameCache.put(playerID, codename)
+    elif status == "duplicate":
+        # Someone else owns this ID, make sure we ask the database next time
+        codenameCache.invalidate(playerID)
+    return status
+
+
+def dbGetCodenames(playerIDs):
+    """
+    Bulk version of dbGetCodename(). Cached players are answered from memory,
+    everyone else is looked up with ONE query.
+
+    Returns:
+        tuple: ("success", {playerID: codename}) / ("db_error", {})
+    """
+    found = {}
+    missing = []
+    for playerID in playerIDs:
+        codename = codenameCache.get(playerID)
+        if codename is None:
+            missing.append(playerID)
+        else:
+            found[playerID] = codename
+
+    if missing:
+        status, fromDB = database.dbGetCodenames(missing)
+        if status != "success":
+            return (status, {})
+        for playerID, codename in fromDB.items():
+            codenameCache.put(playerID, codename)
+        found.update(fromDB)
+
+    return ("success", found)
+
+
+def dbInsertPlayers(players):
+    """
+    Bulk version of dbInsertPlayer(). Inserted players go straight into the cache.
+
+    Returns:
+        tuple: ("success", [insertedPlayerID, ...]) / ("db_error", [])
+    """
+    players = list(players)
+    status, insertedIDs = database.dbInsertPlayers(players)
+    if status == "success":
+        inserted = set(insertedIDs)
+        for playerID, codename in players:
+            if playerID in inserted:
+                codenameCache.put(playerID, codename)
+            else:
+                codenameCache.invalidate(playerID)
+    return (status, insertedIDs)
+
+
+def warmCodenameCache():
+    """
+    Loads every player with one bulk SELECT (if the table is bigger than the cache,
+    the LRU just keeps the last maxEntries rows).
+
+    Returns:
+        tuple: (status, howManyLoaded), status is "success" or "db_error"
+    """
+    status, rows = database.dbGetAllCodenames()
+    if status != "success":
+        return (status, 0)
+
+    for playerID, codename in rows:
+        codenameCache.put(playerID, codename)
+
+    print(f"Codename cache warmed with {len(rows)} players.")
+    return ("success", len(rows))
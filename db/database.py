@@ -51,9 +51,28 @@ Terminal Verification Commands (Run in a separate terminal):
 """
 
 # This code is from Jim's repo: python-pg.py
-import psycopg2
-import psycopg2.errors
-from psycopg2 import sql  # this is used for advanced SQL building later
+import threading
+import time
+from contextlib import contextmanager
+
+# psycopg2 is optional so the controller (and the benchmarks) can be imported on a machine
+# without Postgres. Every db* wrapper below then just returns "db_error".
+try:
+    import psycopg2
+    import psycopg2.errors
+    import psycopg2.extras
+    import psycopg2.pool
+    from psycopg2 import sql  # this is used for advanced SQL building later
+    PSYCOPG2_OK = True
+
+    # The errors each part of this file catches
+    databaseErrors = (psycopg2.Error,)
+    connectionErrors = (psycopg2.OperationalError, psycopg2.InterfaceError)
+    duplicateKeyErrors = (psycopg2.errors.UniqueViolation,)
+except ImportError as e:
+    PSYCOPG2_OK = False
+    databaseErrors = connectionErrors = duplicateKeyErrors = ()  # "except ()" never matches
+    print("psycopg2 import failed, the database is off:", e)
 
 
 # -----------------------------------------------------------------
@@ -69,10 +88,29 @@ connection_params = {
 }
 
 
+# Connection pool settings
+# - poolMinSize / poolMaxSize: how many connections the pool keeps open / is allowed to open
+# - healthCheckAfterSeconds: a connection that sat unused longer than this gets a
+#   quick "SELECT 1" before we hand it out, so a restarted Postgres is noticed right away
+# - poolWaitSeconds: ThreadedConnectionPool does not wait when all poolMaxSize connections
+#   are borrowed, it raises PoolError right away. So callers wait for a free slot here
+#   instead (at most this long, then they get the PoolError and a "db_error" like before)
+poolMinSize = 1
+poolMaxSize = 4
+healthCheckAfterSeconds = 30
+poolWaitSeconds = 10
+
+connectionPool = None
+poolSlots = None  # BoundedSemaphore(poolMaxSize), made together with the pool
+poolLock = threading.Lock()
+lastUsedAt = {}  # id(connection) -> time.monotonic() of when it went back in the pool (0.0 = check it next time)
+
+
 def dbconnect():
     """Open a new database connection.
 
-    The structure should be simple: open -> do one operation -> close.
+    The pool below uses these same settings. This is still here for the
+    connection test, and for anything that really needs its own connection.
 
     Will, if you get an auth error, try:
     - uncommenting password/host/port above, it should work then
@@ -80,9 +118,153 @@ def dbconnect():
     Returns:
         psycopg2.connection: Active database connection
     """
+    if not PSYCOPG2_OK:
+        raise RuntimeError("psycopg2 is not installed, so there is no database.")
     return psycopg2.connect(**connection_params)
 
 
+def getPool():
+    """Return the shared connection pool, opening it the first time.
+
+    If Postgres is down this raises, and the next call simply tries again.
+
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool: The pool (safe to use from several threads)
+    """
+    global connectionPool, poolSlots
+
+    if not PSYCOPG2_OK:
+        raise RuntimeError("psycopg2 is not installed, so there is no database.")
+
+    with poolLock:
+        if connectionPool is None:
+            connectionPool = psycopg2.pool.ThreadedConnectionPool(
+                poolMinSize, poolMaxSize, **connection_params
+            )
+            poolSlots = threading.BoundedSemaphore(poolMaxSize)
+        return connectionPool
+
+
+def connectionIsHealthy(conn):
+    """Check a pooled connection before it is handed out.
+
+    Closed connections are always unhealthy. Connections that were idle for
+    longer than healthCheckAfterSeconds get a "SELECT 1". A connection the pool
+    just opened has never been seen here, it is marked as used now and not checked.
+
+    Returns:
+        bool: True if the connection can be used
+    """
+    if conn.closed:
+        return False
+
+    now = time.monotonic()
+    lastUsed = lastUsedAt.get(id(conn))
+    if lastUsed is None:
+        lastUsedAt[id(conn)] = now  # freshly connected
+        return True
+
+    if now - lastUsed < healthCheckAfterSeconds:
+        return True
+
+    try:
+        curse = conn.cursor()
+        curse.execute("SELECT 1;")
+        curse.fetchone()
+        conn.rollback()
+        return True
+    except databaseErrors:
+        return False
+
+
+@contextmanager
+def pooledConnection():
+    """Borrow a healthy connection from the pool and give it back afterwards.
+
+    Usage:
+        with pooledConnection() as conn:
+            ...
+
+    At most poolMaxSize callers hold a connection at once, the rest wait up to
+    poolWaitSeconds for one to come back (see poolWaitSeconds above).
+
+    Unhealthy connections are thrown away until a healthy one turns up. After
+    poolMaxSize of them every old connection is gone, so the next one is freshly
+    opened (if Postgres is still down, opening it raises).
+
+    If the connection breaks while it is borrowed, it is thrown away instead
+    of going back in the pool, and the error is raised like before. Every other
+    pooled connection then gets checked before its next use too, since after a
+    Postgres restart they are most likely all dead.
+    """
+    pool = getPool()
+    slots = poolSlots
+
+    if not slots.acquire(timeout=poolWaitSeconds):
+        raise psycopg2.pool.PoolError(
+            f"All {poolMaxSize} pooled connections stayed busy for {poolWaitSeconds} seconds"
+        )
+
+    try:
+        for _ in range(poolMaxSize):
+            conn = pool.getconn()
+            if connectionIsHealthy(conn):
+                break
+            lastUsedAt.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+        else:
+            conn = pool.getconn()
+    except BaseException:
+        slots.release()
+        raise
+
+    broken = False
+    try:
+        yield conn
+    except connectionErrors:
+        broken = True
+        raise
+    finally:
+        if broken or conn.closed:
+            lastUsedAt.pop(id(conn), None)
+            # check the rest before they are used again (new connections still skip the check)
+            lastUsedAt.update(dict.fromkeys(list(lastUsedAt), 0.0))
+            pool.putconn(conn, close=True)
+        else:
+            lastUsedAt[id(conn)] = time.monotonic()
+            pool.putconn(conn)  # the pool rolls back anything left open
+        slots.release()
+
+
+def runWithReconnect(operation):
+    """Run operation(conn) on a pooled connection, retrying once on a fresh one.
+
+    This covers the common failure: Postgres was restarted and the pooled
+    connection is dead. Errors that are not connection problems (like a
+    duplicate key) are raised right away with no retry.
+    """
+    try:
+        with pooledConnection() as conn:
+            return operation(conn)
+    except connectionErrors as e:
+        print(f"Database connection problem, reconnecting once: {e}")
+
+    with pooledConnection() as conn:
+        return operation(conn)
+
+
+def closePool():
+    """Close every pooled connection (for shutdown or after changing connection_params)."""
+    global connectionPool, poolSlots
+
+    with poolLock:
+        if connectionPool is not None:
+            connectionPool.closeall()
+            connectionPool = None
+            poolSlots = None
+        lastUsedAt.clear()
+
+
 # -----------------------------------------------------------------------------------
 # Main database functions (The controller will call these!)
 # -----------------------------------------------------------------------------------
@@ -102,16 +284,15 @@ def obtainCodename(playerID):
         If this fails, the column might be player_id instead of id.
         To verify run: psql -d photon, then \\d players
     """
-    conn = dbconnect()
-    try:
+    def lookup(conn):
         curse = conn.cursor()
         curse.execute("SELECT codename FROM players WHERE id = %s;", (playerID,))
         row = curse.fetchone()
         if row is None:
             return None
         return row[0]
-    finally:
-        conn.close()
+
+    return runWithReconnect(lookup)
 
 
 def addPlayer(playerID, codename):
@@ -133,19 +314,93 @@ def addPlayer(playerID, codename):
         Do not alter the schema. This only does INSERTs.
         Columns must match: (id, codename)
     """
-    conn = dbconnect()
-    try:
+    def insert(conn):
+        try:
+            curse = conn.cursor()
+            curse.execute(
+                "INSERT INTO players (id, codename) VALUES (%s, %s);",
+                (playerID, codename),
+            )
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+
+    runWithReconnect(insert)
+
+
+def obtainAllCodenames():
+    """Load every (id, codename) row in one query.
+
+    This is for warming the codename cache at startup, so known players
+    never need a database round trip during roster entry.
+
+    Returns:
+        list[tuple]: (playerID, codename) rows
+    """
+    def loadAll(conn):
         curse = conn.cursor()
-        curse.execute(
-            "INSERT INTO players (id, codename) VALUES (%s, %s);",
-            (playerID, codename),
-        )
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+        curse.execute("SELECT id, codename FROM players;")
+        return curse.fetchall()
+
+    return runWithReconnect(loadAll)
+
+
+def obtainCodenames(playerIDs):
+    """Look up many players' codenames with one query.
+
+    Args:
+        playerIDs (list[int]): The player IDs to look up
+
+    Returns:
+        dict: playerID -> codename, only for the IDs that exist
+    """
+    playerIDs = list(playerIDs)
+    if not playerIDs:
+        return {}
+
+    def lookupMany(conn):
+        curse = conn.cursor()
+        curse.execute("SELECT id, codename FROM players WHERE id = ANY(%s);", (playerIDs,))
+        return dict(curse.fetchall())
+
+    return runWithReconnect(lookupMany)
+
+
+def addPlayers(players):
+    """Insert many new players in one batch.
+
+    IDs that already exist are skipped (ON CONFLICT DO NOTHING), nothing is
+    ever updated, which keeps the "use existing codenames as-is" rule.
+
+    Args:
+        players (list[tuple]): (playerID, codename) pairs
+
+    Returns:
+        list[int]: The player IDs that were actually inserted
+    """
+    players = list(players)
+    if not players:
+        return []
+
+    def insertMany(conn):
+        try:
+            curse = conn.cursor()
+            rows = psycopg2.extras.execute_values(
+                curse,
+                "INSERT INTO players (id, codename) VALUES %s ON CONFLICT (id) DO NOTHING RETURNING id;",
+                players,
+                fetch=True,
+            )
+            conn.commit()
+            return [row[0] for row in rows]
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+
+    return runWithReconnect(insertMany)
 
 
 # updatePlayer() has been intentionally removed.
@@ -167,15 +422,14 @@ def deletePlayer(playerID):
     Returns:
         bool: True if a row was deleted, False if player didn't exist
     """
-    conn = dbconnect()
-    try:
+    def delete(conn):
         curse = conn.cursor()
         curse.execute("DELETE FROM players WHERE id = %s;", (playerID,))
         rows_deleted = curse.rowcount
         conn.commit()
         return rows_deleted > 0
-    finally:
-        conn.close()
+
+    return runWithReconnect(delete)
 
 
 # -----------------------------------------------------------------------------
@@ -245,7 +499,7 @@ def dbInsertPlayer(playerID, codename):
     try:
         addPlayer(playerID, codename)
         return "success"
-    except psycopg2.errors.UniqueViolation:
+    except duplicateKeyErrors:
         # Primary key already exists — clean duplicate signal, no string matching needed
         print(f"Duplicate: player {playerID} already exists in database")
         return "duplicate"
@@ -254,6 +508,54 @@ def dbInsertPlayer(playerID, codename):
         return "db_error"
 
 
+def dbGetAllCodenames():
+    """Load every player's codename in one query.
+
+    Returns:
+        tuple: (status, rows)
+            - ("success",  [(id, codename), ...]) if the query worked
+            - ("db_error", [])                    if a database error occurred
+    """
+    try:
+        return ("success", obtainAllCodenames())
+    except Exception as e:
+        print(f"Database error in dbGetAllCodenames: {e}")
+        return ("db_error", [])
+
+
+def dbGetCodenames(playerIDs):
+    """Look up many codenames at once (for bulk roster import).
+
+    Returns:
+        tuple: (status, codenames)
+            - ("success",  {playerID: codename}) for the IDs that exist
+            - ("db_error", {})                    if a database error occurred
+    """
+    try:
+        return ("success", obtainCodenames(playerIDs))
+    except Exception as e:
+        print(f"Database error in dbGetCodenames: {e}")
+        return ("db_error", {})
+
+
+def dbInsertPlayers(players):
+    """Insert many new players at once (for bulk roster import).
+
+    Only pass players that dbGetCodenames did not find.
+
+    Returns:
+        tuple: (status, insertedIDs)
+            - ("success",  [playerID, ...]) the IDs that were inserted
+              (an ID someone else inserted in the meantime is left out)
+            - ("db_error", [])              if a database error occurred
+    """
+    try:
+        return ("success", addPlayers(players))
+    except Exception as e:
+        print(f"Database error in dbInsertPlayers: {e}")
+        return ("db_error", [])
+
+
 def dbDeletePlayer(playerID):
     """Delete a specific player — for test cleanup only.
 
@@ -310,8 +612,7 @@ def listOfPlayers(limit=10):
     Args:
         limit (int): Maximum number of players to display (default: 10)
     """
-    conn = dbconnect()
-    try:
+    with pooledConnection() as conn:
         curse = conn.cursor()
         curse.execute("SELECT id, codename FROM players ORDER BY id LIMIT %s;", (limit,))
         rows = curse.fetchall()
@@ -319,8 +620,6 @@ def listOfPlayers(limit=10):
         for row in rows:
             print(f"  ID: {row[0]:>5} | Codename: {row[1]}")
         print("=" * 45)
-    finally:
-        conn.close()
 
 
 if __name__ == "__main__":
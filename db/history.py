@@ -0,0 +1,298 @@
+"""
+Match history: every applied hit and every match's final scores, kept across matches.
+
+Why SQLite and not Postgres?
+- The Postgres "players" table is protected (no CREATE/ALTER), so history lives in its own
+  local SQLite file instead (data/match_history.sqlite3 by default).
+- SQLite ships with Python, so nothing new has to be installed on the VM.
+
+How writes work:
+- Hits are kept in memory and written with ONE executemany() every flushEvery hits,
+  and again when the match ends. Nothing is written per hit.
+- The file runs in WAL mode, so those batched commits are cheap.
+- If the file can't be written, a warning is printed and the game keeps going.
+
+Tables (nothing is ever deleted):
+- matches      : one row per match, inserted when it starts and finalised once when it ends
+                 (finishMatch UPDATEs the end time, completed and the team totals,
+                 abandonMatch only the end time)
+- hits         : one row per applied hit (TAG / SAME_TEAM / BASE), append-only
+- match_scores : one row per player per match (final score, base icon, tags made / taken, base hits),
+                 append-only. tags / tagged only count TAG hits, friendly fire is left out
+
+The query helpers at the bottom use indexes plus LIMIT, so they don't scan every row.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    ended_at REAL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    red_total INTEGER NOT NULL DEFAULT 0,
+    green_total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS hits (
+    match_id INTEGER NOT NULL,
+    at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    tagger_id INTEGER NOT NULL,
+    tagged_id INTEGER,
+    base_code INTEGER
+);
+CREATE INDEX IF NOT EXISTS hits_by_match ON hits (match_id);
+
+CREATE TABLE IF NOT EXISTS match_scores (
+    match_id INTEGER NOT NULL,
+    ended_at REAL NOT NULL,
+    player_id INTEGER NOT NULL,
+    codename TEXT NOT NULL,
+    team TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    has_base INTEGER NOT NULL,
+    tags INTEGER NOT NULL,
+    tagged INTEGER NOT NULL,
+    base_hits INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON match_scores (score DESC);
+CREATE INDEX IF NOT EXISTS scores_by_player ON match_scores (player_id, match_id DESC);
+"""
+
+
+class MatchHistory:
+    """
+    The controller makes one of these. Calls come from the game loop (single writer),
+    the lock is there so leaderboard reads from other threads are safe.
+    """
+
+    def __init__(self, path, flushEvery=200):
+        self.path = path
+        self.flushEvery = flushEvery
+
+        self._conn = None
+        self.lock = threading.Lock()
+        self._pendingHits = []
+        self.extraSchema = []  # other modules' tables in the same file (see addSchema)
+        self.finishHooks = []  # hook(conn, summary), run inside finishMatch's transaction
+        self.matchID = None
+        self.playerStats = {}  # playerID -> {"tags", "tagged", "baseHits"} for the match in progress
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    def connection(self):
+        """Opens the SQLite file (and makes the tables) the first time it's needed."""
+        if self._conn is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA synchronous=NORMAL;")
+            conn.executescript(SCHEMA)
+            for schema in self.extraSchema:
+                conn.executescript(schema)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def addSchema(self, schema):
+        """Lets another module (like the leaderboard) keep its tables in this file too."""
+        self.extraSchema.append(schema)
+        with self.lock:
+            if self._conn is not None:
+                self._conn.executescript(schema)
+
+    def close(self):
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Writing (called by the controller)
+    # ------------------------------------------------------------------
+
+    def beginMatch(self):
+        """Starts a new match row. A match that never finished is closed as not completed."""
+        if self.matchID is not None:
+            self.abandonMatch()
+
+        self.playerStats = {}
+        try:
+            with self.lock:
+                conn = self.connection()
+                cursor = conn.execute("INSERT INTO matches (started_at) VALUES (?);", (time.time(),))
+                conn.commit()
+                self.matchID = cursor.lastrowid
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Match history is off for this match: {e}")
+            self.matchID = None
+        return self.matchID
+
+    def recordHit(self, kind, tagger, tagged=None, baseCode=None):
+        """
+        Remembers one applied hit. kind is "TAG", "SAME_TEAM" or "BASE".
+        It is only written to disk in batches (see flush()).
+        """
+        if self.matchID is None:
+            return
+
+        taggedID = tagged.playerID if tagged is not None else None
+        self._pendingHits.append((self.matchID, time.time(), kind, tagger.playerID, taggedID, baseCode))
+
+        # Friendly fire (SAME_TEAM) is only kept in the hits table. It is not a tag made
+        # or taken, otherwise it would raise the player's tag ratio on the leaderboard.
+        if kind == "BASE":
+            self._statsFor(tagger.playerID)["baseHits"] += 1
+        elif kind == "TAG":
+            self._statsFor(tagger.playerID)["tags"] += 1
+            self._statsFor(taggedID)["tagged"] += 1
+
+        if len(self._pendingHits) >= self.flushEvery:
+            self.flush()
+
+    def flush(self):
+        """Writes every remembered hit with one executemany()."""
+        if not self._pendingHits:
+            return
+
+        batch = self._pendingHits
+        self._pendingHits = []
+        try:
+            with self.lock:
+                conn = self.connection()
+                conn.executemany(
+                    "INSERT INTO hits (match_id, at, kind, tagger_id, tagged_id, base_code) "
+                    "VALUES (?, ?, ?, ?, ?, ?);",
+                    batch,
+                )
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Could not save {len(batch)} hits to the match history: {e}")
+
+    def finishMatch(self, players, redTotal, greenTotal, completed=True):
+        """
+        Writes the remaining hits plus every player's final score, and closes the match row.
+        players is every PlayerData in the match.
+        Returns a summary dict (used by the leaderboard), or None if history is off.
+        """
+        if self.matchID is None:
+            return None
+
+        self.flush()
+
+        endedAt = time.time()
+        rows = []
+        for player in players:
+            stats = self._statsFor(player.playerID)
+            rows.append((
+                self.matchID, endedAt, player.playerID, player.codename, player.team,
+                player.score, int(player.has_baseIcon),
+                stats["tags"], stats["tagged"], stats["baseHits"],
+            ))
+
+        summary = {
+            "match_id": self.matchID,
+            "ended_at": endedAt,
+            "completed": completed,
+            "red_total": redTotal,
+            "green_total": greenTotal,
+            "players": rows,
+        }
+
+        try:
+            with self.lock:
+                conn = self.connection()
+                conn.execute(
+                    "UPDATE matches SET ended_at = ?, completed = ?, red_total = ?, green_total = ? WHERE id = ?;",
+                    (endedAt, int(completed), redTotal, greenTotal, self.matchID),
+                )
+                conn.executemany(
+                    "INSERT INTO match_scores (match_id, ended_at, player_id, codename, team, score, "
+                    "has_base, tags, tagged, base_hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);",
+                    rows,
+                )
+                for hook in self.finishHooks:
+                    hook(conn, summary)
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            with self.lock:
+                if self._conn is not None:
+                    self._conn.rollback()  # all of the match's scores or none of them
+            print(f"Warning: Could not save the final scores to the match history: {e}")
+
+        self.matchID = None
+        self.playerStats = {}
+        return summary
+
+    def abandonMatch(self):
+        """A match that was cleared before the clock ran out: keep its hits, no final scores."""
+        if self.matchID is None:
+            return
+
+        self.flush()
+        try:
+            with self.lock:
+                conn = self.connection()
+                conn.execute("UPDATE matches SET ended_at = ? WHERE id = ?;", (time.time(), self.matchID))
+                conn.commit()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Could not close the match in the match history: {e}")
+
+        self.matchID = None
+        self.playerStats = {}
+
+    def _statsFor(self, playerID):
+        stats = self.playerStats.get(playerID)
+        if stats is None:
+            stats = {"tags": 0, "tagged": 0, "baseHits": 0}
+            self.playerStats[playerID] = stats
+        return stats
+
+    # ------------------------------------------------------------------
+    # Query helpers (each one is an index walk + LIMIT)
+    # ------------------------------------------------------------------
+
+    def query(self, sql, params):
+        with self.lock:
+            return self.connection().execute(sql, params).fetchall()
+
+    def topMatchScores(self, limit=10):
+        """Best single-match scores ever: (codename, player_id, score, match_id, ended_at)."""
+        return self.query(
+            "SELECT codename, player_id, score, match_id, ended_at FROM match_scores "
+            "ORDER BY score DESC LIMIT ?;",
+            (limit,),
+        )
+
+    def playerHistory(self, playerID, limit=10):
+        """A player's most recent matches: (match_id, ended_at, team, score, tags, tagged, base_hits)."""
+        return self.query(
+            "SELECT match_id, ended_at, team, score, tags, tagged, base_hits FROM match_scores "
+            "WHERE player_id = ? ORDER BY match_id DESC LIMIT ?;",
+            (playerID, limit),
+        )
+
+    def recentMatches(self, limit=10):
+        """Latest finished matches: (id, started_at, ended_at, red_total, green_total)."""
+        return self.query(
+            "SELECT id, started_at, ended_at, red_total, green_total FROM matches "
+            "WHERE completed = 1 ORDER BY id DESC LIMIT ?;",
+            (limit,),
+        )
+
+    def matchHits(self, matchID):
+        """Every hit in one match, in order: (at, kind, tagger_id, tagged_id, base_code)."""
+        return self.query(
+            "SELECT at, kind, tagger_id, tagged_id, base_code FROM hits WHERE match_id = ? ORDER BY rowid;",
+            (matchID,),
+        )
@@ -0,0 +1,165 @@
+"""
+Cross-match leaderboard ("top players this week").
+
+How it stays fast:
+- Nothing is added up from the raw hits when someone asks for the leaderboard.
+- Each player has one running-totals row per week, and one more under week "ALL" for all time.
+  When a match ends, those rows are updated in place (matches, total score, base hits,
+  tags made, tags taken). This happens in the same transaction that saves the match's
+  final scores in db/history.py.
+- The rows are indexed on (week, total_score), so reading the top k is an index walk
+  that stops after k rows.
+- The current week's top list is also kept in memory until the next match ends.
+
+Tag ratio = tags made / tags taken (just tags made if they were never tagged).
+It is worked out when the row is read, so it is never stored out of date.
+"""
+
+import sqlite3
+import time
+
+
+ALL_TIME = "ALL"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_totals (
+    week TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    codename TEXT NOT NULL,
+    matches INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    base_hits INTEGER NOT NULL,
+    tags INTEGER NOT NULL,
+    tagged INTEGER NOT NULL,
+    PRIMARY KEY (week, player_id)
+);
+CREATE INDEX IF NOT EXISTS totals_by_week_score ON player_totals (week, total_score DESC);
+"""
+
+UPSERT = """
+INSERT INTO player_totals (week, player_id, codename, matches, total_score, base_hits, tags, tagged)
+VALUES (?, ?, ?, 1, ?, ?, ?, ?)
+ON CONFLICT (week, player_id) DO UPDATE SET
+    codename = excluded.codename,
+    matches = matches + 1,
+    total_score = total_score + excluded.total_score,
+    base_hits = base_hits + excluded.base_hits,
+    tags = tags + excluded.tags,
+    tagged = tagged + excluded.tagged;
+"""
+
+
+def weekKey(timestamp=None):
+    """
+    "2026-W41" style key for the week a time falls in (weeks start on Monday).
+    Same as SQLite's strftime('%Y-W%W').
+    """
+    return time.strftime("%Y-W%W", time.localtime(timestamp))
+
+
+def tagRatio(tags, tagged):
+    if tagged == 0:
+        return float(tags)
+    return tags / tagged
+
+
+class Leaderboard:
+    """
+    Lives in the same SQLite file as the match history and hooks onto its match end.
+    Several arenas can share one leaderboard: attach() each arena's MatchHistory
+    (they all have to use the same file).
+    """
+
+    def __init__(self, matchHistory, cacheSize=10):
+        self.history = matchHistory  # reads go through this one
+        self.cacheSize = cacheSize
+        self._cachedWeek = None
+        self._cachedTop = None
+
+        self.attach(matchHistory)
+
+    def attach(self, matchHistory):
+        """Counts the matches that finish in this MatchHistory too."""
+        matchHistory.addSchema(SCHEMA)
+        matchHistory.finishHooks.append(self.applyMatch)
+
+    def applyMatch(self, conn, summary):
+        """
+        Adds one finished match to the running totals.
+        Called by MatchHistory.finishMatch() with its connection, before it commits.
+        """
+        if not summary["completed"]:
+            return
+
+        week = weekKey(summary["ended_at"])
+        rows = []
+        for (_matchID, _endedAt, playerID, codename, _team, score,
+             _hasBase, tags, tagged, baseHits) in summary["players"]:
+            for bucket in (week, ALL_TIME):
+                rows.append((bucket, playerID, codename, score, baseHits, tags, tagged))
+
+        conn.executemany(UPSERT, rows)
+        self._cachedTop = None  # the next read picks up the new totals
+
+    def topPlayers(self, week=None, limit=10):
+        """
+        Top players for one week ("2026-W41"), this week if week is None, or ALL_TIME.
+        Returns a list of dicts: codename, player_id, matches, total_score, base_hits,
+        tags, tagged, tag_ratio.
+        """
+        if week is None:
+            week = weekKey()
+
+        if week == self._cachedWeek and self._cachedTop is not None and limit <= self.cacheSize:
+            return self._cachedTop[:limit]
+
+        try:
+            rows = self.history.query(
+                "SELECT codename, player_id, matches, total_score, base_hits, tags, tagged "
+                "FROM player_totals WHERE week = ? ORDER BY total_score DESC LIMIT ?;",
+                (week, max(limit, self.cacheSize)),
+            )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Could not read the leaderboard: {e}")
+            return []
+
+        top = [
+            {
+                "codename": codename,
+                "player_id": playerID,
+                "matches": matches,
+                "total_score": totalScore,
+                "base_hits": baseHits,
+                "tags": tags,
+                "tagged": tagged,
+                "tag_ratio": tagRatio(tags, tagged),
+            }
+            for codename, playerID, matches, totalScore, baseHits, tags, tagged in rows
+        ]
+
+        if week == weekKey():
+            self._cachedWeek = week
+            self._cachedTop = top
+        return top[:limit]
+
+    def topPlayersThisWeek(self, limit=10):
+        return self.topPlayers(None, limit)
+
+    def rebuildFromHistory(self):
+        """
+        Throws the running totals away and adds them up again from match_scores.
+        Only needed once, for history that was saved before the leaderboard existed.
+        """
+        week = "strftime('%Y-W%W', ended_at, 'unixepoch', 'localtime')"
+        with self.history.lock:
+            conn = self.history.connection()
+            conn.execute("DELETE FROM player_totals;")
+            for bucket in (week, f"'{ALL_TIME}'"):
+                # MAX(codename) just picks one name if a player's codename ever changed
+                conn.execute(
+                    "INSERT INTO player_totals (week, player_id, codename, matches, total_score, base_hits, tags, tagged) "
+                    f"SELECT {bucket}, player_id, MAX(codename), COUNT(*), SUM(score), SUM(base_hits), SUM(tags), SUM(tagged) "
+                    f"FROM match_scores GROUP BY {bucket}, player_id;"
+                )
+            conn.commit()
+        self._cachedTop = None
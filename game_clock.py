@@ -0,0 +1,96 @@
+"""
+The game clock: phase deadlines on their own thread.
+
+Why this file exists:
+- The clock used to be polled: the Action screen called updateTimer() every 250 ms and
+  the controller moved one whole second per elapsed second. If the Tk thread stalled,
+  the switch to PLAYING and the 202 broadcast went out late (up to a full tick, or more).
+- Now each phase has a deadline on time.monotonic() (start + 30 s, then + 360 s).
+  The deadlines are absolute, so nothing drifts no matter how often anyone polls.
+- A clock thread sleeps until the next deadline and calls onDeadline right then.
+  The controller uses that to send 202 / 221 on time and to put the phase change in
+  the single-writer queue, so the game thread still makes every state change.
+
+How late each deadline actually fired is kept in stats (jitter), in milliseconds.
+"""
+
+import threading
+import time
+
+
+class GameClock:
+    """
+    One clock per arena. schedule() sets the next deadline, cancel() drops it.
+    onDeadline(phase, deadline, token) is called on the clock thread when it is due.
+    token is whatever was passed to schedule() (the controller passes its match number,
+    so a deadline from a match that was cleared can be recognized and ignored).
+    """
+
+    def __init__(self, onDeadline, name="main"):
+        self.onDeadline = onDeadline
+        self.name = name
+
+        self._condition = threading.Condition()
+        self._phase = None
+        self._deadline = None
+        self._token = None
+        self._thread = None
+
+        self.stats = {"fired": 0, "lastLateMs": 0.0, "maxLateMs": 0.0, "totalLateMs": 0.0}
+
+    def schedule(self, phase, deadline, token=None):
+        """Fires onDeadline for phase at deadline (a time.monotonic() value)."""
+        with self._condition:
+            self._phase = phase
+            self._deadline = deadline
+            self._token = token
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"photon-clock-{self.name}", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def cancel(self):
+        with self._condition:
+            self._phase = None
+            self._deadline = None
+            self._token = None
+            self._condition.notify()
+
+    def deadline(self):
+        """The next deadline, or None if nothing is scheduled."""
+        return self._deadline
+
+    def getStats(self):
+        stats = dict(self.stats)
+        stats["avgLateMs"] = stats["totalLateMs"] / stats["fired"] if stats["fired"] else 0.0
+        return stats
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._deadline is None:
+                    self._condition.wait()
+
+                wait = self._deadline - time.monotonic()
+                if wait > 0:
+                    # Woken up early by schedule()/cancel() is fine, the loop just looks again
+                    self._condition.wait(wait)
+                    continue
+
+                phase, deadline, token = self._phase, self._deadline, self._token
+                self._phase = None
+                self._deadline = None
+                self._token = None
+
+            lateMs = (time.monotonic() - deadline) * 1000.0
+            self.stats["fired"] += 1
+            self.stats["lastLateMs"] = lateMs
+            self.stats["totalLateMs"] += lateMs
+            if lateMs > self.stats["maxLateMs"]:
+                self.stats["maxLateMs"] = lateMs
+
+            try:
+                self.onDeadline(phase, deadline, token)
+            except Exception as e:
+                # The clock thread must keep running for the next match
+                print(f"Warning: Clock {self.name} could not handle the {phase} deadline: {e}")
@@ -0,0 +1,419 @@
+"""
+Headless server mode: the game without a window.
+
+    python3 main.py --headless --roster tonight.csv
+    python3 main.py --headless --control-port 7502 --offline
+
+What runs:
+- the UDP listener, the controller clock and the broadcasts (202 / 221 / hits), same as the app
+- a game loop that calls controller.processAllArenas() every --tick-ms
+- new event log lines are printed to stdout
+
+What never runs: ui/app.py, tkinter, Pillow and pygame are not imported at all.
+That's what makes it start fast and use a lot less memory on the back room box.
+
+Rosters come from:
+- --roster FILE (the same CSV as "Import Roster" on the entry screen), and/or
+- a local control socket (TCP on 127.0.0.1 only), one command per line:
+
+    ADD RED 1 11 Spiderman      team, playerID, equipmentID, codename (codename optional if in the DB)
+    ROSTER /path/to/roster.csv
+    START                        start the 30 second warning
+    CLEAR                        same as F12
+    IP 192.168.1.255             broadcast IP
+    STATUS                       phase, clock and team totals
+    SCORES                       everyone's score, best first
+    CLOCK                        how late the phase deadlines (202 / 221) fired, in ms
+    SHUTDOWN
+
+  Put "@name" in front of a command to send it to another arena, like "@b START".
+  Try it with:  nc 127.0.0.1 7502
+
+Commands from the socket are handed to the game loop and run there, so only one thread
+ever changes the game state (same rule as the UI). ADD and ROSTER do their PostgreSQL part
+on the controller's database workers, so a slow database never holds up the game loop.
+Their reply comes once the players are on the roster.
+
+--offline adds roster players without asking PostgreSQL (every row then needs a codename).
+"""
+
+import argparse
+import socket
+import threading
+import time
+from collections import deque
+
+import controller
+from net import udp
+
+
+DEFAULT_CONTROL_PORT = 7502
+DEFAULT_TICK_MS = 50
+COMMAND_TIMEOUT_SECONDS = 30  # ADD / ROSTER wait on the database, give them time
+
+HELP_TEXT = "Commands: ADD team playerID equipmentID [codename], ROSTER path, START, CLEAR, IP address, STATUS, SCORES, CLOCK, SHUTDOWN"
+
+
+class HeadlessServer:
+    def __init__(self, tickMs=DEFAULT_TICK_MS, offline=False, quiet=False):
+        self.tickSeconds = tickMs / 1000.0
+        self.offline = offline
+        self.quiet = quiet
+        self.running = False
+
+        # (command line, reply holder, done Event) from the control socket threads
+        self.commands = deque()
+        # (Future, arena, whenDone) roster imports whose database part is running on a worker
+        self.pendingImports = deque()
+        self.lastLogSeq = {}
+
+    # ------------------------------------------------------------------
+    # Rosters
+    # ------------------------------------------------------------------
+
+    def addRoster(self, arena, entries, whenDone):
+        """
+        Adds (playerID, codename, equipmentID, team) rows to an arena, then calls whenDone(report).
+        Normally the database half of arena.importRoster() (one DB lookup, one batch insert) runs
+        on a worker, and finishPendingImports() adds the players on a later tick.
+        Offline, the rows are added right away and the broadcasts go out together at the end.
+        """
+        if not self.offline:
+            future = controller.dbWorkers.submit(arena.prepareRosterImport, entries)
+            self.pendingImports.append((future, arena, whenDone))
+            return
+
+        report = {"added": [], "errors": []}
+        equipmentIDs = []
+        for playerID, codename, equipmentID, team in arena.checkRosterEntries(entries, report["errors"]):
+            if not str(codename).strip():
+                report["errors"].append(f"Player {playerID} needs a codename in offline mode.")
+                continue
+            player = arena.addPlayerToTeam(team, playerID, codename, equipmentID, broadcast=False)
+            report["added"].append((player.team, player.playerID, player.codename, player.equipmentID))
+            equipmentIDs.append(player.equipmentID)
+
+        arena.netBroadcastEquipmentBatch(equipmentIDs)
+        if report["added"]:
+            arena.recordLog(f"{len(report['added'])} players were imported from a roster.")
+        whenDone(report)
+
+    def finishPendingImports(self, wait=False):
+        """
+        Game loop: adds the players of every import whose database part is done, in the order
+        they were asked for. wait=True blocks until all of them are done (only at startup).
+        """
+        while self.pendingImports:
+            future, arena, whenDone = self.pendingImports[0]
+            if not wait and not future.done():
+                return
+            self.pendingImports.popleft()
+
+            try:
+                report = arena.finishRosterImport(future.result())
+            except Exception as e:
+                report = {"added": [], "errors": [f"Database error, nothing was imported: {e}"]}
+            whenDone(report)
+
+    def dropPendingImports(self, arena, reason):
+        """CLEAR: imports still waiting on the database for this arena are not added (like F12 on the entry screen)."""
+        keep = deque()
+        for future, importArena, whenDone in self.pendingImports:
+            if importArena is arena:
+                whenDone({"added": [], "errors": [reason]})
+            else:
+                keep.append((future, importArena, whenDone))
+        self.pendingImports = keep
+
+    def loadRoster(self, arena, path, respond):
+        try:
+            entries = controller.loadRosterFile(path)
+        except (OSError, ValueError) as e:
+            respond(f"ERROR Could not read the roster file: {e}")
+            return
+
+        def whenDone(report):
+            reply = f"OK Imported {len(report['added'])} players."
+            if report["errors"]:
+                reply += f" {len(report['errors'])} skipped: " + " | ".join(report["errors"][:3])
+            respond(reply)
+
+        self.addRoster(arena, entries, whenDone)
+
+    # ------------------------------------------------------------------
+    # Commands (only ever run on the game loop thread)
+    # ------------------------------------------------------------------
+
+    def runCommand(self, line, respond=print):
+        """
+        Runs one command and returns its reply. ADD and ROSTER return None instead
+        and call respond(reply) when the roster import is done.
+        """
+        words = line.split()
+        if not words:
+            return ""
+
+        arena = controller.defaultController
+        if words[0].startswith("@"):
+            arena = controller.getArena(words[0][1:])
+            if arena is None:
+                return f"ERROR There is no arena called {words[0][1:]}."
+            words = words[1:]
+            if not words:
+                return "ERROR Missing command."
+
+        command = words[0].upper()
+        args = words[1:]
+
+        if command == "HELP":
+            return HELP_TEXT
+
+        if command == "ADD":
+            if len(args) < 3:
+                return "ERROR Usage: ADD team playerID equipmentID [codename]"
+            try:
+                playerID = int(args[1])
+                equipmentID = int(args[2])
+            except ValueError:
+                return "ERROR Player ID and Equipment ID have to be integers."
+
+            def whenDone(report):
+                if report["errors"] or not report["added"]:
+                    respond("ERROR " + (report["errors"] or ["The player was not added."])[0])
+                    return
+                team, playerID, codename, equipmentID = report["added"][0]
+                respond(f"OK {codename} ({playerID}) is on {team} with equipment {equipmentID}.")
+
+            self.addRoster(arena, [(playerID, " ".join(args[3:]), equipmentID, args[0].upper())], whenDone)
+            return None
+
+        if command == "ROSTER":
+            if not args:
+                return "ERROR Usage: ROSTER path"
+            self.loadRoster(arena, " ".join(args), respond)
+            return None
+
+        if command == "START":
+            if arena.state.phase in ("WARNING", "PLAYING"):
+                return "ERROR A match is already running."
+            if not arena.state.playersByPlayerID:
+                return "ERROR Add some players first."
+            arena.startGame()
+            return "OK The warning countdown has started."
+
+        if command == "CLEAR":
+            self.dropPendingImports(arena, "The arena was cleared before the import finished.")
+            arena.clearItAll()
+            return "OK Cleared."
+
+        if command == "IP":
+            if len(args) != 1:
+                return "ERROR Usage: IP address"
+            arena.netSetIp(args[0])
+            return f"OK Broadcasting to {args[0]}."
+
+        if command == "STATUS":
+            state = arena.state
+            return (
+                f"OK arena={arena.name} phase={state.phase} time={arena.formatTimeRemaining()} "
+                f"left={arena.getTimeRemainingPrecise():.1f}s "
+                f"red={state.redTotalScore} green={state.greenTotalScore} players={len(state.playersByPlayerID)}"
+            )
+
+        if command == "SCORES":
+            lines = ["OK"]
+            for team, roster in (("RED", arena.getSortedRedRoster()), ("GREEN", arena.getSortedGreenRoster())):
+                for player in roster:
+                    icon = " [B]" if player.has_baseIcon else ""
+                    lines.append(f"{team:<5} {player.codename:<20} {player.score:>6}{icon}")
+            return "\n".join(lines)
+
+        if command == "CLOCK":
+            stats = arena.getClockStats()
+            return (
+                f"OK deadlines={stats['fired']} late_ms last={stats['lastLateMs']:.2f} "
+                f"avg={stats['avgLateMs']:.2f} max={stats['maxLateMs']:.2f} "
+                f"game_thread_late_ms max={stats['maxApplyLateMs']:.1f}"
+            )
+
+        if command == "SHUTDOWN":
+            self.running = False
+            return "OK Shutting down."
+
+        return f"ERROR Unknown command {command}. {HELP_TEXT}"
+
+    def submitCommand(self, line, timeout=COMMAND_TIMEOUT_SECONDS):
+        """Called from a control socket thread. Waits for the game loop to run the command."""
+        reply = {}
+        done = threading.Event()
+        self.commands.append((line, reply, done))
+        if not done.wait(timeout):
+            return "ERROR The game loop did not answer in time."
+        return reply["text"]
+
+    def runPendingCommands(self):
+        while self.commands:
+            line, reply, done = self.commands.popleft()
+
+            def respond(text, reply=reply, done=done):
+                reply["text"] = text
+                done.set()
+
+            try:
+                text = self.runCommand(line, respond)
+            except ValueError as e:
+                text = f"ERROR {e}"
+            if text is not None:
+                respond(text)
+
+    # ------------------------------------------------------------------
+    # Control socket
+    # ------------------------------------------------------------------
+
+    def startControlSocket(self, port):
+        """TCP on 127.0.0.1 only, so nothing off this machine can change the game."""
+        serverSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        serverSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            serverSocket.bind(("127.0.0.1", port))
+        except OSError as e:
+            print(f"Warning: Could not open the control socket on port {port}. Error: {e}")
+            serverSocket.close()
+            return None
+        serverSocket.listen(4)
+
+        def acceptLoop():
+            while True:
+                try:
+                    connection, _address = serverSocket.accept()
+                except OSError:
+                    return
+                threading.Thread(target=self.serveConnection, args=(connection,), daemon=True).start()
+
+        threading.Thread(target=acceptLoop, daemon=True).start()
+        print(f"Control socket listening on 127.0.0.1:{port}")
+        return serverSocket
+
+    def serveConnection(self, connection):
+        with connection, connection.makefile("r", encoding="utf-8", errors="replace") as lines:
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                reply = self.submitCommand(line)
+                try:
+                    connection.sendall((reply + "\n").encode("utf-8"))
+                except OSError:
+                    return
+
+    # ------------------------------------------------------------------
+    # Game loop
+    # ------------------------------------------------------------------
+
+    def printNewLogLines(self):
+        for name, arena in controller.arenas.items():
+            eventLog = arena.state.eventLog
+            lastSeq = self.lastLogSeq.get(name, 0)
+            if eventLog.lastSeq <= lastSeq:
+                continue
+            prefix = "" if name == "main" else f"[{name}] "
+            for line in eventLog.since(lastSeq):
+                print(prefix + line)
+            self.lastLogSeq[name] = eventLog.lastSeq
+
+    def run(self):
+        """Runs until SHUTDOWN or Ctrl+C."""
+        self.running = True
+        nextTick = time.monotonic()
+        try:
+            while self.running:
+                self.runPendingCommands()
+                self.finishPendingImports()
+                controller.processAllArenas()
+                if not self.quiet:
+                    self.printNewLogLines()
+
+                nextTick += self.tickSeconds
+                delay = nextTick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    nextTick = time.monotonic()  # fell behind, don't try to catch up in a burst
+        except KeyboardInterrupt:
+            print()
+        finally:
+            self.runPendingCommands()  # nobody is left waiting on a reply
+            for arena in controller.arenas.values():
+                self.dropPendingImports(arena, "The server stopped before the import finished.")
+            self.shutdown()
+
+    def shutdown(self):
+        for arena in controller.arenas.values():
+            arena.stopRecording()
+            arena.matchHistory.flush()
+        udp.netFlushBroadcasts()
+        print("Headless server stopped.")
+
+
+def parseArena(text):
+    """"b:7511:7510" -> ("b", 7511, 7510)"""
+    try:
+        name, receivePort, broadcastPort = text.split(":")
+        return name, int(receivePort), int(broadcastPort)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Use name:receivePort:broadcastPort, like b:7511:7510")
+
+
+def main(argv=None, startedAt=None):
+    if startedAt is None:
+        startedAt = time.perf_counter()
+
+    parser = argparse.ArgumentParser(prog="main.py --headless", description="Run the game without a window.")
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--roster", action="append", default=[], help="roster CSV to load at startup (can repeat)")
+    parser.add_argument("--control-port", type=int, default=DEFAULT_CONTROL_PORT,
+                        help="local TCP port for commands (0 turns the control socket off)")
+    parser.add_argument("--ip", help="broadcast IP (default 127.0.0.1)")
+    parser.add_argument("--arena", type=parseArena, action="append", default=[],
+                        help="another arena, as name:receivePort:broadcastPort (can repeat)")
+    parser.add_argument("--start", action="store_true", help="start the match as soon as the rosters are loaded")
+    parser.add_argument("--tick-ms", type=float, default=DEFAULT_TICK_MS, help="game loop tick")
+    parser.add_argument("--offline", action="store_true", help="don't use PostgreSQL, codenames come from the roster")
+    parser.add_argument("--record", action="store_true", help="record every match for replay.py")
+    parser.add_argument("--quiet", action="store_true", help="don't print the event log")
+    args = parser.parse_args(argv)
+
+    udp.printEachPacket = False
+
+    server = HeadlessServer(tickMs=args.tick_ms, offline=args.offline, quiet=args.quiet)
+    mainArena = controller.defaultController
+
+    if args.ip:
+        mainArena.netSetIp(args.ip)
+    for name, receivePort, broadcastPort in args.arena:
+        controller.createArena(name, receivePort, broadcastPort)
+    for arena in controller.arenas.values():
+        arena.recordMatches = args.record
+
+    if not args.offline:
+        controller.warmCodenameCache()
+
+    for path in args.roster:
+        server.loadRoster(mainArena, path, print)
+    server.finishPendingImports(wait=True)  # the game loop isn't running yet, so waiting is fine
+
+    for arena in controller.arenas.values():
+        arena.netBeginUDP_Listener()
+
+    if args.control_port:
+        server.startControlSocket(args.control_port)
+
+    if args.start:
+        print(server.runCommand("START"))
+
+    print(f"Headless server ready in {(time.perf_counter() - startedAt) * 1000:.0f} ms. Ctrl+C to stop.")
+    server.run()
+
+
+if __name__ == "__main__":
+    main()
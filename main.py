@@ -1,7 +1,10 @@
-import tkinter as tkr #built-in python library for making user windows
+import time
+startedAt = time.perf_counter()  # both modes report how long startup took
+
 import sys
 import os
-from ui import app # Imports the app.py from the ui folder
+# ui.app (and with it tkinter, Pillow and pygame) is only imported when the window is wanted,
+# so "python3 main.py --headless" never loads any of them.
 
 # window = tkr.Tk() #the main window object
 # window.title("Repo Skeleton Test") #This .title comes from the window object in Tkinter
@@ -36,6 +39,10 @@ How to Run (VM Instructions):
    pkill -f "python3 main.py" 2>/dev/null || true
    python3 main.py
 
+   No display (scoring box in the back room)? Run it without a window:
+   python3 main.py --headless --roster roster.csv
+   (see headless.py for the control socket commands)
+
 *UI RENDERING NOTE*: If widgets do not fully draw on startup, drag and resize 
 the window. This forces Linux/VirtualBox to send a fresh repaint event.
 
@@ -47,4 +54,9 @@ Team Info:
 """
 
 if __name__ == "__main__":
-    app.startApp()
+    if "--headless" in sys.argv[1:]:
+        import headless
+        headless.main(sys.argv[1:], startedAt=startedAt)
+    else:
+        from ui import app # Imports the app.py from the ui folder
+        app.startApp(startedAt=startedAt)
@@ -1,5 +1,6 @@
+import os
 from dataclasses import dataclass, field
-from typing import List # Just makes to code easier to read when declaring new Lists
+from typing import Dict, List # Just makes to code easier to read when declaring new Lists/Dicts
 
 
 @dataclass # dataclasses allow you write "data - only classes", that way you can declare fields and python writes "init" for you.
@@ -10,6 +11,115 @@ class PlayerData:
     team: str
     score: int = 0
     has_baseIcon: bool = False
+    version: int = 0  # the Game_State version of the last change to this player
+
+
+class EventLog:
+    """
+    Fixed-size ring buffer for the event log lines.
+
+    - Every line gets a sequence number that only goes up, so the UI can ask for "lines after N".
+    - When the ring is full, the oldest chunk of lines is written to an append-only archive file
+      (if archivePath is set) and dropped from memory, so memory stays flat over long sessions.
+    - clear() archives whatever is left too, so back-to-back matches all end up in the file.
+
+    It still behaves like the old list for the simple stuff: append(), clear(), len(), and looping.
+    """
+
+    def __init__(self, capacity=500, archivePath=None):
+        self.capacity = int(capacity)
+        self.archivePath = archivePath
+        self.spillChunk = max(1, self.capacity // 4)  # lines written to disk per spill
+
+        # The ring itself is allocated once
+        self._lines = [None] * self.capacity
+        self._seqs = [0] * self.capacity
+        self._head = 0  # slot of the oldest line
+        self._count = 0
+
+        self.lastSeq = 0
+        self.spilledCount = 0
+
+    def append(self, message, seq=None):
+        """
+        Adds a line and returns its sequence number.
+        seq can be passed in as long as it is bigger than the last one (the controller uses its state version).
+        """
+        if seq is None:
+            seq = self.lastSeq + 1
+        if seq <= self.lastSeq:
+            raise ValueError(f"Event log sequence numbers must go up ({seq} <= {self.lastSeq}).")
+
+        if self._count == self.capacity:
+            self._spill(self.spillChunk)
+
+        slot = (self._head + self._count) % self.capacity
+        self._lines[slot] = message
+        self._seqs[slot] = seq
+        self._count += 1
+        self.lastSeq = seq
+        return seq
+
+    def since(self, seq):
+        """
+        Returns the lines with a sequence number bigger than seq (oldest first).
+        Lines that were already spilled to disk are not included.
+        """
+        # Binary search over the ring, the sequence numbers are sorted oldest -> newest
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._seqs[(self._head + middle) % self.capacity] <= seq:
+                low = middle + 1
+            else:
+                high = middle
+        return [self._lines[(self._head + i) % self.capacity] for i in range(low, self._count)]
+
+    def firstSeq(self):
+        """The sequence number of the oldest line still in memory (None if empty)."""
+        if self._count == 0:
+            return None
+        return self._seqs[self._head]
+
+    def clear(self):
+        """Archives everything still in memory and empties the ring. Sequence numbers keep going up."""
+        self._spill(self._count)
+
+    def _spill(self, howMany):
+        howMany = min(howMany, self._count)
+        if howMany <= 0:
+            return
+
+        slots = [(self._head + i) % self.capacity for i in range(howMany)]
+
+        if self.archivePath:
+            try:
+                folder = os.path.dirname(self.archivePath)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                with open(self.archivePath, "a", encoding="utf-8") as archive:
+                    archive.write("".join(
+                        f"{self._seqs[slot]}\t{str(self._lines[slot]).replace(chr(10), ' ')}\n"
+                        for slot in slots
+                    ))
+            except OSError as e:
+                print(f"Warning: Could not write the event log archive {self.archivePath}: {e}")
+
+        for slot in slots:
+            self._lines[slot] = None
+        self._head = (self._head + howMany) % self.capacity
+        self._count -= howMany
+        self.spilledCount += howMany
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._lines[(self._head + i) % self.capacity]
+
+    def __repr__(self):
+        return f"EventLog({list(self)!r})"
 
 
 @dataclass
@@ -19,11 +129,27 @@ class Game_State:  # field(default_factory=list) makes sure that every new insta
 
     phase: str = "Beginning" # What screen/phase the player is in
     time_remaining: int = 0 # Time Left
-    eventLog: List[str] = field(default_factory=list)
+    eventLog: EventLog = field(default_factory=EventLog)  # ring buffer, see EventLog above
+
+    # Running team totals, updated the moment a score changes (no summing every frame)
+    redTotalScore: int = 0
+    greenTotalScore: int = 0
+
+    # Quick lookups so the UDP hot path never has to scan the rosters.
+    # The controller keeps these in sync with redTeam/greenTeam.
+    playersByEquipmentID: Dict[int, PlayerData] = field(default_factory=dict)
+    playersByPlayerID: Dict[int, PlayerData] = field(default_factory=dict)
 
     # timer support
     timer_running: bool = False
 
+    # Change tracking for getActionDelta().
+    # version goes up by one on every change, the others remember when each part last changed.
+    version: int = 0
+    phaseVersion: int = 0
+    timerVersion: int = 0
+    resetVersion: int = 0  # rosters/log were rebuilt, so the UI needs everything again
+
 
 if __name__ == "__main__":
     gs = Game_State()
@@ -0,0 +1,272 @@
+"""
+asyncio version of the UDP network code.
+
+Why this file exists:
+- udp.py runs one daemon thread per listener with a blocking recvfrom loop.
+- This file does the same job (receive on 7501, broadcast on 7500) with asyncio,
+  so one event loop can serve several arenas (several engines) with no extra threads.
+
+How to use it from async code:
+    engine = AsyncUDPEngine(receivePort=7501, broadcastPort=7500)
+    await engine.start()
+    await engine.broadcast(202)
+    async for event in engine.events():
+        ...  # udp.PacketEvent records, they work like the parse_packet() dictionaries
+
+How the old code keeps working:
+- Set udp.networkEngine = "asyncio" and the normal udp.netBeginUDP_Listener(),
+  udp.netBroadcastEquipment() and udp.netSetIp() calls get sent to the functions at the
+  bottom of this file. Those run a shared event loop in ONE background thread.
+
+Important Info:
+- This file should not be directly called by the UI, same as udp.py.
+"""
+
+import asyncio
+import socket
+import threading
+
+from net import udp
+
+
+class PhotonDatagramProtocol(asyncio.DatagramProtocol):
+    """
+    asyncio calls this every time a datagram shows up on the engine's receive socket.
+    It just hands the bytes to the engine.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def datagram_received(self, data, addr):
+        self.engine._onDatagram(data, addr)
+
+    def error_received(self, exc):
+        print(f"Warning: UDP receive error ignored -> {exc}")
+
+
+class AsyncUDPEngine:
+    """
+    One arena's network: a receive endpoint and a broadcast endpoint on the same event loop.
+
+    - newBatch (optional) is called with every event that arrived during one loop pass,
+      same idea as the newBatch callback in udp.netBeginUDP_Listener().
+    - Events also go to an asyncio.Queue, so code can do "async for event in engine.events()".
+      If nobody reads that queue it fills up and new events are counted in stats["dropped"].
+      Pass queueSize=None to skip the queue when only newBatch is used.
+    """
+
+    def __init__(self, receivePort=None, broadcastPort=None, networkIP=None,
+                 listenIP="0.0.0.0", newBatch=None, queueSize=4096):
+        self.receivePort = udp.receivePort if receivePort is None else int(receivePort)
+        self.broadcastPort = udp.broadcastPort if broadcastPort is None else int(broadcastPort)
+        self.networkIP = udp.networkIP if networkIP is None else str(networkIP).strip()
+        self.listenIP = listenIP
+        self.newBatch = newBatch
+        self.queueSize = queueSize
+
+        self.loop = None
+        self._rxTransport = None
+        self._txTransport = None
+        self._queue = None
+        self._batch = []
+        self._flushScheduled = False
+        self._nextEndCodeAt = 0.0  # loop.time() when the next 221 may go out (see broadcastNowait)
+
+        self.stats = {"received": 0, "ignored": 0, "dropped": 0, "sent": 0, "batches": 0}
+
+        # Same idea as udp.rawPacketHook, but only for this engine's arena.
+        # If it is None, udp.rawPacketHook is used.
+        self.rawPacketHook = None
+
+    async def start(self):
+        """Opens both sockets on the running loop."""
+        self.loop = asyncio.get_running_loop()
+        if self.queueSize is not None:
+            self._queue = asyncio.Queue(maxsize=self.queueSize)
+
+        rxSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            rxSocket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, udp.receiveBufferBytes)
+        except OSError as e:
+            print(f"Warning: Could not set SO_RCVBUF to {udp.receiveBufferBytes}. Error: {e}")
+        rxSocket.bind((self.listenIP, self.receivePort))
+        rxSocket.setblocking(False)
+
+        self._rxTransport, _ = await self.loop.create_datagram_endpoint(
+            lambda: PhotonDatagramProtocol(self), sock=rxSocket
+        )
+        self._txTransport, _ = await self.loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, family=socket.AF_INET, allow_broadcast=True
+        )
+
+        print(f"The asyncio UDP listener is running on {self.listenIP}:{self.receivePort}")
+
+    def setIp(self, ip):
+        """Changes where broadcasts go. The listener address does not change."""
+        self.networkIP = str(ip).strip()
+        print(f" The UDP network IP set to {self.networkIP}")
+
+    def broadcastNowait(self, equipmentID):
+        """
+        Sends one code on the broadcast port. Must be called on the engine's loop.
+        transport.sendto never blocks, asyncio buffers it if the socket is busy.
+        221 (game end) sends are spaced out by udp.endCodePacingSeconds like the threaded
+        sender does, using call_at instead of sleeping so the loop keeps running.
+        """
+        code = int(equipmentID)
+        if code == 221:
+            now = self.loop.time()
+            if now < self._nextEndCodeAt:
+                self.loop.call_at(self._nextEndCodeAt, self._send, code)
+                self._nextEndCodeAt += udp.endCodePacingSeconds
+                return
+            self._nextEndCodeAt = now + udp.endCodePacingSeconds
+
+        self._send(code)
+
+    def _send(self, code):
+        message = str(code).encode("utf-8")
+        self._txTransport.sendto(message, (self.networkIP, self.broadcastPort))
+        self.stats["sent"] += 1
+
+        if udp.printEachPacket:
+            print(f"UDP Broadcast sent: {code} to {self.networkIP}:{self.broadcastPort}")
+
+    async def broadcast(self, equipmentID):
+        """Async version of udp.netBroadcastEquipment() for this arena."""
+        self.broadcastNowait(equipmentID)
+
+    async def events(self):
+        """Async iterator of parsed events, in the order they arrived."""
+        if self._queue is None:
+            raise RuntimeError("This engine was made with queueSize=None, so it has no event queue.")
+        while True:
+            yield await self._queue.get()
+
+    def __aiter__(self):
+        return self.events()
+
+    async def close(self):
+        for transport in (self._rxTransport, self._txTransport):
+            if transport is not None:
+                transport.close()
+        self._rxTransport = None
+        self._txTransport = None
+
+    def _onDatagram(self, data, addr):
+        self.stats["received"] += 1
+        hook = self.rawPacketHook if self.rawPacketHook is not None else udp.rawPacketHook
+        if hook is not None:
+            hook(data)
+        parsed_event = udp.parse_packet_bytes(data)
+
+        if udp.printEachPacket:
+            print("UDP received:", data.decode("utf-8", errors="ignore").strip(), "from", addr)
+
+        if parsed_event is None:
+            self.stats["ignored"] += 1
+            if udp.printEachPacket:
+                print(f"Warning: Invalid UDP packet ignored -> {data.decode('utf-8', errors='ignore').strip()}")
+            return
+
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(parsed_event)
+            except asyncio.QueueFull:
+                self.stats["dropped"] += 1
+
+        # Everything that arrives during this loop pass gets handed over as one batch
+        if self.newBatch is not None:
+            self._batch.append(parsed_event)
+            if not self._flushScheduled:
+                self._flushScheduled = True
+                self.loop.call_soon(self._flushBatch)
+
+    def _flushBatch(self):
+        batch = self._batch
+        self._batch = []
+        self._flushScheduled = False
+        self.stats["batches"] += 1
+        self.newBatch(batch)
+
+
+# -----------------------------------------------------------------------------
+# Shared loop (one background thread for every engine in the process)
+# -----------------------------------------------------------------------------
+
+sharedLoop = None
+sharedLoopLock = threading.Lock()
+
+
+def getSharedLoop():
+    """
+    Returns the process-wide event loop, starting its thread the first time.
+    Every engine started with startEngine() lives on this one loop.
+    """
+    global sharedLoop
+
+    with sharedLoopLock:
+        if sharedLoop is None:
+            sharedLoop = asyncio.new_event_loop()
+            threading.Thread(target=sharedLoop.run_forever, daemon=True).start()
+        return sharedLoop
+
+
+def startEngine(engine):
+    """Starts an engine on the shared loop from normal (non-async) code and waits for it."""
+    asyncio.run_coroutine_threadsafe(engine.start(), getSharedLoop()).result()
+    return engine
+
+
+# -----------------------------------------------------------------------------
+# Compatibility shim for the old udp.py functions
+# -----------------------------------------------------------------------------
+
+defaultEngine = None
+
+
+def netBeginUDP_Listener(newMessage=None, newBatch=None):
+    """
+    Same contract as udp.netBeginUDP_Listener(), but on the shared asyncio loop.
+    newBatch gets each loop pass's events, otherwise newMessage gets them one at a time.
+    """
+    global defaultEngine
+
+    def handOver(events):
+        if newBatch is not None:
+            newBatch(events)
+        elif newMessage is not None:
+            for parsed_event in events:
+                newMessage(parsed_event)
+
+    try:
+        defaultEngine = startEngine(AsyncUDPEngine(newBatch=handOver, queueSize=None))
+    except OSError as e:
+        print(f"Warning: Could not bind to port {udp.receivePort}. Is the listener already running? Error: {e}")
+
+
+def netBroadcastEquipment(equipmentID):
+    """Same contract as udp.netBroadcastEquipment(). Never blocks the caller."""
+    global defaultEngine
+
+    if defaultEngine is None:
+        # Broadcasting before the listener started, so make a send-only engine
+        engine = AsyncUDPEngine(queueSize=None)
+        engine.loop = getSharedLoop()
+
+        async def openSender():
+            engine._txTransport, _ = await engine.loop.create_datagram_endpoint(
+                asyncio.DatagramProtocol, family=socket.AF_INET, allow_broadcast=True
+            )
+
+        asyncio.run_coroutine_threadsafe(openSender(), engine.loop).result()
+        defaultEngine = engine
+
+    defaultEngine.loop.call_soon_threadsafe(defaultEngine.broadcastNowait, equipmentID)
+
+
+def netSetIp(ip):
+    """Same contract as udp.netSetIp()."""
+    if defaultEngine is not None:
+        defaultEngine.setIp(ip)
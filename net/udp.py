@@ -64,9 +64,11 @@ Green Team: Wolverine (ID 3, Eq 33).
 """
 
 
+import select
 import socket
 import threading
 import time
+from collections import deque, namedtuple
 
 def parse_packet(raw_text):
     """Converts a raw UDP string into an event dictionary."""
@@ -94,6 +96,106 @@ def parse_packet(raw_text):
     # Otherwise, it's a normal player tag
     return {"type": "TAG", "transmitter": transmitter, "hit": hit}
 
+
+class PacketEvent(namedtuple("PacketEvent", "type transmitter hit")):
+    """
+    Small fixed-shape event made by the fast parser (parse_packet_bytes).
+
+    It has the same three fields as the parse_packet dictionary, and get() / ["key"] work
+    the same way, so the controller can take either one.
+    It is a tuple underneath, so there is no per-event dictionary behind it.
+    """
+    __slots__ = ()
+
+    def get(self, key, default=None):
+        if key == "type":
+            return self[0]
+        if key == "transmitter":
+            return self[1]
+        if key == "hit":
+            return self[2]
+        return default
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def asDict(self):
+        return {"type": self[0], "transmitter": self[1], "hit": self[2]}
+
+
+# Skips the namedtuple's Python-level __new__ when the parser builds events
+makePacketEvent = tuple.__new__
+
+
+def parse_packet_bytes(data, length=None):
+    """
+    Fast version of parse_packet that works right on the received bytes.
+
+    - data is bytes or a bytearray (like a slot of the listener's receive ring)
+    - length is how many bytes of it are the datagram (defaults to all of it)
+    - returns a PacketEvent, or None for garbage, same rules as parse_packet
+
+    No decoding to str and no strip: int() reads the digits straight out of the bytes
+    and ignores the same surrounding ASCII whitespace parse_packet strips.
+    The few datagrams that int() can't read that way but the old decode + strip could
+    (stray non-ASCII bytes, Unicode digits, the 0x1c-0x1f separators str.strip() counts
+    as whitespace) go through parseUnusualBytes, so both parsers accept the same datagrams.
+    """
+    if length is not None:
+        data = data[:length]
+
+    # Exactly one colon is allowed
+    parts = data.split(b":")
+    if len(parts) != 2:
+        return None
+
+    # Make sure both parts are actual numbers
+    try:
+        transmitter = int(parts[0])
+        hit = int(parts[1])
+    except ValueError:
+        return parseUnusualBytes(data)
+
+    # Check if it's a base code (43 for red, 53 for green)
+    if hit == 43 or hit == 53:
+        return makePacketEvent(PacketEvent, ("BASE", transmitter, hit))
+
+    return makePacketEvent(PacketEvent, ("TAG", transmitter, hit))
+
+
+# Bytes that str.strip() / int(str) treat as whitespace but int(bytes) does not
+STR_ONLY_WHITESPACE = b"\x1c\x1d\x1e\x1f"
+
+
+def parseUnusualBytes(data):
+    """
+    The old listener path (decode with errors="ignore" -> parse_packet) for a datagram the
+    fast path could not read. Plain ASCII garbage like "hello" never gets this far into it.
+    """
+    if data.isascii() and not any(byte in STR_ONLY_WHITESPACE for byte in data):
+        return None  # the old path would have said garbage too
+
+    event = parse_packet(bytes(data).decode("utf-8", errors="ignore"))
+    if event is None:
+        return None
+    return makePacketEvent(PacketEvent, (event["type"], event["transmitter"], event["hit"]))
+
+
+def parse_packet_batch(payloads, lengths=None):
+    """
+    Parses a list of payloads in one call.
+    Returns a list the same length as payloads, with None where a payload was garbage.
+    lengths (optional) lines up with payloads, for ring slots that are bigger than the datagram.
+    """
+    parse = parse_packet_bytes
+    if lengths is None:
+        return [parse(payload) for payload in payloads]
+    return [parse(payload, length) for payload, length in zip(payloads, lengths)]
+
 #The Required Ports
 broadcastPort = 7500
 receivePort = 7501
@@ -105,6 +207,59 @@ networkIP = "127.0.0.1"
 # Keep a reusable sender socket 
 senderSocket = None
 
+# Outbound queue for the threaded engine (see netBroadcastEquipment / senderLoop)
+# - endCodePacingSeconds is the gap between the three 221 game-end broadcasts
+# - coalesceDuplicateSends merges the same equipment ID queued twice in one batch.
+#   Off by default: every hit gets its own broadcast, like it always did. Whether two hits
+#   land in the same batch depends on thread timing, so turning this on makes the number
+#   of hit notices the hardware sees depend on timing too.
+endCodePacingSeconds = 0.05
+coalesceDuplicateSends = False
+sendQueue = deque()
+sendWakeup = threading.Event()
+senderThread = None
+senderThreadLock = threading.Lock()
+sendStats = {
+    "queued": 0,
+    "sent": 0,
+    "coalesced": 0,
+    "failed": 0,
+    "batches": 0,
+    "maxDepth": 0,
+    "totalLatencyMs": 0.0,
+    "maxLatencyMs": 0.0,
+}
+
+# Which network engine the functions below use:
+# - "thread"  : the original one daemon thread + blocking socket per listener
+# - "asyncio" : everything goes through net/async_udp.py on one shared event loop
+networkEngine = "thread"
+
+# Batched receive settings
+# - receiveBufferBytes is the SO_RCVBUF we ask the kernel for (Linux doubles it and may clamp it)
+# - batchRingSize is how many datagrams get drained per wakeup into the preallocated ring
+# - printEachPacket keeps the "UDP received:" and "Invalid UDP packet ignored" lines from the README
+#   checklist, turn it off for load tests (a flood of garbage would otherwise be a flood of prints)
+receiveBufferBytes = 1024 * 1024
+batchRingSize = 64
+printEachPacket = True
+
+# If set, every datagram's raw bytes (garbage included) are handed to this before parsing.
+# It runs on the listener thread, so it must be quick. replay.py uses it to record matches.
+rawPacketHook = None
+
+# If set, called right before newBatch with one time.perf_counter() per event in the batch,
+# taken right after that datagram's recvfrom_into. Only bench/udp_load.py uses it (for latency).
+receiveTimesHook = None
+
+# Listener counters (read these with netGetReceiveStats())
+receiveStats = {
+    "received": 0,      # datagrams pulled off the socket
+    "ignored": 0,       # datagrams that were garbage and never reached the controller
+    "batches": 0,       # wakeups that drained at least one datagram
+    "largestBatch": 0,  # most datagrams drained in a single wakeup
+}
+
 
 def netSetIp(ip):
     """
@@ -113,6 +268,12 @@ def netSetIp(ip):
     """
     global networkIP
     networkIP = str(ip).strip()
+
+    if networkEngine == "asyncio":
+        from net import async_udp
+        async_udp.netSetIp(networkIP)
+        return
+
     print(f" The UDP network IP set to {networkIP}")
 
 
@@ -121,6 +282,76 @@ def netBroadcastEquipment(equipmentID):
     This function should broadcast equipment codes on UDP port 7500.
     This is from Jim's python_udpclient.py
     This can also be 202 or 221, signaling 'Game Start' or 'Game End'
+
+    The send itself happens on the sender thread (see senderLoop below),
+    so this only puts the code in line and returns right away.
+    It never blocks the scoring path or the Tk thread.
+    """
+    if networkEngine == "asyncio":
+        from net import async_udp
+        async_udp.netBroadcastEquipment(equipmentID)
+        return
+
+    # this is here since the format of transmission should be a single integer
+    # (checked here so a bad ID still raises for the caller)
+    code = int(equipmentID)
+
+    sendQueue.append((code, time.perf_counter()))
+    sendStats["queued"] += 1
+    depth = len(sendQueue)
+    if depth > sendStats["maxDepth"]:
+        sendStats["maxDepth"] = depth
+
+    if senderThread is None:
+        startSenderThread()
+    sendWakeup.set()
+
+
+def netBroadcastEquipmentBatch(equipmentIDs):
+    """
+    Queues several codes at once and wakes the sender one time,
+    so they go out together in one batch (used by the bulk roster import).
+    """
+    if networkEngine == "asyncio":
+        for equipmentID in equipmentIDs:
+            netBroadcastEquipment(equipmentID)
+        return
+
+    codes = [int(equipmentID) for equipmentID in equipmentIDs]
+    if not codes:
+        return
+
+    queuedAt = time.perf_counter()
+    sendQueue.extend((code, queuedAt) for code in codes)
+    sendStats["queued"] += len(codes)
+    depth = len(sendQueue)
+    if depth > sendStats["maxDepth"]:
+        sendStats["maxDepth"] = depth
+
+    if senderThread is None:
+        startSenderThread()
+    sendWakeup.set()
+
+
+def startSenderThread():
+    """Starts the sender thread the first time something is broadcast."""
+    global senderThread
+
+    with senderThreadLock:
+        if senderThread is None:
+            senderThread = threading.Thread(target=senderLoop, daemon=True)
+            senderThread.start()
+
+
+def senderLoop():
+    """
+    The only place the threaded engine actually sends.
+
+    Every wakeup drains everything waiting in sendQueue as one batch:
+    - 221 (game end) sends are spaced out by endCodePacingSeconds so the hardware sees all 3,
+      even when they end up in different batches
+    - if coalesceDuplicateSends is on (it is off by default), an equipment ID that shows up
+      twice in the same batch is only sent once (202, 221, 43 and 53 are never merged)
     """
     global senderSocket
 
@@ -129,14 +360,118 @@ def netBroadcastEquipment(equipmentID):
         senderSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         senderSocket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
 
-    # this is here since the format of transmission should be a single integer
-    message = str(int(equipmentID)).encode("utf-8")
-    senderSocket.sendto(message, (networkIP, broadcastPort))
+    lastEndCodeSentAt = None
 
-    print(f"UDP Broadcast sent: {equipmentID} to {networkIP}:{broadcastPort}")
+    while True:
+        sendWakeup.wait()
+        sendWakeup.clear()
 
+        batch = []
+        try:
+            while True:
+                batch.append(sendQueue.popleft())
+        except IndexError:
+            pass  # nothing left waiting
 
-def netBeginUDP_Listener(newMessage=None):
+        sentThisBatch = set()
+
+        for code, queuedAt in batch:
+            if coalesceDuplicateSends and code not in (202, 221, 43, 53) and code in sentThisBatch:
+                sendStats["coalesced"] += 1
+                continue
+
+            if code == 221:
+                if lastEndCodeSentAt is not None:
+                    wait = lastEndCodeSentAt + endCodePacingSeconds - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                lastEndCodeSentAt = time.perf_counter()
+
+            try:
+                senderSocket.sendto(str(code).encode("utf-8"), (networkIP, broadcastPort))
+            except OSError as e:
+                sendStats["failed"] += 1
+                print(f"Warning: UDP broadcast of {code} failed -> {e}")
+                continue
+
+            latencyMs = (time.perf_counter() - queuedAt) * 1000.0
+            sendStats["sent"] += 1
+            sendStats["totalLatencyMs"] += latencyMs
+            if latencyMs > sendStats["maxLatencyMs"]:
+                sendStats["maxLatencyMs"] = latencyMs
+
+            sentThisBatch.add(code)
+
+            if printEachPacket:
+                print(f"UDP Broadcast sent: {code} to {networkIP}:{broadcastPort}")
+
+        sendStats["batches"] += 1
+
+
+def netGetSendStats():
+    """
+    Returns the sender numbers: how deep the queue is right now and how long sends waited.
+    Latency is from netBroadcastEquipment() to the datagram leaving the socket.
+    """
+    stats = dict(sendStats)
+    stats["depth"] = len(sendQueue)
+    stats["avgLatencyMs"] = stats["totalLatencyMs"] / stats["sent"] if stats["sent"] else 0.0
+    return stats
+
+
+def netFlushBroadcasts(timeout=2.0):
+    """
+    Waits (up to timeout seconds) until everything queued has been sent or merged.
+    Handy before shutting down, since the sender thread is a daemon.
+    Returns True if the queue emptied in time.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done = sendStats["sent"] + sendStats["coalesced"] + sendStats["failed"]
+        if not sendQueue and done >= sendStats["queued"]:
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def kernelDropCount(port=None):
+    """
+    Looks up how many datagrams the kernel dropped for our listener socket.
+    These are packets that arrived while the socket buffer was full, so we never saw them.
+    This reads the "drops" column of /proc/net/udp, so it only works on Linux.
+    Returns None if the number can't be found.
+    """
+    if port is None:
+        port = receivePort
+
+    portHex = f":{int(port):04X}"
+    total = None
+
+    for path in ("/proc/net/udp", "/proc/net/udp6"):
+        try:
+            with open(path) as f:
+                next(f)  # skip the header line
+                for line in f:
+                    fields = line.split()
+                    if len(fields) > 1 and fields[1].endswith(portHex):
+                        total = (total or 0) + int(fields[-1])
+        except (OSError, ValueError, StopIteration):
+            continue
+
+    return total
+
+
+def netGetReceiveStats():
+    """
+    Returns a copy of the listener counters.
+    "dropped" is what the kernel threw away because the socket buffer filled up.
+    """
+    stats = dict(receiveStats)
+    stats["dropped"] = kernelDropCount()
+    return stats
+
+
+def netBeginUDP_Listener(newMessage=None, newBatch=None):
     """
     This function starts a UDP receive socket on port 7501.
 
@@ -144,12 +479,31 @@ def netBeginUDP_Listener(newMessage=None):
     - This is an optional function passed by the controller.
     - We parse the raw UDP text and call newMessage(parsed_event) 
       every time a valid TAG or BASE event is received.
+
+    The purpose of the newBatch callback:
+    - Every time the socket wakes up we drain ALL the datagrams waiting in it
+      (up to batchRingSize) into a ring of buffers that gets allocated once.
+    - If newBatch is given, it is called once per wakeup with the list of parsed events,
+      so the controller can apply a whole burst of tags in one go.
+    - If only newMessage is given, it is still called once per event like before.
+
+    If networkEngine is "asyncio" this hands off to net/async_udp.py instead of starting a thread.
     """
+    if networkEngine == "asyncio":
+        from net import async_udp
+        async_udp.netBeginUDP_Listener(newMessage=newMessage, newBatch=newBatch)
+        return
 
     def listenLoop():
         # This is the cration of the server socket
         rxSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
+        # A bigger kernel buffer means a burst of tags waits for us instead of getting dropped
+        try:
+            rxSocket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receiveBufferBytes)
+        except OSError as e:
+            print(f"Warning: Could not set SO_RCVBUF to {receiveBufferBytes}. Error: {e}")
+
         # The following will allow the binding to any IP
         try:
             rxSocket.bind(("0.0.0.0", receivePort))
@@ -158,23 +512,83 @@ def netBeginUDP_Listener(newMessage=None):
             print(f"Warning: Could not bind to port {receivePort}. Is the listener already running? Error: {e}")
             return  # This stops the thread from crashing the whole app
 
-        while True:
-            data, addr = rxSocket.recvfrom(bufferSize)
-            raw = data.decode("utf-8", errors="ignore").strip()
+        # Non-blocking so we can keep draining until the socket is empty
+        rxSocket.setblocking(False)
 
-            # Here, the receieved data is printed 
-            print("UDP received:", raw, "from", addr)
+        # The ring is made once here, recvfrom_into just writes into it
+        ring = [bytearray(bufferSize) for _ in range(batchRingSize)]
+        sizes = [0] * batchRingSize
+        senders = [None] * batchRingSize
+        receivedAt = [0.0] * batchRingSize
 
-            # Parse the raw data
-            parsed_event = parse_packet(raw)
-            
-            if parsed_event is None:
-                print(f"Warning: Invalid UDP packet ignored -> {raw}")
-                continue # Skip the rest of the loop, don't send to controller
+        while True:
+            # Sleep until at least one datagram is waiting
+            select.select([rxSocket], [], [])
+
+            timesHook = receiveTimesHook
+            count = 0
+            while count < batchRingSize:
+                try:
+                    nbytes, addr = rxSocket.recvfrom_into(ring[count])
+                except (BlockingIOError, InterruptedError):
+                    break  # the socket is empty, this wakeup is done
+                except OSError as e:
+                    print(f"Warning: UDP receive error ignored -> {e}")
+                    break
+
+                if timesHook is not None:
+                    receivedAt[count] = time.perf_counter()
+                sizes[count] = nbytes
+                senders[count] = addr
+                count += 1
+
+            if count == 0:
+                continue
+
+            receiveStats["received"] += count
+            receiveStats["batches"] += 1
+            if count > receiveStats["largestBatch"]:
+                receiveStats["largestBatch"] = count
+
+            hook = rawPacketHook
+            if hook is not None:
+                for i in range(count):
+                    hook(bytes(ring[i][:sizes[i]]))
+
+            events = []
+            eventTimes = []
+            for i in range(count):
+                # Parse the raw bytes right out of the ring slot (no decode needed)
+                parsed_event = parse_packet_bytes(ring[i], sizes[i])
+
+                # Here, the receieved data is printed 
+                if printEachPacket:
+                    raw = ring[i][:sizes[i]].decode("utf-8", errors="ignore").strip()
+                    print("UDP received:", raw, "from", senders[i])
+
+                if parsed_event is None:
+                    receiveStats["ignored"] += 1
+                    if printEachPacket:
+                        raw = ring[i][:sizes[i]].decode("utf-8", errors="ignore").strip()
+                        print(f"Warning: Invalid UDP packet ignored -> {raw}")
+                    continue # Skip this one, don't send to controller
+
+                events.append(parsed_event)
+                if timesHook is not None:
+                    eventTimes.append(receivedAt[i])
+
+            if not events:
+                continue
+
+            if timesHook is not None:
+                timesHook(eventTimes)
 
             # With this the Controller can optionally handle it
-            if newMessage is not None:
-                newMessage(parsed_event) # Send the DICTIONARY, not the raw string!
+            if newBatch is not None:
+                newBatch(events)  # the whole burst at once
+            elif newMessage is not None:
+                for parsed_event in events:
+                    newMessage(parsed_event) # Send the DICTIONARY, not the raw string!
 
     # With this thread the UI should not feeeze
     # target=listenLoop means “Run listenLoop() in a background thread”
@@ -192,6 +606,7 @@ if __name__ == "__main__":
     # This is a test message sent on the 7500
     print("Test broadcast 123 is sent.")
     netBroadcastEquipment(123)
+    netFlushBroadcasts()
 
     # This just keeps the listener running
     # This loop keeps the file alive so you can test traffic, press keys, and whatever else.
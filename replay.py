@@ -0,0 +1,247 @@
+"""
+Match recording and replay.
+
+Why this file exists:
+- The scoring rules (applyEvent, applyNormalHitScore, applyBaseHitScore) only ever see live UDP traffic,
+  so they were hard to load test and there was no way to play a match back.
+- A recording keeps everything the scoring depends on, with the time it happened:
+    * every raw datagram the listener received (garbage included, it gets parsed again on replay)
+    * every phase change
+    * every roster add, a match start, and F12 clears
+- A replay feeds a recording into a fresh Game_State, at real speed or as fast as possible,
+  with no Tk, no UDP and no database. It reports events/sec and a digest of the final scores,
+  so two replays of the same recording can be checked against each other.
+
+How to record (from the controller):
+    controller.startRecording()        # or set controller.recordMatches = True (every arena, every match)
+    ...
+    controller.stopRecording()
+
+How to replay:
+    python3 replay.py logs/replays/match-20261018-190000.phrec
+    python3 replay.py some.phrec --speed 1      # real speed
+    python3 replay.py some.phrec --speed 10     # 10x
+
+File format (small on purpose, a full match is usually well under 1 MB):
+    b"PHREC1\\n" + <d wall clock start>
+    then records of <d seconds since start><B kind><H payload length> + payload
+"""
+
+import hashlib
+import struct
+import threading
+import time
+from collections import deque
+
+
+MAGIC = b"PHREC1\n"
+HEADER = struct.Struct("<d")
+RECORD = struct.Struct("<dBH")
+
+KIND_PACKET = 1  # payload: the raw datagram
+KIND_PHASE = 2   # payload: phase name
+KIND_ROSTER = 3  # payload: "team,playerID,equipmentID,codename"
+KIND_START = 4   # payload: empty (startGame reset the match state)
+KIND_CLEAR = 5   # payload: empty (F12)
+
+KIND_NAMES = {
+    KIND_PACKET: "PACKET",
+    KIND_PHASE: "PHASE",
+    KIND_ROSTER: "ROSTER",
+    KIND_START: "START",
+    KIND_CLEAR: "CLEAR",
+}
+
+
+class MatchRecorder:
+    """
+    Writes one recording file.
+    packet() and the phase deadlines are written under the arena's queueLock (listener and
+    clock threads), in the same order they went into its pendingEvents. Everything else comes
+    from the game thread. All of them only append to a deque, which is written out in chunks
+    of flushEvery records.
+    """
+
+    def __init__(self, path, flushEvery=1000):
+        self.path = path
+        self.flushEvery = flushEvery
+        self.startedAt = time.monotonic()
+        self.count = 0
+
+        self._records = deque()
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC + HEADER.pack(time.time()))
+
+    def _add(self, kind, payload):
+        self._records.append((time.monotonic() - self.startedAt, kind, payload))
+        if len(self._records) >= self.flushEvery:
+            self.flush()
+
+    def packet(self, data):
+        self._add(KIND_PACKET, bytes(data[:0xFFFF]))
+
+    def phase(self, phase):
+        self._add(KIND_PHASE, str(phase).encode("utf-8"))
+
+    def roster(self, team, playerID, codename, equipmentID):
+        self._add(KIND_ROSTER, f"{team},{playerID},{equipmentID},{codename}".encode("utf-8"))
+
+    def start(self):
+        self._add(KIND_START, b"")
+
+    def clear(self):
+        self._add(KIND_CLEAR, b"")
+
+    def flush(self):
+        with self._lock:
+            if self._file is None:
+                return
+            chunk = []
+            try:
+                while True:
+                    seconds, kind, payload = self._records.popleft()
+                    chunk.append(RECORD.pack(seconds, kind, len(payload)))
+                    chunk.append(payload)
+                    self.count += 1
+            except IndexError:
+                pass  # everything that was waiting is in the chunk
+            self._file.write(b"".join(chunk))
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def readRecording(path):
+    """
+    Returns (wall clock start, [(seconds, kind, payload), ...]).
+    Raises ValueError if the file is not a recording.
+    """
+    with open(path, "rb") as recordingFile:
+        data = recordingFile.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a Photon match recording.")
+
+    offset = len(MAGIC)
+    (wallStart,) = HEADER.unpack_from(data, offset)
+    offset += HEADER.size
+
+    records = []
+    while offset + RECORD.size <= len(data):
+        seconds, kind, length = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        records.append((seconds, kind, data[offset:offset + length]))
+        offset += length
+
+    return wallStart, records
+
+
+def scoreDigest(state):
+    """
+    Short fingerprint of a match result (every player's score and base icon, plus the totals).
+    Two runs with the same digest ended with exactly the same scores.
+    """
+    players = sorted(
+        (player.playerID, player.team, player.score, player.has_baseIcon)
+        for player in state.playersByPlayerID.values()
+    )
+    text = repr((players, state.redTotalScore, state.greenTotalScore))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def replayRecording(path, speed=None):
+    """
+    Plays a recording back through the controller's normal scoring path.
+
+    speed=None replays as fast as possible, speed=1 is real time, speed=10 is ten times faster.
+    It runs on a GameController of its own with broadcasts muted and an in-memory match history,
+    so the live arenas are never touched.
+
+    Returns a report dict: records, packets, applied, seconds, events_per_second,
+    red_total_score, green_total_score, scores {playerID: score} and digest.
+    """
+    import controller
+    from net import udp
+
+    _wallStart, records = readRecording(path)
+
+    arena = controller.GameController("replay", historyFile=":memory:", muteBroadcasts=True)
+    arena.recordMatches = False
+
+    packets = 0
+    applied = 0
+    began = time.perf_counter()
+
+    for seconds, kind, payload in records:
+        if speed:
+            wait = seconds / speed - (time.perf_counter() - began)
+            if wait > 0:
+                time.sleep(wait)
+
+        if kind == KIND_PACKET:
+            packets += 1
+            if arena.handleIncomingUDPMessage(udp.parse_packet_bytes(payload)):
+                applied += 1
+
+        elif kind == KIND_PHASE:
+            arena.changePhase(payload.decode("utf-8"))
+
+        elif kind == KIND_ROSTER:
+            team, playerID, equipmentID, codename = payload.decode("utf-8").split(",", 3)
+            arena.addPlayerToTeam(team, playerID, codename, equipmentID, broadcast=False)
+
+        elif kind == KIND_START:
+            arena.resetTheActionState()
+
+        elif kind == KIND_CLEAR:
+            arena.clearItAll()
+
+    elapsed = time.perf_counter() - began
+    finalState = arena.state
+    arena.matchHistory.close()
+
+    return {
+        "records": len(records),
+        "packets": packets,
+        "applied": applied,
+        "seconds": elapsed,
+        "events_per_second": len(records) / elapsed if elapsed > 0 else float("inf"),
+        "red_total_score": finalState.redTotalScore,
+        "green_total_score": finalState.greenTotalScore,
+        "scores": {player.playerID: player.score for player in finalState.playersByPlayerID.values()},
+        "digest": scoreDigest(finalState),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded Photon match without Tk or UDP.")
+    parser.add_argument("recording")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="1 = real time, 10 = ten times faster. Leave it off to go as fast as possible.")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Replay this many times and check every run ends with the same scores.")
+    args = parser.parse_args()
+
+    from net import udp
+    udp.printEachPacket = False
+
+    digests = set()
+    for run in range(args.repeat):
+        report = replayRecording(args.recording, speed=args.speed)
+        digests.add(report["digest"])
+        print(
+            f"Run {run + 1}: {report['records']} records ({report['packets']} packets, "
+            f"{report['applied']} applied) in {report['seconds']:.3f}s "
+            f"-> {report['events_per_second']:,.0f} events/sec"
+        )
+        print(f"  Red {report['red_total_score']}  Green {report['green_total_score']}  digest {report['digest']}")
+
+    if len(digests) > 1:
+        print("Warning: The replays did NOT end with the same scores!")
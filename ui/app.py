@@ -36,27 +36,182 @@ INVALID EVENT HANDLING:
 - Hits received before the "PLAYING" phase are ignored.
 """
 
+import time
+moduleImportStartedAt = time.perf_counter()
+
 import os
 import glob
 import random
+import threading
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 import controller
-import time
 
-try:
-    import pygame
-    PYGAME_OK = True
-except Exception:
-    PYGAME_OK = False
+# -----------------------------
+# Optional media libraries (loaded lazily)
+# -----------------------------
+# pygame and Pillow are slow to import and only the Action screen needs them
+# (music and the base icon), so they are NOT imported up here anymore.
+# loadPygame() / loadPillow() import them the first time they're needed, and
+# prewarmAssets() (below) gets them going on a background thread during the splash.
+# PYGAME_OK / PIL_OK are None until the import has been tried.
+
+pygame = None
+Image = None
+ImageTk = None
+PYGAME_OK = None
+PIL_OK = None
+mediaImportLock = threading.Lock()
+
+
+def loadPygame():
+    """Imports pygame the first time it's asked for. Returns True if it's usable."""
+    global pygame, PYGAME_OK
+
+    if PYGAME_OK is not None:
+        return PYGAME_OK
+
+    with mediaImportLock:
+        if PYGAME_OK is None:
+            began = time.perf_counter()
+            try:
+                import pygame as pygameModule
+                pygame = pygameModule
+                PYGAME_OK = True
+            except Exception:
+                PYGAME_OK = False
+            markStartup("pygame import", time.perf_counter() - began)
+    return PYGAME_OK
+
+
+def loadPillow():
+    """Imports Pillow (Image + ImageTk) the first time it's asked for. Returns True if it's usable."""
+    global Image, ImageTk, PIL_OK
+
+    if PIL_OK is not None:
+        return PIL_OK
+
+    with mediaImportLock:
+        if PIL_OK is None:
+            began = time.perf_counter()
+            try:
+                from PIL import Image as imageModule, ImageTk as imageTkModule
+                Image = imageModule
+                ImageTk = imageTkModule
+                PIL_OK = True
+                print("Pillow/ImageTk loaded successfully.")
+            except Exception as e:
+                PIL_OK = False
+                print("Pillow/ImageTk import failed:", e)
+            markStartup("Pillow import", time.perf_counter() - began)
+    return PIL_OK
+
+
+# -----------------------------
+# Asset cache (shared by every screen)
+# -----------------------------
+# A new Action screen is built for every match, so without this the base icon was
+# reopened and resized and the tracks folder was scanned again each time.
+# Decoding and the folder scan can happen on any thread; the Tk PhotoImage has to be
+# made on the Tk thread, so that part waits for the first getPhotoImage() call.
+
+assetsFolder = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets"))
+tracksFolder = os.path.join(assetsFolder, "photon_tracks")
+BASE_ICON_PATH = os.path.join(assetsFolder, "baseicon.jpg")
+BASE_ICON_SIZE = (16, 16)
+
+decodedImages = {}  # (path, size) -> resized Pillow image, or None if it couldn't be loaded
+photoImages = {}  # (path, size) -> Tk PhotoImage, kept here so Tk never loses the image
+trackFilesCache = None
+assetLock = threading.Lock()
+
+
+def decodeImage(path, size):
+    """Opens and resizes an image once. Safe to call from a background thread."""
+    key = (path, size)
+    with assetLock:
+        if key in decodedImages:
+            return decodedImages[key]
+
+    image = None
+    if os.path.exists(path) and loadPillow():
+        try:
+            with Image.open(path) as original:
+                image = original.resize(size)
+            print("Loaded image:", path)
+        except Exception as e:
+            print("Could not load image:", path, e)
+
+    with assetLock:
+        return decodedImages.setdefault(key, image)
+
+
+def getPhotoImage(path, size):
+    """
+    The cached Tk PhotoImage for an image, or None if it can't be loaded.
+    Tk thread only (PhotoImage needs the Tk root).
+    """
+    key = (path, size)
+    photo = photoImages.get(key)
+    if photo is None:
+        image = decodeImage(path, size)
+        if image is None:
+            return None
+        photo = ImageTk.PhotoImage(image)
+        photoImages[key] = photo
+    return photo
+
+
+def getTrackFiles():
+    """Every MP3 in assets/photon_tracks. The folder is only scanned the first time."""
+    global trackFilesCache
+
+    if trackFilesCache is None:
+        files = []
+        if os.path.isdir(tracksFolder):
+            files = sorted(glob.glob(os.path.join(tracksFolder, "*.mp3")))
+        trackFilesCache = tuple(files)
+    return list(trackFilesCache)
+
+
+def prewarmAssets():
+    """
+    Imports Pillow/pygame, decodes the base icon and scans the tracks folder
+    on a background thread. The app calls this during the splash.
+    """
+    def prewarm():
+        began = time.perf_counter()
+        decodeImage(BASE_ICON_PATH, BASE_ICON_SIZE)
+        if getTrackFiles():
+            loadPygame()
+        markStartup("assets prewarmed", time.perf_counter() - began)
+
+    threading.Thread(target=prewarm, name="photon-asset-prewarm", daemon=True).start()
+
+
+# -----------------------------
+# Startup timing
+# -----------------------------
+# startApp() prints how long it took until the first frame was on screen,
+# plus the other steps recorded here (in ms, in the order they finished).
+
+startupTimings = []
+processStartedAt = None  # main.py passes its start time to startApp()
+
+
+def markStartup(step, seconds=None):
+    """
+    Records one startup step. With seconds it's a duration,
+    otherwise it's the time since the process (or this module) started.
+    Returns the milliseconds it recorded (the prewarm thread appends here too,
+    so the last entry in startupTimings is not always this one).
+    """
+    if seconds is None:
+        seconds = time.perf_counter() - (processStartedAt or moduleImportStartedAt)
+    milliseconds = seconds * 1000.0
+    startupTimings.append((step, milliseconds))
+    return milliseconds
 
-try:
-    from PIL import Image, ImageTk
-    PIL_OK = True
-    print("Pillow/ImageTk loaded successfully.")
-except Exception as e:
-    PIL_OK = False
-    print("Pillow/ImageTk import failed:", e)
 
 # -----------------------------
 # Timing & Game Configuration
@@ -68,6 +223,11 @@ teamRows = 15
 GAME_SECONDS = 360
 WARNING_SECONDS = 30
 WARNING_MUSIC_DELAY = 13
+TENTHS_BELOW_SECONDS = 10  # the timer shows tenths of a second in the last 10 seconds of a phase
+DB_POLL_MS = 30  # how often the entry screen checks on a background database call
+PREFETCH_DEBOUNCE_MS = 250  # typing pause before the codename is fetched in the background
+LOG_WIDGET_MAX_LINES = 500  # older play-by-play lines are trimmed off the top
+LEADERBOARD_ROWS = 5  # players shown under "top players this week" on the entry screen
 
 
 # =============================================================================
@@ -97,6 +257,19 @@ class EntryScreen(tk.Frame):
         self.playerInDB = False
         self.codenameForDB = None
 
+        # Background DB call state (see _startLookup / addPlayerOn)
+        self._lookupFuture = None
+        self._lookupPlayerID = None
+        self._lookupToken = 0
+        self._resolvedPlayerID = None  # the ID the codename field currently belongs to
+        self._addAfterLookup = False
+        self._insertFuture = None
+        self._insertToken = 0
+        self._importFuture = None
+        self._importToken = 0
+        self._lookupMovesFocus = True
+        self._prefetchJob = None
+
         titleFrame = tk.Frame(self, bg="black")
         titleFrame.pack(fill="x", pady=(10, 0))
 
@@ -135,6 +308,27 @@ class EntryScreen(tk.Frame):
         self.redRos["frame"].grid(row=0, column=0, padx=20)
         self.greenRos["frame"].grid(row=0, column=1, padx=20)
 
+        leadersPanel = tk.Frame(teamsFrame, bg="black")
+        leadersPanel.grid(row=0, column=2, padx=20, sticky="n")
+        tk.Label(
+            leadersPanel,
+            text="TOP PLAYERS THIS WEEK",
+            fg="white",
+            bg="#1f2a66",
+            font=("Arial", 10, "bold"),
+            width=28
+        ).pack(fill="x", pady=(0, 5))
+        self.leadersVariable = tk.StringVar(value="")
+        tk.Label(
+            leadersPanel,
+            textvariable=self.leadersVariable,
+            fg="white",
+            bg="black",
+            font=("Courier", 10),
+            justify="left",
+            anchor="w"
+        ).pack(fill="x")
+
         controlsArea = tk.Frame(self, bg="black")
         controlsArea.pack(fill="x", pady=(10, 5))
 
@@ -159,6 +353,7 @@ class EntryScreen(tk.Frame):
         self.entryPlayerID.grid(row=0, column=3, padx=6, pady=4, sticky="w")
         self.entryPlayerID.bind("<FocusOut>", self.on_playerID_changed)
         self.entryPlayerID.bind("<Return>", self.on_playerID_changed)
+        self.entryPlayerID.bind("<KeyRelease>", self._on_playerID_typed)
 
         tk.Label(
             controlsArea, text="Codename:", fg="white", bg="black", font=("Arial", 10, "bold")
@@ -175,6 +370,9 @@ class EntryScreen(tk.Frame):
         addButton = ttk.Button(controlsArea, text="Add Player", command=self.addPlayerOn)
         addButton.grid(row=0, column=8, padx=10, pady=4)
 
+        importButton = ttk.Button(controlsArea, text="Import Roster", command=self.importRosterOn)
+        importButton.grid(row=0, column=9, padx=(0, 10), pady=4)
+
         self.statusVariable = tk.StringVar(value="")
         tk.Label(
             controlsArea,
@@ -201,6 +399,25 @@ class EntryScreen(tk.Frame):
         ).pack(fill="x", pady=(8, 10))
 
         self.after_idle(self.refreshTables)
+        self.after_idle(self.refreshLeaders)
+
+    def refreshLeaders(self):
+        """
+        Fills in the weekly leaderboard. The totals are precomputed at each match end,
+        so this is just a short indexed read (or the in-memory copy).
+        """
+        leaders = controller.getTopPlayersThisWeek(limit=LEADERBOARD_ROWS)
+        if not leaders:
+            self.leadersVariable.set("No finished matches yet.")
+            return
+
+        lines = []
+        for place, leader in enumerate(leaders, start=1):
+            lines.append(
+                f"{place:>2}. {leader['codename'][:12]:<12} {leader['total_score']:>6}"
+                f"  B{leader['base_hits']} T{leader['tag_ratio']:.1f}"
+            )
+        self.leadersVariable.set("\n".join(lines))
 
     def _validatePlayerID(self, raw):
         """
@@ -241,6 +458,7 @@ class EntryScreen(tk.Frame):
     def _clearEntryFields(self):
         self.playerInDB = False
         self.codenameForDB = None
+        self._resolvedPlayerID = None
         self.entryPlayerID.delete(0, "end")
         self.entryForCodename.configure(state="normal")
         self.entryForCodename.delete(0, "end")
@@ -250,6 +468,7 @@ class EntryScreen(tk.Frame):
     def _resetCodenameField(self):
         self.playerInDB = False
         self.codenameForDB = None
+        self._resolvedPlayerID = None
         self.entryForCodename.configure(state="normal")
         self.entryForCodename.delete(0, "end")
 
@@ -303,7 +522,7 @@ class EntryScreen(tk.Frame):
         Logic:
         - Validate Player ID
         - Prevent duplicates in current session
-        - Query database for existing player
+        - Query database for existing player (on a worker thread, see _startLookup)
             → If found: autofill codename (readonly)
             → If not: allow user to enter new codename
         """
@@ -311,47 +530,165 @@ class EntryScreen(tk.Frame):
         raw = self.entryPlayerID.get().strip()
 
         if raw == "":
+            self._cancelLookup()
             self._resetCodenameField()
             self.statusVariable.set("")
             return
 
         playerID, error = self._validatePlayerID(raw)
         if error:
+            self._cancelLookup()
             self._resetCodenameField()
             self.statusVariable.set(error)
             return
 
         if playerID in self.notNewPlayerID:
+            self._cancelLookup()
             self._resetCodenameField()
             self.statusVariable.set(
                 f"Player ID {playerID} is already in this game session. Use F12 to clear and start over."
             )
             return
 
-        try:
-            status, codename = controller.dbGetCodename(playerID)
-        except Exception:
+        # FocusOut and Enter both land here, don't look the same ID up twice
+        if playerID in (self._lookupPlayerID, self._resolvedPlayerID):
+            return
+
+        self._startLookup(playerID)
+
+    # ------------------------------------------------------------------
+    # Background database calls
+    # ------------------------------------------------------------------
+    # The database runs on the controller's worker threads. Results come back to
+    # Tk by polling the future with after(), so the window never freezes, even
+    # when PostgreSQL is slow or down. Every lookup gets a token; bumping the
+    # token (retyping the ID, F12) makes any older result get thrown away.
+
+    def _startLookup(self, playerID, moveFocus=True):
+        """
+        moveFocus=False is used by the typing prefetch, so the cursor
+        doesn't jump out of the Player ID field while the operator is still typing.
+        """
+        self._cancelLookup()
+        self._resetCodenameField()
+
+        self._lookupToken += 1
+        self._lookupPlayerID = playerID
+        self._lookupMovesFocus = moveFocus
+        self._lookupFuture = controller.dbGetCodenameAsync(playerID)
+        self.statusVariable.set(f"Looking up Player {playerID}...")
+
+        self.after(DB_POLL_MS, self._pollLookup, self._lookupToken)
+
+    def _cancelLookup(self):
+        """Forget about the lookup in progress (its result will be ignored)."""
+        if self._lookupFuture is not None:
+            self._lookupFuture.cancel()  # only works if it has not started yet, that is fine
+        self._lookupToken += 1
+        self._lookupFuture = None
+        self._lookupPlayerID = None
+        self._addAfterLookup = False
+
+    def _lookupPending(self):
+        return self._lookupFuture is not None
+
+    def _on_playerID_typed(self, event=None):
+        """
+        Runs on every key in the Player ID field.
+        - If the ID changed while a lookup is running, that lookup is stale.
+        - Once typing pauses for PREFETCH_DEBOUNCE_MS, the codename is fetched
+          in the background, so it is already filled in when they tab over.
+        """
+        raw = self.entryPlayerID.get().strip()
+        playerID, error = self._validatePlayerID(raw)
+        if self._lookupPending() and playerID != self._lookupPlayerID:
+            self._cancelLookup()
+            self.statusVariable.set("")
+        if playerID != self._resolvedPlayerID:
             self._resetCodenameField()
-            self.statusVariable.set("Database error! Check PostgreSQL connection.")
+
+        if self._prefetchJob is not None:
+            self.after_cancel(self._prefetchJob)
+            self._prefetchJob = None
+
+        if error or playerID in self.notNewPlayerID:
+            return
+        if playerID in (self._lookupPlayerID, self._resolvedPlayerID):
             return
 
+        self._prefetchJob = self.after(PREFETCH_DEBOUNCE_MS, self._prefetchCodename, playerID)
+
+    def _prefetchCodename(self, playerID):
+        self._prefetchJob = None
+
+        # The ID might have changed since this was scheduled
+        current, error = self._validatePlayerID(self.entryPlayerID.get())
+        if error or current != playerID:
+            return
+        if playerID in (self._lookupPlayerID, self._resolvedPlayerID):
+            return
+
+        # Regulars are usually in the codename cache, no thread needed for them
+        codename = controller.peekCachedCodename(playerID)
+        if codename is not None:
+            self._cancelLookup()
+            self._applyLookupResult(playerID, "found", codename, moveFocus=False)
+            return
+
+        self._startLookup(playerID, moveFocus=False)
+
+    def _pollLookup(self, token):
+        if not self.winfo_exists():
+            return  # the screen was closed while the database was busy
+
+        if token != self._lookupToken or self._lookupFuture is None:
+            return  # stale, someone already started a newer lookup
+
+        if not self._lookupFuture.done():
+            self.after(DB_POLL_MS, self._pollLookup, token)
+            return
+
+        future = self._lookupFuture
+        playerID = self._lookupPlayerID
+        addAfter = self._addAfterLookup
+        moveFocus = self._lookupMovesFocus
+        self._lookupFuture = None
+        self._lookupPlayerID = None
+        self._addAfterLookup = False
+
+        try:
+            status, codename = future.result()
+        except Exception:
+            status, codename = "db_error", None
+
+        self._applyLookupResult(playerID, status, codename, moveFocus=moveFocus)
+
+        if addAfter and self._resolvedPlayerID == playerID:
+            self.addPlayerOn()
+
+    def _applyLookupResult(self, playerID, status, codename, moveFocus=True):
         if status == "found":
             self.playerInDB = True
             self.codenameForDB = codename
+            self._resolvedPlayerID = playerID
             self.entryForCodename.configure(state="normal")
             self.entryForCodename.delete(0, "end")
             self.entryForCodename.insert(0, codename)
             self.entryForCodename.configure(state="readonly")
-            self.entryEquipID.focus_set()
+            if moveFocus:
+                self.entryEquipID.focus_set()
             self.statusVariable.set("Player found in DB. Using existing codename.")
 
         elif status == "not_found":
             self.playerInDB = False
             self.codenameForDB = None
+            self._resolvedPlayerID = playerID
+            # The field was emptied when the lookup started, so anything in it now was
+            # typed while the database was busy. Keep it.
             self.entryForCodename.configure(state="normal")
-            self.entryForCodename.delete(0, "end")
             self.statusVariable.set("Uh oh! Player not found, enter codename to add new player.")
-            self.entryForCodename.focus_set()
+            if moveFocus:
+                self.entryForCodename.focus_set()
 
         elif status == "db_error":
             self._resetCodenameField()
@@ -369,11 +706,16 @@ class EntryScreen(tk.Frame):
         1. Validate Player ID and Equipment ID
         2. Ensure Player ID not already used this session
         3. Get codename (from DB or user input)
-        4. Insert new player into DB if needed
+           - if the lookup is still running, the add happens when it finishes
+        4. Insert new player into DB if needed (on a worker thread)
         5. Add player to controller + local roster
         6. Refresh UI tables
         """
         
+        if self._insertFuture is not None:
+            self.statusVariable.set("Still saving the last player, one moment...")
+            return
+
         team = self.teamVariable.get().strip().upper()
 
         playerID, error = self._validatePlayerID(self.entryPlayerID.get())
@@ -392,6 +734,14 @@ class EntryScreen(tk.Frame):
             )
             return
 
+        # The codename on screen has to belong to this ID, if not, look it up first
+        if self._resolvedPlayerID != playerID:
+            if self._lookupPlayerID != playerID:
+                self._startLookup(playerID)
+            self._addAfterLookup = True
+            self.statusVariable.set(f"Looking up Player {playerID}... they will be added when it finishes.")
+            return
+
         codenameOfUse = self.entryForCodename.get().strip()
         if not codenameOfUse:
             self.statusVariable.set("Please enter a codename.")
@@ -411,37 +761,125 @@ class EntryScreen(tk.Frame):
             self.statusVariable.set(
                 f"Using existing codename '{codenameOfUse}' for Player {playerID}."
             )
+            self._finishAddPlayer(team, playerID, codenameOfUse, equipmentID)
+            return
+
+        self._insertToken += 1
+        self._insertFuture = controller.dbInsertPlayerAsync(playerID, codenameOfUse)
+        self.statusVariable.set(f"Saving '{codenameOfUse}' to the database...")
+        self.after(
+            DB_POLL_MS, self._pollInsert, self._insertToken,
+            (team, playerID, codenameOfUse, equipmentID)
+        )
+
+    def _pollInsert(self, token, player):
+        if not self.winfo_exists():
+            return  # the screen was closed while the database was busy
+
+        if token != self._insertToken or self._insertFuture is None:
+            return  # F12 happened while saving
+
+        if not self._insertFuture.done():
+            self.after(DB_POLL_MS, self._pollInsert, token, player)
+            return
+
+        future = self._insertFuture
+        self._insertFuture = None
+        team, playerID, codenameOfUse, equipmentID = player
+
+        try:
+            status = future.result()
+        except Exception:
+            status = "db_error"
+
+        if status == "success":
+            self.statusVariable.set(f"New player '{codenameOfUse}' added to database.")
+        elif status == "duplicate":
+            self.statusVariable.set(
+                f"Player {playerID} already exists in the database. Re-enter the Player ID to load their codename."
+            )
+            self._resetCodenameField()
+            return
         else:
-            try:
-                status = controller.dbInsertPlayer(playerID, codenameOfUse)
-            except Exception:
-                self.statusVariable.set("Database error — player was not saved.")
-                return
-
-            if status == "success":
-                self.statusVariable.set(f"New player '{codenameOfUse}' added to database.")
-            elif status == "duplicate":
-                self.statusVariable.set(
-                    f"Player {playerID} already exists in the database. Re-enter the Player ID to load their codename."
-                )
-                self._resetCodenameField()
-                return
-            else:
-                self.statusVariable.set("Database error — player was not saved.")
-                return
+            self.statusVariable.set("Database error — player was not saved.")
+            return
+
+        self._finishAddPlayer(team, playerID, codenameOfUse, equipmentID)
 
+    def _finishAddPlayer(self, team, playerID, codenameOfUse, equipmentID):
         try:
             controller.addPlayerToTeam(team, playerID, codenameOfUse, equipmentID)
         except Exception as e:
             self.statusVariable.set(f"Controller error: {e}")
             return
 
+        roster = self.redRoster if team == "RED" else self.greenRoster
         roster.append((playerID, codenameOfUse, equipmentID))
         self.notNewPlayerID.add(playerID)
         self.refreshTables()
         self._clearEntryFields()
         self.entryPlayerID.focus_set()
 
+    def importRosterOn(self):
+        """
+        Loads a whole roster from a CSV file (playerID, codename, equipmentID, team).
+        The controller does one DB lookup, one batch insert, and one set of broadcasts.
+        The database part runs on a worker thread, like the lookups above.
+        """
+        if self._importFuture is not None:
+            self.statusVariable.set("Still importing the last roster, one moment...")
+            return
+
+        path = filedialog.askopenfilename(
+            title="Import Roster",
+            filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        try:
+            entries = controller.loadRosterFile(path)
+        except (OSError, ValueError) as e:
+            self.statusVariable.set(f"Could not read the roster file: {e}")
+            return
+
+        self._importToken += 1
+        self._importFuture = controller.importRosterAsync(entries)
+        self.statusVariable.set(f"Importing {len(entries)} players...")
+        self.after(DB_POLL_MS, self._pollImport, self._importToken)
+
+    def _pollImport(self, token):
+        if not self.winfo_exists():
+            return  # the screen was closed while the database was busy
+
+        if token != self._importToken or self._importFuture is None:
+            return  # F12 happened while importing
+
+        if not self._importFuture.done():
+            self.after(DB_POLL_MS, self._pollImport, token)
+            return
+
+        future = self._importFuture
+        self._importFuture = None
+
+        try:
+            report = controller.finishRosterImport(future.result())
+        except Exception as e:
+            self.statusVariable.set(f"Database error — the roster was not imported: {e}")
+            return
+
+        for team, playerID, codename, equipmentID in report["added"]:
+            roster = self.redRoster if team == "RED" else self.greenRoster
+            roster.append((playerID, codename, equipmentID))
+            self.notNewPlayerID.add(playerID)
+
+        self.refreshTables()
+
+        message = f"Imported {len(report['added'])} players."
+        if report["errors"]:
+            message += f" {len(report['errors'])} skipped: " + " | ".join(report["errors"][:3])
+        self.statusVariable.set(message)
+
     def on_f1(self):
         self.statusVariable.set("Already on Entry screen.")
 
@@ -454,6 +892,11 @@ class EntryScreen(tk.Frame):
         - Clears UI fields
         """
         
+        self._cancelLookup()
+        self._insertToken += 1  # a save that is still running won't be added to the roster
+        self._insertFuture = None
+        self._importToken += 1  # same for a roster import (new players stay saved in the DB)
+        self._importFuture = None
         controller.clearItAll()
         self.redRoster.clear()
         self.greenRoster.clear()
@@ -521,7 +964,11 @@ class ActionScreen(tk.Frame):
         self.auto_start = auto_start
 
         self._refresh_job = None
-        self._last_log_index = 0
+        self._seen_version = None  # last controller version drawn, None means draw everything
+        self._current_phase = ""
+        self._red_total = 0
+        self._green_total = 0
+        self._score_pools = {}  # scoreboard frame -> its reusable row widgets
         self._flash_on = False
         self._return_button_visible = False
         self.baseIconImage = None
@@ -547,48 +994,29 @@ class ActionScreen(tk.Frame):
     # ------------------------------------------------------------------
 
     def _load_base_icon(self):
-        assets_dir = os.path.join(os.path.dirname(__file__), "..", "assets")
-        jpg_path = os.path.normpath(os.path.join(assets_dir, "baseicon.jpg"))
-    
-        print("Loading base icon from:", jpg_path)
-        print("JPG exists:", os.path.exists(jpg_path))
-        print("PIL_OK:", PIL_OK)
-    
-        self.baseIconImage = None
-    
-        if PIL_OK and os.path.exists(jpg_path):
-            try:
-                img = Image.open(jpg_path)
-                img = img.resize((16, 16))
-                self.baseIconImage = ImageTk.PhotoImage(img)
-                print("Loaded JPG base icon successfully.")
-                return
-            except Exception as e:
-                print("Could not load JPG base icon:", e)
-    
-        print("Warning: Base icon could not be loaded. Using [BASE] fallback.")
+        """
+        The icon comes from the asset cache, so it is only opened and resized once per run
+        (not again for every new Action screen).
+        """
+        self.baseIconImage = getPhotoImage(BASE_ICON_PATH, BASE_ICON_SIZE)
+
+        if self.baseIconImage is None:
+            print("Warning: Base icon could not be loaded. Using [BASE] fallback.")
 
     def _setup_music(self):
         """
-        Loads all MP3 files from assets folder.
+        Loads all MP3 files from assets folder (the folder is only scanned once per run).
     
         If pygame is available:
         - Initializes audio system
         - Prepares music playback
         """
         
-        self.trackFiles = []
-    
-        assets_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets"))
-        tracks_dir = os.path.join(assets_dir, "photon_tracks")
-    
-        if os.path.isdir(tracks_dir):
-            self.trackFiles = sorted(glob.glob(os.path.join(tracks_dir, "*.mp3")))
+        self.trackFiles = getTrackFiles()
     
-        print("PYGAME_OK =", PYGAME_OK)
         print("Found tracks:", len(self.trackFiles))
     
-        if PYGAME_OK:
+        if self.trackFiles and loadPygame():
             try:
                 if not pygame.mixer.get_init():
                     pygame.mixer.init()
@@ -598,7 +1026,7 @@ class ActionScreen(tk.Frame):
                 print("pygame mixer init failed:", e)
 
     def _music_is_actually_playing(self):
-        if not PYGAME_OK:
+        if not PYGAME_OK:  # also False if pygame was never loaded, then nothing can be playing
             return False
     
         try:
@@ -611,7 +1039,7 @@ class ActionScreen(tk.Frame):
 
 
     def _play_music_file(self, path, loops=0):
-        if not PYGAME_OK or not path or not os.path.exists(path):
+        if not path or not os.path.exists(path) or not loadPygame():
             print("Music skipped:", path)
             self._music_started = False
             self._music_file = None
@@ -905,6 +1333,13 @@ class ActionScreen(tk.Frame):
     def _log(self, message):
         self.eventLog.configure(state="normal")
         self.eventLog.insert("end", message + "\n")
+
+        # Keep the widget the same size as the controller's ring so long matches stay cheap
+        # (every line ends in a newline, so "end-1c" sits on the empty line after the last one)
+        lineCount = int(self.eventLog.index("end-1c").split(".")[0]) - 1
+        if lineCount > LOG_WIDGET_MAX_LINES:
+            self.eventLog.delete("1.0", f"{lineCount - LOG_WIDGET_MAX_LINES + 1}.0")
+
         self.eventLog.see("end")
         self.eventLog.configure(state="disabled")
 
@@ -917,85 +1352,154 @@ class ActionScreen(tk.Frame):
     # Live snapshot updates
     # ------------------------------------------------------------------
 
-    def _populate_rosters(self, snapshot):
-        red_roster = self._sorted_roster(snapshot.get("red_roster", []))
-        green_roster = self._sorted_roster(snapshot.get("green_roster", []))
+    def _populate_rosters(self, delta):
+        """
+        Only rebuilds a team's scoreboard when the controller sent that roster,
+        which only happens when someone on that team changed.
+        """
+        if delta.get("red_roster") is not None:
+            red_roster = self._sorted_roster(delta["red_roster"])
+            self._build_scoreboard(self.redScoreFrame, red_roster, "#ff4444")
+
+        if delta.get("green_roster") is not None:
+            green_roster = self._sorted_roster(delta["green_roster"])
+            self._build_scoreboard(self.greenScoreFrame, green_roster, "#44ff44")
 
-        self._build_scoreboard(self.redScoreFrame, red_roster, "#ff4444")
-        self._build_scoreboard(self.greenScoreFrame, green_roster, "#44ff44")
+        self._red_total = int(delta.get("red_total_score", 0))
+        self._green_total = int(delta.get("green_total_score", 0))
 
-        red_total = int(snapshot.get("red_total_score", 0))
-        green_total = int(snapshot.get("green_total_score", 0))
+        self.redTotalLabel.configure(text=str(self._red_total))
+        self.greenTotalLabel.configure(text=str(self._green_total))
 
-        self.redTotalLabel.configure(text=str(red_total))
-        self.greenTotalLabel.configure(text=str(green_total))
-        self._apply_flashing_totals(red_total, green_total)
+    def _make_score_row(self, frame):
+        """
+        Makes one scoreboard row. Rows are made once and then reused,
+        _build_scoreboard only changes their text/colour/icon.
+        """
+        row = tk.Frame(frame, bg="black")
+
+        left = tk.Frame(row, bg="black")
+        left.pack(side="left", fill="x", expand=True)
+
+        if self.baseIconImage is not None:
+            icon = tk.Label(left, image=self.baseIconImage, bg="black")
+        else:
+            icon = tk.Label(
+                left,
+                text=self.baseIconTextFallback,
+                fg="white",
+                bg="black",
+                font=("Arial", 9, "bold")
+            )
+
+        name = tk.Label(
+            left,
+            text="",
+            bg="black",
+            font=("Arial", 10, "bold"),
+            anchor="w"
+        )
+        name.pack(side="left")
+
+        score = tk.Label(
+            row,
+            text="",
+            fg="white",
+            bg="black",
+            font=("Arial", 10),
+            width=6,
+            anchor="e"
+        )
+        score.pack(side="right")
+
+        return {
+            "frame": row,
+            "icon": icon,
+            "name": name,
+            "score": score,
+            "shown": False,
+            "icon_shown": False,
+            "content": None,  # what the row is showing right now, for the dirty check
+        }
+
+    def _score_pool(self, frame):
+        """
+        Returns the row pool for a scoreboard frame, making it the first time.
+        The pool starts with one row per roster slot and only grows if a team gets bigger.
+        """
+        pool = self._score_pools.get(frame)
+        if pool is None:
+            empty = tk.Label(
+                frame, text="No players added.",
+                fg="grey", bg="black", font=("Arial", 9)
+            )
+            pool = {
+                "rows": [self._make_score_row(frame) for _ in range(teamRows)],
+                "empty": empty,
+                "empty_shown": False,
+            }
+            self._score_pools[frame] = pool
+        return pool
 
     def _build_scoreboard(self, frame, team, color):
         """
-        Rebuilds scoreboard UI for a team.
+        Draws the scoreboard for a team using the reused row pool.
     
         Displays:
         - Player codename
         - Player score
         - Base icon if player has it
+
+        Each row remembers what it is showing, so only rows whose
+        codename, score, colour or icon changed get reconfigured.
         """
-        
-        for widget in frame.winfo_children():
-            widget.destroy()
+        pool = self._score_pool(frame)
+        rows = pool["rows"]
 
         if not team:
-            tk.Label(
-                frame, text="No players added.",
-                fg="grey", bg="black", font=("Arial", 9)
-            ).pack(anchor="w", padx=6, pady=2)
-            return
+            if not pool["empty_shown"]:
+                pool["empty"].pack(anchor="w", padx=6, pady=2)
+                pool["empty_shown"] = True
+        elif pool["empty_shown"]:
+            pool["empty"].pack_forget()
+            pool["empty_shown"] = False
+
+        while len(rows) < len(team):
+            rows.append(self._make_score_row(frame))
+
+        for index, row in enumerate(rows):
+            if index >= len(team):
+                if row["shown"]:
+                    row["frame"].pack_forget()
+                    row["shown"] = False
+                continue
+
+            player = team[index]
+            content = (
+                str(getattr(player, "codename", "UNKNOWN")),
+                int(getattr(player, "score", 0)),
+                self._player_has_base_icon(player),
+                color,
+            )
 
-        for player in team:
-            row = tk.Frame(frame, bg="black")
-            row.pack(fill="x", padx=4, pady=1)
-
-            left = tk.Frame(row, bg="black")
-            left.pack(side="left", fill="x", expand=True)
-
-            codename = str(getattr(player, "codename", "UNKNOWN"))
-            
-            if self._player_has_base_icon(player):
-                if self.baseIconImage is not None:
-                    tk.Label(
-                        left,
-                        image=self.baseIconImage,
-                        bg="black"
-                    ).pack(side="left", padx=(0, 4))
-                else:
-                    tk.Label(
-                        left,
-                        text=self.baseIconTextFallback,
-                        fg="white",
-                        bg="black",
-                        font=("Arial", 9, "bold")
-                    ).pack(side="left", padx=(0, 4))
-            
-            tk.Label(
-                left,
-                text=codename,
-                fg=color,
-                bg="black",
-                font=("Arial", 10, "bold"),
-                anchor="w"
-            ).pack(side="left")
+            if content != row["content"]:
+                codename, score, has_icon, fg = content
+                row["name"].configure(text=codename, fg=fg)
+                row["score"].configure(text=str(score))
 
+                if has_icon and not row["icon_shown"]:
+                    row["icon"].pack(side="left", padx=(0, 4), before=row["name"])
+                    row["icon_shown"] = True
+                elif not has_icon and row["icon_shown"]:
+                    row["icon"].pack_forget()
+                    row["icon_shown"] = False
 
-            score = int(getattr(player, "score", 0))
-            tk.Label(
-                row,
-                text=str(score),
-                fg="white",
-                bg="black",
-                font=("Arial", 10),
-                width=6,
-                anchor="e"
-            ).pack(side="right")
+                row["content"] = content
+
+            # Rows are only hidden from the end, so packing again keeps them in order
+            if not row["shown"]:
+                row["frame"].pack(fill="x", padx=4, pady=1)
+                row["shown"] = True
 
     def phaseAndTimerUpdate(self, snapshot):
         phase = str(snapshot.get("phase", "")).upper()
@@ -1019,39 +1523,49 @@ class ActionScreen(tk.Frame):
 
         self._show_return_button_if_needed(phase)
 
-        self._handle_phase_audio(phase)
-
-    def eventLogUpdated(self, snapshot):
-        event_log = snapshot.get("event_log", [])
+        self._current_phase = phase
 
-        if len(event_log) < self._last_log_index:
+    def eventLogUpdated(self, delta):
+        if delta.get("full"):
             self.logWidgetCleared()
-            self._last_log_index = 0
 
-        new_entries = event_log[self._last_log_index:]
-        for entry in new_entries:
+        for entry in delta.get("new_log", []):
             self._log(str(entry))
 
-        self._last_log_index = len(event_log)
-
     def actionScreenUpdate(self):
         """
         Main update loop (runs every 250ms):
     
-        - Updates game timer via controller
-        - Gets current snapshot of game state
-        - Updates:
+        - Lets the controller apply the hits (and phase changes) that came in since the last tick
+        - Updates the seconds shown (phase changes and 202/221 happen on the controller's
+          clock thread right on time, they don't wait for this tick)
+        - Asks the controller what changed since the version we last drew
+        - If the version has not moved, nothing gets redrawn
+        - Otherwise only the changed parts are updated:
             • Phase + timer
             • Scoreboards
             • Event log
+        - Flashing totals and music still run every tick
         """
         
+        controller.processPendingEvents()
         controller.updateTimer()
-        snapshot = controller.getActionSnapshot()
+        delta = controller.getActionDelta(self._seen_version)
 
-        self.phaseAndTimerUpdate(snapshot)
-        self._populate_rosters(snapshot)
-        self.eventLogUpdated(snapshot)
+        if delta["changed"]:
+            if delta["full"] or delta["phase_changed"] or delta["timer_changed"]:
+                self.phaseAndTimerUpdate(delta)
+            self._populate_rosters(delta)
+            self.eventLogUpdated(delta)
+            self._seen_version = delta["version"]
+
+        if self._current_phase in ("WARNING", "PLAYING"):
+            remaining = controller.getTimeRemainingPrecise()
+            if remaining < TENTHS_BELOW_SECONDS:
+                self.timerLabel.configure(text=f"00:{remaining:04.1f}")
+
+        self._apply_flashing_totals(self._red_total, self._green_total)
+        self._handle_phase_audio(self._current_phase)
 
         self._refresh_job = self.after(250, self.actionScreenUpdate)
 
@@ -1068,7 +1582,7 @@ class ActionScreen(tk.Frame):
         self.stopUpdateLoop()
         self._stop_music()
         controller.clearItAll()
-        self._last_log_index = 0
+        self._seen_version = None
         if self.on_return_entry:
             self.on_return_entry()
 
@@ -1076,7 +1590,7 @@ class ActionScreen(tk.Frame):
         self.stopUpdateLoop()
         self._stop_music()
         controller.clearItAll()
-        self._last_log_index = 0
+        self._seen_version = None
         if self.on_return_entry:
             self.on_return_entry()
 
@@ -1085,9 +1599,11 @@ class ActionScreen(tk.Frame):
 # App entry point
 # =============================================================================
 
-def startApp():
+def startApp(startedAt=None):
     """
     Entry point of the application.
+    startedAt is main.py's time.perf_counter() from when the process started,
+    so the time-to-first-frame printout includes the imports.
 
     Flow:
     1. Show splash screen
@@ -1098,10 +1614,14 @@ def startApp():
         - F5/F3 → Start game
         - F12 → Clear game
     """
-    
+    global processStartedAt
+    processStartedAt = startedAt
+    markStartup("app imported")
+
     root = tk.Tk()
     root.title("Team One's Photon Laser Tag")
     root.withdraw()
+    markStartup("Tk window created")
 
     def forceWinGeo():
         root.update_idletasks()
@@ -1209,11 +1729,34 @@ def startApp():
         def build_entry():
             entry = EntryScreen(content, startGame=goToAction)
             show_screen(entry)
+            markStartup("entry screen shown")
             root.after(0, forceWinGeo)
             root.after(120, forceWinGeo)
 
         root.after_idle(build_entry)
 
+    # Load the known codenames in the background while the splash is up
+    controller.warmCodenameCache()
+    # ...and the libraries, images and tracks the Action screen needs
+    prewarmAssets()
+
+    def firstFrameDrawn(event):
+        splashPic.unbind("<Map>")
+        # Tk draws in an idle callback after the window maps, so wait for that to run too
+        root.after_idle(reportFirstFrame)
+
+    def reportFirstFrame():
+        milliseconds = markStartup("first frame")
+        print(f"Startup: first frame after {milliseconds:.0f} ms")
+
+    def reportStartup():
+        print("Startup timings (ms):")
+        for step, milliseconds in startupTimings:
+            print(f"  {step:<20} {milliseconds:8.1f}")
+
+    splashPic.bind("<Map>", firstFrameDrawn)
+    root.after(MS_SplashTime + 500, reportStartup)
+
     root.after(MS_SplashTime, goToBegin)
     root.after(MS_SplashTime + 300, controller.netBeginUDP_Listener)
 